@@ -123,8 +123,44 @@ def load_contracts_module(repo_root: Path) -> Tuple[Optional[Any], Dict[str, Any
 # CLI help probe (subprocess)
 # -------------------------
 
-def run_help(instrument_path: Path, timeout_s: int = 20) -> Dict[str, Any]:
+def _help_in_process(instrument_path: Path) -> Tuple[int, str, str]:
+    """
+    Call the instrument's main(["--help"]) in this interpreter (no subprocess).
+    Returns (returncode, stdout, stderr).
+    """
+    import contextlib
+    import importlib.util
+    import io
+
+    root = str(instrument_path.parent)
+    added = root not in sys.path
+    if added:
+        sys.path.insert(0, root)
+    out, err = io.StringIO(), io.StringIO()
+    try:
+        spec = importlib.util.spec_from_file_location("phio_instrument_help", str(instrument_path))
+        if spec is None or spec.loader is None:
+            return 1, "", "spec_from_file_location returned None"
+        mod = importlib.util.module_from_spec(spec)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            spec.loader.exec_module(mod)  # type: ignore[attr-defined]
+            # The root shim re-exports the entrypoint as `_main`.
+            entry = getattr(mod, "main", None) or getattr(mod, "_main")
+            try:
+                rc = entry(["--help"])
+            except SystemExit as e:
+                rc = e.code
+        rc = 0 if rc is None else (rc if isinstance(rc, int) else 1)
+        return rc, out.getvalue(), err.getvalue()
+    finally:
+        if added:
+            sys.path.remove(root)
+
+
+def run_help(instrument_path: Path, timeout_s: int = 20, in_process: bool = False) -> Dict[str, Any]:
     cmd = [sys.executable, str(instrument_path), "--help"]
+    if in_process:
+        cmd = ["<in-process>", str(instrument_path), "--help"]
     out: Dict[str, Any] = {
         "help_valid": False,
         "help_len": 0,
@@ -142,17 +178,21 @@ def run_help(instrument_path: Path, timeout_s: int = 20) -> Dict[str, Any]:
     }
 
     try:
-        cp = subprocess.run(
-            cmd,
-            text=True,
-            capture_output=True,
-            timeout=timeout_s,
-            check=False,
-        )
-        txt = (cp.stdout or "") + ("\n" + cp.stderr if cp.stderr else "")
-        out["_forensics"]["returncode"] = cp.returncode
-        out["_forensics"]["stderr_tail"] = (cp.stderr or "")[-400:] if cp.stderr else ""
-        out["help_valid"] = (cp.returncode == 0) and (len((cp.stdout or "").strip()) > 0)
+        if in_process:
+            rc, stdout, stderr = _help_in_process(instrument_path)
+        else:
+            cp = subprocess.run(
+                cmd,
+                text=True,
+                capture_output=True,
+                timeout=timeout_s,
+                check=False,
+            )
+            rc, stdout, stderr = cp.returncode, cp.stdout, cp.stderr
+        txt = (stdout or "") + ("\n" + stderr if stderr else "")
+        out["_forensics"]["returncode"] = rc
+        out["_forensics"]["stderr_tail"] = (stderr or "")[-400:] if stderr else ""
+        out["help_valid"] = (rc == 0) and (len((stdout or "").strip()) > 0)
         out["help_len"] = len(txt)
 
         flags = set(re.findall(r"(?<!\w)(--[A-Za-z0-9_\-τ]+)", txt))
@@ -434,11 +474,13 @@ def global_level(axes: Dict[str, str]) -> str:
 # Main
 # -------------------------
 
-def main() -> int:
+def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--instrument", required=True, help="Path to instrument python file")
     ap.add_argument("--out", required=True, help="Output baseline JSON path")
-    args = ap.parse_args()
+    ap.add_argument("--help-in-process", action="store_true",
+                    help="Probe the instrument CLI by calling its main(['--help']) instead of spawning python")
+    args = ap.parse_args(argv)
 
     repo_root = Path(__file__).resolve().parent
     instrument_path = (repo_root / args.instrument).resolve() if not Path(args.instrument).is_absolute() else Path(args.instrument).resolve()
@@ -480,7 +522,7 @@ def main() -> int:
         "formula": {"golden_attempted": False, "golden_pass": False},
     }
 
-    cli = run_help(instrument_path) if instrument_path.exists() else {
+    cli = run_help(instrument_path, in_process=args.help_in_process) if instrument_path.exists() else {
         "help_valid": False, "help_len": 0, "subcommands": [], "flags": [],
         "required_subcommands": ["new-template", "score"], "required_flags": ["--input", "--outdir"],
         "tau_aliases": {"has_tau_ascii": False, "has_tau_unicode": False},
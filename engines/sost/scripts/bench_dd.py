@@ -0,0 +1,74 @@
+"""Benchmark compute_dd backends (pure Python vs NumPy) over growing series.
+
+Usage (from engines/sost):
+    PYTHONPATH=. python scripts/bench_dd.py --max-exp 7 --repeat 3
+
+Series are synthetic (seeded Gaussian with a level shift at the midpoint).
+The pure-Python backend gets a list, the NumPy backend an ndarray, as each
+would be fed in practice. Prints one JSON document.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sost.dd_coherence import _np, compute_dd
+
+
+def _series(n: int, seed: int = 0) -> List[float]:
+    rng = random.Random(seed)
+    half = n // 2
+    return [rng.gauss(0.0, 1.0) + (0.5 if i >= half else 0.0) for i in range(n)]
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _max_rel_diff(a: Dict[str, Any], b: Dict[str, Any]) -> float:
+    worst = 0.0
+    for side in ("pre", "post"):
+        for k, x in a[side]["stats"].items():
+            y = b[side]["stats"][k]
+            if x != y:
+                worst = max(worst, abs(x - y) / max(abs(x), abs(y), 1e-300))
+    return worst
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark compute_dd backends")
+    ap.add_argument("--min-exp", type=int, default=3, help="Smallest series length as a power of 10")
+    ap.add_argument("--max-exp", type=int, default=7, help="Largest series length as a power of 10")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    rows = []
+    for e in range(args.min_exp, args.max_exp + 1):
+        n = 10 ** e
+        values = _series(n)
+        row: Dict[str, Any] = {"n": n}
+        row["python_s"] = round(_best(lambda: compute_dd(values, backend="python"), args.repeat), 6)
+        if _np is not None:
+            arr = _np.asarray(values, dtype=_np.float64)
+            row["numpy_s"] = round(_best(lambda: compute_dd(arr, backend="numpy"), args.repeat), 6)
+            row["speedup"] = round(row["python_s"] / row["numpy_s"], 1) if row["numpy_s"] > 0 else math.inf
+            row["max_rel_diff"] = _max_rel_diff(compute_dd(values, backend="python"), compute_dd(arr, backend="numpy"))
+        rows.append(row)
+        del values
+
+    print(json.dumps({"numpy": _np.__version__ if _np is not None else None, "repeat": args.repeat, "rows": rows},
+                     ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
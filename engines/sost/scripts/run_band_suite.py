@@ -1,71 +1,45 @@
 from __future__ import annotations
 
+import argparse
 import hashlib
 import json
 import os
 import shutil
-import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+# Bands run in-process: the sost package and run_sost's pipeline are imported once
+# per worker instead of spawning interpreters per band.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-def sha256_file(p: Path) -> str:
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+from run_sost import run_pipeline  # noqa: E402
 
 
-def run_cmd(cmd: list[str], cwd: Path, env: dict[str, str]) -> bool:
-    print("\n== Running:", " ".join(cmd))
-    try:
-        subprocess.run(cmd, cwd=str(cwd), env=env, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print("Command failed:", e.returncode)
-        return False
-
-
-def pick_first(paths: list[Path]) -> Path | None:
-    if not paths:
-        return None
-    return sorted(paths, key=lambda p: (len(p.as_posix()), p.as_posix()))[0]
-
-
-def find_artifact(root: Path, filename: str) -> Path | None:
-    return pick_first(list(root.glob(f"**/{filename}")))
-
-
-def load_json(p: Path) -> dict:
-    try:
-        return json.loads(p.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
-
-
-def summarize(dd: Path | None, ddr: Path | None, e: Path | None) -> dict:
+def summarize(dd: dict | None, ddr: dict | None, e: dict | None) -> dict:
     out: dict = {}
 
-    if dd and dd.exists():
-        j = load_json(dd)
+    if dd:
+        j = dd
         out["dd_present"] = True
         out["split_index"] = (j.get("windowing", {}) or {}).get("split_index")
         out["dd_warnings"] = len(j.get("warnings", []) or [])
     else:
         out["dd_present"] = False
 
-    if ddr and ddr.exists():
-        j = load_json(ddr)
+    if ddr:
+        j = ddr
         out["ddr_present"] = True
         out["ddr_status"] = j.get("DDR") or (j.get("status", {}) or {}).get("compatibilite")
         out["ddr_warnings"] = len(j.get("warnings", []) or [])
     else:
         out["ddr_present"] = False
 
-    if e and e.exists():
-        j = load_json(e)
+    if e:
+        j = e
         out["e_present"] = True
         out["e_state"] = j.get("E") or j.get("equilibrium_state")
         out["e_warnings"] = len(j.get("warnings", []) or [])
@@ -75,118 +49,102 @@ def summarize(dd: Path | None, ddr: Path | None, e: Path | None) -> dict:
     return out
 
 
-def main() -> int:
-    repo = Path(__file__).resolve().parents[1]
-    test_data = repo / "test_data"
-    bands = sorted(test_data.glob("band_*.csv"))
+def run_band(band: Path, out_root: Path) -> dict:
+    """DD -> DD-R -> E for one band, in-process, into out_root/<band>/ (own directory)."""
+    band_name = band.stem
+    band_dir = out_root / band_name
+    band_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    error = None
+    try:
+        _, dd, ddr, e = run_pipeline(band, band_name)
+        reports = {"dd_report.json": dd, "ddr_report.json": ddr, "e_report.json": e}
+    except Exception as exc:  # a broken band must not stop the suite
+        reports = {}
+        error = f"{type(exc).__name__}: {exc}"
+
+    artifacts = []
+    for name, payload in reports.items():
+        data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+        (band_dir / name).write_bytes(data)
+        artifacts.append({"path": name, "sha256": hashlib.sha256(data).hexdigest()})
+    duration = time.perf_counter() - t0
+
+    manifest = {
+        "version": "0.1",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "band": band_name,
+        "input_csv": str(band.as_posix()),
+        "artifacts": artifacts,
+        "runner": "scripts/run_sost.py:run_pipeline (in-process)",
+    }
+    if error:
+        manifest["error"] = error
+    (band_dir / "run_manifest.json").write_text(
+        json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8"
+    )
 
-    if not bands:
-        print("No band_*.csv found in test_data/")
-        return 2
+    band_summary = summarize(
+        reports.get("dd_report.json"), reports.get("ddr_report.json"), reports.get("e_report.json"),
+    )
+    band_summary["band"] = band_name
+    band_summary["success"] = bool(artifacts)
+    band_summary["duration_s"] = round(duration, 6)
+    if error:
+        band_summary["error"] = error
+    return band_summary
 
-    runner = repo / "scripts" / "run_sost.py"
-    if not runner.exists():
-        print("Missing scripts/run_sost.py")
-        return 2
 
-    env = os.environ.copy()
-    env["PYTHONPATH"] = "."
+def main(argv: list[str] | None = None) -> int:
+    repo = Path(__file__).resolve().parents[1]
+    ap = argparse.ArgumentParser(description="Run SOST on every band CSV (in-process, bands in parallel)")
+    ap.add_argument("--bands-dir", default=str(repo / "test_data"), help="Directory holding the band CSVs")
+    ap.add_argument("--pattern", default="band_*.csv", help="Glob for band files inside --bands-dir")
+    ap.add_argument("--out", default=None,
+                    help="Output root (default: _ci_out_bands, wiped first; a given directory only has "
+                         "this suite's band directories and bands_summary.json replaced)")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = ap.parse_args(argv)
+
+    bands = sorted(Path(args.bands_dir).glob(args.pattern))
+    if not bands:
+        print(f"No {args.pattern} found in {args.bands_dir}")
+        return 2
 
-    out_root = repo / "_ci_out_bands"
-    shutil.rmtree(out_root, ignore_errors=True)
+    if args.out is None:
+        out_root = repo / "_ci_out_bands"
+        shutil.rmtree(out_root, ignore_errors=True)
+    else:
+        # Never wipe a user-supplied root: only what this run rewrites.
+        out_root = Path(args.out)
+        for b in bands:
+            shutil.rmtree(out_root / b.stem, ignore_errors=True)
+        (out_root / "bands_summary.json").unlink(missing_ok=True)
     out_root.mkdir(parents=True, exist_ok=True)
 
-    default_out = repo / "_ci_out"
-    minimal = test_data / "minimal_timeseries.csv"
-    minimal_bak = test_data / "minimal_timeseries.csv.bak"
+    workers = max(1, args.workers or os.cpu_count() or 1)
+    created_at = datetime.now(timezone.utc).isoformat()
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [run_band(b, out_root) for b in bands]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk = max(1, len(bands) // (workers * 8))
+            results = list(pool.map(run_band, bands, [out_root] * len(bands), chunksize=chunk))
+    wall = time.perf_counter() - t0
+
+    for r in results:
+        print(f"BAND: {r['band']}  {'OK' if r['success'] else 'FAILED'}  {r['duration_s'] * 1000:.1f} ms")
 
+    ok_count = sum(1 for r in results if r["success"])
+    durations = [r["duration_s"] for r in results]
     summary = {
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "bands": [],
+        "created_at": created_at,
+        "workers": workers,
+        "wall_s": round(wall, 6),
+        "sum_band_s": round(sum(durations), 6),
+        "bands": results,
     }
-
-    ok_count = 0
-
-    for band in bands:
-        band_name = band.stem
-        print("\n==============================")
-        print("BAND:", band_name)
-        print("==============================")
-
-        band_dir = out_root / band_name
-        band_dir.mkdir(parents=True, exist_ok=True)
-
-        shutil.rmtree(default_out, ignore_errors=True)
-
-        tried = []
-        variants = [
-            ["python", "scripts/run_sost.py", "--input", str(band), "--outdir", "_ci_out"],
-            ["python", "scripts/run_sost.py", "--input-csv", str(band), "--outdir", "_ci_out"],
-            ["python", "scripts/run_sost.py", str(band)],
-        ]
-
-        success = False
-        for cmd in variants:
-            tried.append(cmd)
-            if run_cmd(cmd, repo, env):
-                success = True
-                break
-
-        replaced_minimal = False
-        if not success:
-            try:
-                if minimal.exists():
-                    shutil.copy2(minimal, minimal_bak)
-                shutil.copy2(band, minimal)
-                replaced_minimal = True
-                if run_cmd(["python", "scripts/run_sost.py"], repo, env):
-                    success = True
-            finally:
-                if replaced_minimal and minimal_bak.exists():
-                    shutil.copy2(minimal_bak, minimal)
-                    minimal_bak.unlink(missing_ok=True)
-
-        dd = find_artifact(default_out, "dd_report.json")
-        ddr = find_artifact(default_out, "ddr_report.json")
-        er = find_artifact(default_out, "e_report.json")
-
-        if dd:
-            shutil.copy2(dd, band_dir / "dd_report.json")
-        if ddr:
-            shutil.copy2(ddr, band_dir / "ddr_report.json")
-        if er:
-            shutil.copy2(er, band_dir / "e_report.json")
-
-        artifacts = []
-        for name in ["dd_report.json", "ddr_report.json", "e_report.json"]:
-            p = band_dir / name
-            if p.exists():
-                artifacts.append({"path": name, "sha256": sha256_file(p)})
-
-        manifest = {
-            "version": "0.1",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "band": band_name,
-            "input_csv": str(band.as_posix()),
-            "artifacts": artifacts,
-            "attempted_commands": [" ".join(x) for x in tried],
-        }
-        (band_dir / "run_manifest.json").write_text(
-            json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8"
-        )
-
-        band_summary = summarize(
-            band_dir / "dd_report.json" if (band_dir / "dd_report.json").exists() else None,
-            band_dir / "ddr_report.json" if (band_dir / "ddr_report.json").exists() else None,
-            band_dir / "e_report.json" if (band_dir / "e_report.json").exists() else None,
-        )
-        band_summary["band"] = band_name
-        band_summary["success"] = bool(success and artifacts)
-        summary["bands"].append(band_summary)
-
-        if success and artifacts:
-            ok_count += 1
-
     (out_root / "bands_summary.json").write_text(
         json.dumps(summary, indent=2, sort_keys=True), encoding="utf-8"
     )
@@ -3,13 +3,17 @@ from __future__ import annotations
 import argparse
 import csv
 import hashlib
+import io
 import json
+import os
+import re
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from sost.dd_coherence import compute_dd
-from sost.dd_restoration import compute_ddr
-from sost.equilibrium import compute_e
+from sost.dd_coherence import compute_dd, compute_dd_stream, compute_dd_sweep
+from sost.dd_restoration import compute_ddr, compute_ddr_batch
+from sost.equilibrium import compute_e, compute_e_batch
+from sost.panel import read_panel, run_panel
 
 
 def _sha256_file(path: Path) -> str:
@@ -20,16 +24,16 @@ def _sha256_file(path: Path) -> str:
     return h.hexdigest()
 
 
-def _read_csv_series(path: Path) -> Tuple[List[str], List[float]]:
-    """Read a minimal CSV time series.
+def _iter_csv_series(path: Path, text: Optional[str] = None) -> Iterator[Tuple[str, float]]:
+    """Yield (t, value) rows of a minimal CSV time series, one at a time.
 
 Expected columns:
   - t (time)  or time
   - value     or y
 
-Any extra columns are ignored.
+Any extra columns are ignored. `text` is the already-read file content.
 """
-    with path.open("r", encoding="utf-8") as f:
+    with (io.StringIO(text, newline="") if text is not None else path.open("r", encoding="utf-8")) as f:
         reader = csv.DictReader(f)
         if reader.fieldnames is None:
             raise ValueError("CSV has no header")
@@ -39,26 +43,188 @@ Any extra columns are ignored.
         if t_key is None or v_key is None:
             raise ValueError("CSV must contain columns (t|time) and (value|y)")
 
-        ts: List[str] = []
-        vs: List[float] = []
         for row in reader:
-            ts.append(str(row[t_key]))
-            vs.append(float(row[v_key]))
+            yield str(row[t_key]), float(row[v_key])
+
+
+def _read_csv_series(path: Path, text: Optional[str] = None) -> Tuple[List[str], List[float]]:
+    ts: List[str] = []
+    vs: List[float] = []
+    for t, v in _iter_csv_series(path, text):
+        ts.append(t)
+        vs.append(v)
     return ts, vs
 
 
-def _write_json(path: Path, payload) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+def _count_rows(path: Path) -> int:
+    return sum(1 for _ in _iter_csv_series(path))
+
+
+def _time_key(t: str) -> Any:
+    try:
+        return (0, float(t))
+    except ValueError:
+        return (1, t)
+
+
+def _split_at(split_t: str) -> Callable[[str], bool]:
+    """Post window starts at the first t >= split_t (numeric if both parse, else lexical/ISO)."""
+    ref = _time_key(split_t)
+    return lambda t: _time_key(t) >= ref
+
+
+def _read_input(path: Path) -> Tuple[str, str]:
+    """Read the input once: (sha256, text)."""
+    data = path.read_bytes()
+    return hashlib.sha256(data).hexdigest(), data.decode("utf-8")
+
+
+class _Artifacts:
+    """Run outputs serialized once, hashed from memory, written in one phase.
+
+    `write()` creates each directory once and writes every file; with
+    atomic=True each file goes through a temporary name and os.replace, the
+    manifest (added last) being renamed last.
+    """
 
+    def __init__(self, run_dir: Path):
+        self.run_dir = run_dir
+        self.files: Dict[str, bytes] = {}
 
-def main() -> int:
+    def add_json(self, rel: str, payload: Any, compact: bool = False) -> str:
+        if compact:
+            text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        else:
+            text = json.dumps(payload, ensure_ascii=False, indent=2)
+        data = text.encode("utf-8")
+        self.files[rel] = data
+        return hashlib.sha256(data).hexdigest()
+
+    def write(self, atomic: bool = False) -> None:
+        made = set()
+        for rel, data in self.files.items():
+            path = self.run_dir / rel
+            if path.parent not in made:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                made.add(path.parent)
+            target = path.with_name(f".{path.name}.{os.getpid()}.tmp") if atomic else path
+            with open(target, "wb") as f:
+                f.write(data)
+            if atomic:
+                os.replace(target, path)
+
+
+def _load_series(path: Path) -> Tuple[str, List[float]]:
+    """Read and parse the input once: (sha256, values)."""
+    input_sha, text = _read_input(path)
+    _, values = _read_csv_series(path, text)
+    return input_sha, values
+
+
+def run_pipeline(
+    input_path: Path,
+    run_id: str,
+    split_index: Optional[int] = None,
+    loaded: Optional[Tuple[str, List[float]]] = None,
+) -> Tuple[str, dict, dict, dict]:
+    """DD -> DD-R -> E on one CSV series, in memory: (input sha256, dd, ddr, e).
+
+    `loaded` is the (sha256, values) pair of `_load_series(input_path)` when
+    the caller already parsed the input; otherwise it is read here.
+    """
+    input_sha, values = loaded if loaded is not None else _load_series(input_path)
+    dd_report = compute_dd(values, split_index=split_index)
+    dd_report["run_id"] = run_id
+    dd_report["input"] = {"path": str(input_path), "sha256": input_sha, "n": dd_report["windowing"]["n"]}
+    ddr_report = compute_ddr(dd_report)
+    ddr_report["run_id"] = run_id
+    e_report = compute_e(ddr_report)
+    e_report["run_id"] = run_id
+    return input_sha, dd_report, ddr_report, e_report
+
+
+def _parse_sweep(spec: str) -> Optional[range]:
+    """'all' -> every split; 'start:stop[:step]' -> that range of split indices."""
+    if spec == "all":
+        return None
+    parts = spec.split(":")
+    if len(parts) not in (2, 3) or not all(p.strip().lstrip("-").isdigit() for p in parts):
+        raise ValueError(f"invalid --split-sweep {spec!r} (expected 'all' or start:stop[:step])")
+    return range(*(int(p) for p in parts))
+
+
+def _entity_slug(entity: str, taken: set) -> str:
+    base = re.sub(r"[^A-Za-z0-9._-]+", "_", entity).strip("._")[:80] or "entity"
+    slug, i = base, 2
+    while slug in taken:
+        slug, i = f"{base}_{i}", i + 1
+    taken.add(slug)
+    return slug
+
+
+def run_panel_mode(args: argparse.Namespace, input_path: Path, run_dir: Path, run_id: str) -> int:
+    """Long-format CSV: one columnar report + one small manifest per entity."""
+    panel = read_panel(
+        input_path,
+        entity_columns=args.entity_col or None,
+        time_column=args.time_col,
+        value_column=args.value_col,
+    )
+    report = run_panel(panel, split_index=args.split_index, split_t=args.split_t, workers=args.workers)
+    input_sha = _sha256_file(input_path)
+    report["run_id"] = run_id
+    report["input"] = {"path": str(input_path), "sha256": input_sha}
+    out = _Artifacts(run_dir)
+    # Columnar and unindented: one list per field, one entry per entity.
+    report_sha = out.add_json("panel/panel_report.json", report, compact=True)
+
+    cols = report["columns"]
+    taken: set = set()
+    entities = {}
+    for i, entity in enumerate(cols["entity"]):
+        slug = _entity_slug(entity, taken)
+        out.add_json(f"entities/{slug}/run_manifest.json", {
+            "run_id": run_id,
+            "entity": entity,
+            "input": {"path": str(input_path), "sha256": input_sha, "n": cols["n"][i]},
+            "report": {"path": "panel/panel_report.json", "sha256": report_sha, "row": i},
+            "equilibrium_state": cols["equilibrium_state"][i],
+        })
+        entities[entity] = f"entities/{slug}/run_manifest.json"
+
+    out.add_json("run_manifest.json", {
+        "run_id": run_id,
+        "mode": "panel",
+        "input": {"path": str(input_path), "sha256": input_sha},
+        "artifacts": {"panel": "panel/panel_report.json", "entities": entities},
+        "hashes": {"panel_report.json": report_sha},
+    })
+    out.write(atomic=args.atomic)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser(description="Run SOST DD → DD-R → E (descriptive-only)")
     ap.add_argument("--input", required=True, help="CSV input (columns: t/time and value/y)")
     ap.add_argument("--out", required=True, help="Output directory")
     ap.add_argument("--run-id", default=None, help="Optional run id (folder name). If omitted, uses 'run'")
     ap.add_argument("--split-index", type=int, default=None, help="Optional split index for DD windows")
-    args = ap.parse_args()
+    ap.add_argument("--split-t", default=None, help="Optional split timestamp: post window starts at the first t >= this")
+    ap.add_argument("--stream", action="store_true",
+                    help="One pass over the CSV with online accumulators (constant memory); "
+                         "without a split, a counting pass picks the midpoint")
+    ap.add_argument("--split-sweep", nargs="?", const="all", default=None, metavar="all|START:STOP[:STEP]",
+                    help="Also write dd/dd_sweep.json: DD window stats for every candidate split (columnar)")
+    ap.add_argument("--panel", action="store_true",
+                    help="Long-format CSV (entity, time, value rows): DD -> DD-R -> E per entity, one columnar report")
+    ap.add_argument("--entity-col", action="append", default=[],
+                    help="(panel) entity column, repeatable for a composite key (default: auto-detect)")
+    ap.add_argument("--time-col", default=None, help="(panel) time column (default: auto-detect)")
+    ap.add_argument("--value-col", default=None, help="(panel) value column (default: auto-detect)")
+    ap.add_argument("--workers", type=int, default=None, help="(panel) worker processes (default: CPU count)")
+    ap.add_argument("--atomic", action="store_true",
+                    help="Write each artifact through a temporary file + rename (manifest last)")
+    args = ap.parse_args(argv)
 
     input_path = Path(args.input)
     out_root = Path(args.out)
@@ -66,41 +232,75 @@ def main() -> int:
     run_dir = out_root / run_id
     run_dir.mkdir(parents=True, exist_ok=True)
 
-    ts, values = _read_csv_series(input_path)
-
-    dd_dir = run_dir / "dd"
-    ddr_dir = run_dir / "ddr"
-    e_dir = run_dir / "e"
+    if args.split_index is not None and args.split_t is not None:
+        ap.error("--split-index and --split-t are mutually exclusive")
+    try:
+        sweep_splits = _parse_sweep(args.split_sweep) if args.split_sweep is not None else None
+    except ValueError as e:
+        ap.error(str(e))
+    if args.panel:
+        if args.stream or args.split_sweep is not None:
+            ap.error("--panel cannot be combined with --stream or --split-sweep")
+        return run_panel_mode(args, input_path, run_dir, run_id)
 
-    dd_report = compute_dd(values, split_index=args.split_index)
-    dd_report["run_id"] = run_id
-    dd_report["input"] = {"path": str(input_path), "sha256": _sha256_file(input_path), "n": len(values)}
-    _write_json(dd_dir / "dd_report.json", dd_report)
-
-    ddr_report = compute_ddr(dd_report)
-    ddr_report["run_id"] = run_id
-    _write_json(ddr_dir / "ddr_report.json", ddr_report)
+    # Everything is computed in memory; the input is hashed once and every
+    # report is serialized once, then all files are written together.
+    out = _Artifacts(run_dir)
+    loaded: Optional[Tuple[str, List[float]]] = None
+    if args.stream or args.split_t is not None:
+        input_sha = _sha256_file(input_path)
+        split_index = args.split_index
+        if split_index is None and args.split_t is None:
+            split_index = _count_rows(input_path) // 2
+        dd_report = compute_dd_stream(
+            _iter_csv_series(input_path),
+            split_index=split_index,
+            split_at=_split_at(args.split_t) if args.split_t is not None else None,
+        )
+        dd_report["run_id"] = run_id
+        dd_report["input"] = {"path": str(input_path), "sha256": input_sha, "n": dd_report["windowing"]["n"]}
+        ddr_report = compute_ddr(dd_report)
+        ddr_report["run_id"] = run_id
+        e_report = compute_e(ddr_report)
+        e_report["run_id"] = run_id
+    else:
+        # Parsed once: the pipeline and --split-sweep share the same values.
+        loaded = _load_series(input_path)
+        input_sha, dd_report, ddr_report, e_report = run_pipeline(input_path, run_id, args.split_index, loaded)
 
-    e_report = compute_e(ddr_report)
-    e_report["run_id"] = run_id
-    _write_json(e_dir / "e_report.json", e_report)
+    hashes = {
+        "dd_report.json": out.add_json("dd/dd_report.json", dd_report),
+        "ddr_report.json": out.add_json("ddr/ddr_report.json", ddr_report),
+        "e_report.json": out.add_json("e/e_report.json", e_report),
+    }
+    artifacts = {
+        "dd": "dd/dd_report.json",
+        "ddr": "ddr/ddr_report.json",
+        "e": "e/e_report.json",
+    }
+    if args.split_sweep is not None:
+        # The streaming path keeps no series in memory: the sweep reads it here.
+        values = loaded[1] if loaded is not None else _read_csv_series(input_path)[1]
+        sweep = compute_dd_sweep(values, splits=sweep_splits)
+        if sweep["splits"]:
+            ddr_cols = compute_ddr_batch(sweep["columns"])
+            sweep["columns"].update(ddr_cols)
+            sweep["columns"].update(compute_e_batch(ddr_cols))
+        sweep["run_id"] = run_id
+        sweep["input"] = dd_report["input"]
+        # Columnar and unindented: one list per metric, one entry per split.
+        hashes["dd_sweep.json"] = out.add_json("dd/dd_sweep.json", sweep, compact=True)
+        artifacts["dd_sweep"] = "dd/dd_sweep.json"
 
     # Minimal run manifest (notarisation-lite)
     manifest = {
         "run_id": run_id,
-        "input": {"path": str(input_path), "sha256": _sha256_file(input_path)},
-        "artifacts": {
-            "dd": "dd/dd_report.json",
-            "ddr": "ddr/ddr_report.json",
-            "e": "e/e_report.json",
-        },
-        "hashes": {
-            "dd_report.json": _sha256_file(dd_dir / "dd_report.json"),
-            "ddr_report.json": _sha256_file(ddr_dir / "ddr_report.json"),
-            "e_report.json": _sha256_file(e_dir / "e_report.json"),
-        },
+        "input": {"path": str(input_path), "sha256": input_sha},
+        "artifacts": artifacts,
+        "hashes": hashes,
     }
-    _write_json(run_dir / "run_manifest.json", manifest)
+    out.add_json("run_manifest.json", manifest)
+    out.write(atomic=args.atomic)
     return 0
 
 
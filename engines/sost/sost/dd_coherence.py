@@ -15,12 +15,33 @@ What it does NOT do:
 - claim causality
 - predict
 - judge usefulness or "quality" of the data
+
+Backends: window statistics are computed in pure Python, or with NumPy when
+it is importable (override with SOST_DD_BACKEND=python|numpy or the
+`backend` argument). The NumPy path accepts arrays and buffers
+(array.array, memoryview) without building Python lists. Its reductions
+reproduce the built-in sum() bit for bit (see _np_sum), so the report is
+the same JSON document as the pure-Python one.
 """
 
 from __future__ import annotations
 
+import os
+import sys
 from dataclasses import asdict, dataclass
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:  # optional backend
+    import numpy as _np
+except ImportError:  # pragma: no cover - depends on the environment
+    _np = None
+
+BACKEND_ENV = "SOST_DD_BACKEND"
+BACKENDS = ("python", "numpy")
+
+# sum() over floats is compensated (Neumaier) from Python 3.12 on.
+_COMPENSATED_SUM = sys.version_info >= (3, 12)
 
 
 @dataclass(frozen=True)
@@ -56,41 +77,116 @@ def _stats(xs: Sequence[float]) -> WindowStats:
     )
 
 
-def compute_dd(
-    values: Sequence[float],
-    split_index: Optional[int] = None,
-) -> Dict[str, Any]:
-    """Compute DD report (structure-first).
+def _np_compensate(total: Any, c: Any) -> Any:
+    # sum() adds the compensation only when it is non-zero and finite.
+    return _np.where((c != 0) & _np.isfinite(c), total + c, total)
 
-    Parameters
-    - values: univariate series
-    - split_index: index separating pre/post windows. If None, uses midpoint.
 
-    Returns
-    - dict serializable to JSON
+def _np_sum(arr: Any) -> float:
+    """sum(arr.tolist()), bit for bit, with vectorized passes.
+
+    The running totals of sum() are the sequential prefix sums (np.cumsum is
+    a sequential accumulate, unlike np.sum's pairwise reduction). From 3.12
+    on, sum() also accumulates each addition's rounding error (Neumaier);
+    the error terms only depend on consecutive prefix sums, so they are
+    computed elementwise and accumulated in order the same way.
     """
-    n = len(values)
+    # Overflow to inf/nan is silent, as in sum().
+    with _np.errstate(over="ignore", invalid="ignore"):
+        s = _np.cumsum(_np.concatenate(([0.0], arr)))
+        if not _COMPENSATED_SUM:
+            return float(s[-1])
+        prev, cur = s[:-1], s[1:]
+        err = _np.where(_np.abs(prev) >= _np.abs(arr), (prev - cur) + arr, (arr - cur) + prev)
+        return float(_np_compensate(s[-1], _np.cumsum(err)[-1]))
+
+
+def _np_sum_columns(cols: Sequence[Any]) -> Any:
+    """Row-wise sum(row) over equal-length float columns, bit for bit, column by column."""
+    total = _np.zeros_like(cols[0])
+    c = _np.zeros_like(cols[0])
+    with _np.errstate(over="ignore", invalid="ignore"):
+        for x in cols:
+            t = total + x
+            if _COMPENSATED_SUM:
+                c = c + _np.where(_np.abs(total) >= _np.abs(x), (total - t) + x, (x - t) + total)
+            total = t
+        return _np_compensate(total, c) if _COMPENSATED_SUM else total
+
+
+def _stats_numpy(arr: Any) -> WindowStats:
+    n = int(arr.shape[0])
     if n == 0:
-        return {
-            "version": "0.1",
-            "windowing": {"split_index": 0, "n": 0},
-            "pre": {"stats": asdict(_stats([]))},
-            "post": {"stats": asdict(_stats([]))},
-            "differences": [],
-            "invariants": [],
-            "warnings": ["empty_series"],
-        }
+        return _stats([])
+    # Same terms and the same sums as _mean/_std; the scalar arithmetic is
+    # done on Python floats. (d * d equals Python's d ** 2: both are
+    # correctly rounded.)
+    m = _np_sum(arr) / n
+    std = 0.0
+    if n >= 2:
+        d = arr - m
+        std = (_np_sum(d * d) / (n - 1)) ** 0.5
+    return WindowStats(n=n, mean=m, std=std, min=float(arr.min()), max=float(arr.max()))
 
-    if split_index is None:
-        split_index = n // 2
-    split_index = max(1, min(n - 1, int(split_index)))
 
-    pre = list(map(float, values[:split_index]))
-    post = list(map(float, values[split_index:]))
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Requested backend, else $SOST_DD_BACKEND, else numpy when importable."""
+    backend = backend or os.environ.get(BACKEND_ENV) or ("numpy" if _np is not None else "python")
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown DD backend: {backend!r} (expected one of {BACKENDS})")
+    if backend == "numpy" and _np is None:
+        raise ImportError("DD backend 'numpy' requested but NumPy is not installed")
+    return backend
+
+
+class RunningStats:
+    """One-pass (Welford) accumulator yielding the same WindowStats as _stats()."""
+
+    __slots__ = ("n", "mean", "m2", "min", "max")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def add(self, x: float) -> None:
+        x = float(x)
+        self.n += 1
+        if self.n == 1:
+            self.mean = x
+            self.min = x
+            self.max = x
+            return
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def stats(self) -> WindowStats:
+        if self.n == 0:
+            return _stats([])
+        std = (self.m2 / (self.n - 1)) ** 0.5 if self.n >= 2 else 0.0
+        return WindowStats(n=self.n, mean=float(self.mean), std=float(std), min=self.min, max=self.max)
+
+
+def _empty_report() -> Dict[str, Any]:
+    return {
+        "version": "0.1",
+        "windowing": {"split_index": 0, "n": 0},
+        "pre": {"stats": asdict(_stats([]))},
+        "post": {"stats": asdict(_stats([]))},
+        "differences": [],
+        "invariants": [],
+        "warnings": ["empty_series"],
+    }
 
-    pre_stats = _stats(pre)
-    post_stats = _stats(post)
 
+def _dd_report(n: int, split_index: int, pre_stats: WindowStats, post_stats: WindowStats) -> Dict[str, Any]:
     diffs: List[Dict[str, Any]] = [
         {
             "metric": "mean",
@@ -136,3 +232,187 @@ def compute_dd(
         "invariants": invariants,
         "warnings": warnings,
     }
+
+
+def compute_dd(
+    values: Sequence[float],
+    split_index: Optional[int] = None,
+    backend: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Compute DD report (structure-first).
+
+    Parameters
+    - values: univariate series (sequence, NumPy array or float buffer)
+    - split_index: index separating pre/post windows. If None, uses midpoint.
+    - backend: "python" or "numpy" (default: see resolve_backend)
+
+    Returns
+    - dict serializable to JSON
+    """
+    n = len(values)
+    if n == 0:
+        return _empty_report()
+
+    if split_index is None:
+        split_index = n // 2
+    split_index = max(1, min(n - 1, int(split_index)))
+
+    if resolve_backend(backend) == "numpy":
+        arr = _np.asarray(values, dtype=_np.float64)
+        return _dd_report(n, split_index, _stats_numpy(arr[:split_index]), _stats_numpy(arr[split_index:]))
+
+    pre = list(map(float, values[:split_index]))
+    post = list(map(float, values[split_index:]))
+
+    return _dd_report(n, split_index, _stats(pre), _stats(post))
+
+
+def compute_dd_stream(
+    points: Iterable[Tuple[Any, float]],
+    split_index: Optional[int] = None,
+    split_at: Optional[Callable[[Any], bool]] = None,
+) -> Dict[str, Any]:
+    """Streaming compute_dd: one pass over (t, value) pairs, constant memory.
+
+    The post window starts at `split_index`, or at the first point whose t
+    satisfies `split_at(t)` (time is assumed monotonic). One of the two is
+    required: the midpoint default needs the length up front (see
+    run_sost --stream). Windows are clamped like compute_dd (each keeps at
+    least one point when n >= 2), and the reported split_index is the
+    effective one, so the report matches compute_dd(values, split_index)
+    up to floating-point rounding of mean/std.
+    """
+    if split_index is None and split_at is None:
+        raise ValueError("compute_dd_stream needs split_index or split_at")
+    pre, post = RunningStats(), RunningStats()
+    # The latest pre-window point is held back: if the series ends before
+    # the split, it becomes the post window (compute_dd's clamp to n - 1).
+    pending: Optional[float] = None
+    in_post = False
+    n = 0
+    for i, (t, v) in enumerate(points):
+        v = float(v)
+        n += 1
+        if not in_post and i >= 1:
+            if split_index is not None:
+                in_post = i >= split_index
+            else:
+                in_post = bool(split_at(t))  # type: ignore[misc]
+        if in_post:
+            if pending is not None:
+                pre.add(pending)
+                pending = None
+            post.add(v)
+        else:
+            if pending is not None:
+                pre.add(pending)
+            pending = v
+    if n == 0:
+        return _empty_report()
+    if pending is not None:
+        (post if pre.n >= 1 else pre).add(pending)
+    return _dd_report(n, pre.n, pre.stats(), post.stats())
+
+
+def _sweep_columns_python(xs: List[float], shift: float, splits: List[int]) -> Dict[str, List[float]]:
+    n = len(xs)
+    d = [x - shift for x in xs]
+    s1 = [0.0, *accumulate(d)]
+    s2 = [0.0, *accumulate(v * v for v in d)]
+    pmin = list(accumulate(xs, min))
+    pmax = list(accumulate(xs, max))
+    smin = list(accumulate(reversed(xs), min))[::-1]
+    smax = list(accumulate(reversed(xs), max))[::-1]
+
+    cols: Dict[str, List[float]] = {k: [] for k in (
+        "pre_mean", "post_mean", "pre_std", "post_std", "pre_min", "post_min", "pre_max", "post_max")}
+    for k in splits:
+        for side, a, b in (("pre", 0, k), ("post", k, n)):
+            m = b - a
+            t1 = s1[b] - s1[a]
+            t2 = s2[b] - s2[a]
+            var = (t2 - t1 * t1 / m) / (m - 1) if m >= 2 else 0.0
+            cols[f"{side}_mean"].append(shift + t1 / m)
+            cols[f"{side}_std"].append(max(var, 0.0) ** 0.5)
+        cols["pre_min"].append(pmin[k - 1])
+        cols["pre_max"].append(pmax[k - 1])
+        cols["post_min"].append(smin[k])
+        cols["post_max"].append(smax[k])
+    return cols
+
+
+def _sweep_columns_numpy(arr: Any, shift: float, splits: List[int]) -> Dict[str, List[float]]:
+    n = int(arr.shape[0])
+    d = arr - shift
+    s1 = _np.concatenate(([0.0], _np.cumsum(d)))
+    s2 = _np.concatenate(([0.0], _np.cumsum(d * d)))
+    k = _np.asarray(splits, dtype=_np.int64)
+    cols: Dict[str, List[float]] = {}
+    for side, a, b in (("pre", _np.zeros_like(k), k), ("post", k, _np.full_like(k, n))):
+        m = (b - a).astype(_np.float64)
+        t1 = s1[b] - s1[a]
+        t2 = s2[b] - s2[a]
+        with _np.errstate(divide="ignore", invalid="ignore"):
+            var = _np.where(m >= 2, (t2 - t1 * t1 / m) / (m - 1), 0.0)
+        cols[f"{side}_mean"] = (shift + t1 / m).tolist()
+        cols[f"{side}_std"] = _np.sqrt(_np.maximum(var, 0.0)).tolist()
+    cols["pre_min"] = _np.minimum.accumulate(arr)[k - 1].tolist()
+    cols["pre_max"] = _np.maximum.accumulate(arr)[k - 1].tolist()
+    cols["post_min"] = _np.minimum.accumulate(arr[::-1])[::-1][k].tolist()
+    cols["post_max"] = _np.maximum.accumulate(arr[::-1])[::-1][k].tolist()
+    return cols
+
+
+def compute_dd_sweep(
+    values: Sequence[float],
+    splits: Optional[Iterable[int]] = None,
+    backend: Optional[str] = None,
+) -> Dict[str, Any]:
+    """DD window statistics for many candidate splits at once (columnar report).
+
+    Prefix sums (of values and squares) and running min/max are built once,
+    so each split costs O(1): a sweep over every split of an n-point series
+    is O(n) instead of O(n^2) repeated compute_dd calls. Values are centred
+    on the series mean before accumulation to keep the sum-of-squares
+    variance numerically stable; mean/std agree with compute_dd to rounding,
+    n/min/max exactly.
+
+    - splits: candidate split indices (clamped to [1, n-1] like compute_dd,
+      duplicates dropped, order kept). Default: every split 1..n-1.
+
+    Columns are parallel lists indexed like "splits".
+    """
+    n = len(values)
+    if n < 2:
+        return {"version": "0.1", "n": n, "splits": [], "columns": {}, "warnings": ["series_too_short"]}
+
+    if splits is None:
+        ks = list(range(1, n))
+    else:
+        seen = set()
+        ks = []
+        for k in splits:
+            k = max(1, min(n - 1, int(k)))
+            if k not in seen:
+                seen.add(k)
+                ks.append(k)
+
+    if resolve_backend(backend) == "numpy":
+        arr = _np.asarray(values, dtype=_np.float64)
+        cols = _sweep_columns_numpy(arr, float(arr.mean()), ks)
+    else:
+        xs = list(map(float, values))
+        cols = _sweep_columns_python(xs, sum(xs) / n, ks)
+
+    cols["pre_n"] = ks
+    cols["post_n"] = [n - k for k in ks]
+    for metric in ("mean", "std", "min", "max"):
+        cols[f"delta_{metric}"] = [b - a for a, b in zip(cols[f"pre_{metric}"], cols[f"post_{metric}"])]
+
+    return {
+        "version": "0.1",
+        "n": n,
+        "splits": ks,
+        "columns": {k: cols[k] for k in sorted(cols)},
+        "warnings": ["small_window"] if ks and (min(ks) < 3 or n - max(ks) < 3) else [],
+    }
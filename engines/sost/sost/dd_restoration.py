@@ -9,7 +9,15 @@ Still descriptive-only: no causal inference, no prediction, no normative
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from sost.dd_coherence import _np, resolve_backend
+
+METRICS = ("mean", "std", "min", "max")
+
+# Bucket edges on |rel_delta| (see compute_ddr).
+SMALL_MAX = 0.05
+MEDIUM_MAX = 0.25
 
 
 def _rel_delta(pre: float, post: float) -> float:
@@ -42,9 +50,9 @@ def compute_ddr(dd_report: Dict[str, Any]) -> Dict[str, Any]:
     buckets = {"small": [], "medium": [], "large": []}
     for item in rel:
         r = abs(item["rel_delta"])
-        if r < 0.05:
+        if r < SMALL_MAX:
             buckets["small"].append(item["metric"])
-        elif r < 0.25:
+        elif r < MEDIUM_MAX:
             buckets["medium"].append(item["metric"])
         else:
             buckets["large"].append(item["metric"])
@@ -56,3 +64,45 @@ def compute_ddr(dd_report: Dict[str, Any]) -> Dict[str, Any]:
         "buckets": buckets,
         "warnings": dd_report.get("warnings") or [],
     }
+
+
+def _bucket(r: float) -> str:
+    r = abs(r)
+    return "small" if r < SMALL_MAX else ("medium" if r < MEDIUM_MAX else "large")
+
+
+def _has_missing(table: Mapping[str, Sequence[Any]], keys: Sequence[str]) -> bool:
+    return any(v is None for k in keys for v in table[k])
+
+
+def compute_ddr_batch(
+    table: Mapping[str, Sequence[Any]],
+    metrics: Sequence[str] = METRICS,
+    backend: Optional[str] = None,
+) -> Dict[str, List[Any]]:
+    """DD-R for many series at once, on a columnar table of DD statistics.
+
+    `table` holds parallel columns "pre_<metric>" and "post_<metric>" (as in
+    the panel and sweep reports). Returns columns "rel_delta_<metric>" and
+    "bucket_<metric>" with the same values compute_ddr gives row by row. A
+    None cell yields a None rel_delta/bucket (compute_ddr drops that metric).
+    """
+    keys = [f"{side}_{m}" for m in metrics for side in ("pre", "post")]
+    out: Dict[str, List[Any]] = {}
+    vectorized = resolve_backend(backend) == "numpy" and not _has_missing(table, keys)
+    for m in metrics:
+        pre_col, post_col = table[f"pre_{m}"], table[f"post_{m}"]
+        if vectorized:
+            pre = _np.asarray(pre_col, dtype=_np.float64)
+            post = _np.asarray(post_col, dtype=_np.float64)
+            rel = (post - pre) / _np.where(pre != 0, _np.abs(pre), 1.0)
+            mag = _np.abs(rel)
+            out[f"rel_delta_{m}"] = rel.tolist()
+            out[f"bucket_{m}"] = _np.where(
+                mag < SMALL_MAX, "small", _np.where(mag < MEDIUM_MAX, "medium", "large")).tolist()
+        else:
+            rel_l = [None if a is None or b is None else _rel_delta(float(a), float(b))
+                     for a, b in zip(pre_col, post_col)]
+            out[f"rel_delta_{m}"] = rel_l
+            out[f"bucket_{m}"] = [None if r is None else _bucket(r) for r in rel_l]
+    return out
@@ -8,7 +8,22 @@ This is intentionally lightweight and descriptive.
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from sost.dd_coherence import _np, _np_sum_columns, resolve_backend
+from sost.dd_restoration import METRICS
+
+# State edges on pressure (see compute_e).
+META_STABLE_MAX = 0.05
+DRIFTING_MAX = 0.25
+
+
+def _state(pressure: float) -> str:
+    if pressure < META_STABLE_MAX:
+        return "meta-stable"
+    if pressure < DRIFTING_MAX:
+        return "drifting"
+    return "reconfiguring"
 
 
 def compute_e(ddr_report: Dict[str, Any]) -> Dict[str, Any]:
@@ -28,12 +43,7 @@ def compute_e(ddr_report: Dict[str, Any]) -> Dict[str, Any]:
     dispersion = (sum((m - mean) ** 2 for m in magnitudes) / max(1, len(magnitudes) - 1)) ** 0.5
 
     # Non-normative state label: just partitions of pressure magnitude
-    if pressure < 0.05:
-        state = "meta-stable"
-    elif pressure < 0.25:
-        state = "drifting"
-    else:
-        state = "reconfiguring"
+    state = _state(pressure)
 
     return {
         "version": "0.1",
@@ -42,3 +52,51 @@ def compute_e(ddr_report: Dict[str, Any]) -> Dict[str, Any]:
         "metrics": {"pressure": float(pressure), "dispersion": float(dispersion)},
         "warnings": ddr_report.get("warnings") or [],
     }
+
+
+def compute_e_batch(
+    ddr_table: Mapping[str, Sequence[Any]],
+    metrics: Sequence[str] = METRICS,
+    backend: Optional[str] = None,
+) -> Dict[str, List[Any]]:
+    """E for many series at once, from compute_ddr_batch's "rel_delta_<metric>" columns.
+
+    Returns columns "pressure", "dispersion" and "equilibrium_state", as
+    compute_e gives row by row (metrics with a None rel_delta are left out;
+    a row with none left is "unknown" with zero metrics). The NumPy path
+    works column by column and adds the metrics in order exactly as sum()
+    does (see _np_sum_columns), so both paths equal compute_e bit for bit.
+    """
+    cols = [ddr_table[f"rel_delta_{m}"] for m in metrics]
+    n = len(cols[0]) if cols else 0
+    missing = any(v is None for c in cols for v in c)
+    if cols and resolve_backend(backend) == "numpy" and not missing:
+        mags = [_np.abs(_np.asarray(c, dtype=_np.float64)) for c in cols]
+        pressure = _np_sum_columns(mags) / len(mags)
+        # (m - p) * (m - p) equals compute_e's (m - p) ** 2, both correctly rounded.
+        sq = _np_sum_columns([(m - pressure) * (m - pressure) for m in mags])
+        # compute_e takes ** 0.5 (libm pow), which is not always sqrt; NumPy's
+        # power is not libm's either, so that last step is done per row.
+        dispersion = [v ** 0.5 for v in (sq / max(1, len(mags) - 1)).tolist()]
+        states = _np.where(pressure < META_STABLE_MAX, "meta-stable",
+                           _np.where(pressure < DRIFTING_MAX, "drifting", "reconfiguring"))
+        return {
+            "pressure": pressure.tolist(),
+            "dispersion": dispersion,
+            "equilibrium_state": states.tolist(),
+        }
+
+    out: Dict[str, List[Any]] = {"pressure": [], "dispersion": [], "equilibrium_state": []}
+    for i in range(n):
+        mags = [abs(float(c[i])) for c in cols if c[i] is not None]
+        if not mags:
+            out["pressure"].append(0.0)
+            out["dispersion"].append(0.0)
+            out["equilibrium_state"].append("unknown")
+            continue
+        pressure = sum(mags) / len(mags)
+        dispersion = (sum((m - pressure) ** 2 for m in mags) / max(1, len(mags) - 1)) ** 0.5
+        out["pressure"].append(float(pressure))
+        out["dispersion"].append(float(dispersion))
+        out["equilibrium_state"].append(_state(pressure))
+    return out
@@ -0,0 +1,226 @@
+"""sost.panel
+
+Panel mode: DD → DD-R → E for every entity of a long-format CSV.
+
+Inputs such as CPI.csv (Observation,Year,Unit,Value) or the World Bank
+DATA360 exports (REF_AREA,...,TIME_PERIOD,OBS_VALUE,...) hold one row per
+(entity, time). The file is read once, rows are grouped by entity (missing
+values such as "NA" are skipped and counted), and each entity's series is
+run through DD on worker processes; DD-R and E are then computed for all
+entities at once on the DD columns (compute_ddr_batch / compute_e_batch).
+
+The result is one columnar table (one list per field, one entry per
+entity) instead of one directory of reports per entity. Same descriptive
+scope as the single-series operators.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sost.dd_coherence import compute_dd
+from sost.dd_restoration import METRICS, compute_ddr_batch
+from sost.equilibrium import compute_e_batch
+
+# Auto-detected column names, in order of preference.
+ENTITY_COLUMNS = ("Observation", "REF_AREA", "COUNTRY", "entity", "country", "ISO")
+TIME_COLUMNS = ("Year", "TIME_PERIOD", "t", "time", "date")
+VALUE_COLUMNS = ("Value", "OBS_VALUE", "value", "y")
+# Series dimensions added to the auto-detected entity key when they vary
+# (CPI.csv interleaves two Units per country; DATA360 breaks down by SEX/AGE...).
+DIMENSION_COLUMNS = ("Unit", "INDICATOR", "SEX", "AGE", "URBANISATION", "UNIT_MEASURE",
+                     "COMP_BREAKDOWN_1", "COMP_BREAKDOWN_2", "COMP_BREAKDOWN_3")
+
+NA_VALUES = frozenset({"", "NA", "N/A", "n/a", "NaN", "nan", "null", "NULL", "..", ":", "-"})
+
+
+@dataclass
+class Panel:
+    path: Path
+    entity_columns: Tuple[str, ...]
+    time_column: str
+    value_column: str
+    rows: int = 0
+    skipped: int = 0
+    # entity -> (times, values), in file order
+    series: Dict[str, Tuple[List[str], List[float]]] = field(default_factory=dict)
+
+
+def _pick(fieldnames: Sequence[str], requested: Optional[str], candidates: Sequence[str], what: str) -> str:
+    if requested is not None:
+        if requested not in fieldnames:
+            raise ValueError(f"{what} column {requested!r} not in CSV header")
+        return requested
+    for c in candidates:
+        if c in fieldnames:
+            return c
+    raise ValueError(f"no {what} column found (tried {', '.join(candidates)}); pass it explicitly")
+
+
+def read_panel(
+    path: Path,
+    entity_columns: Optional[Sequence[str]] = None,
+    time_column: Optional[str] = None,
+    value_column: Optional[str] = None,
+) -> Panel:
+    """Group a long-format CSV by entity in one pass.
+
+    Several entity columns (e.g. REF_AREA and SEX) form a composite key
+    joined with "|". Without explicit entity columns, the detected entity
+    column is combined with the DIMENSION_COLUMNS that take more than one
+    value in the file. Rows whose value is missing or not numeric are skipped.
+    """
+    path = Path(path)
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("CSV has no header")
+        if entity_columns:
+            ents = tuple(_pick(header, c, (), "entity") for c in entity_columns)
+        else:
+            primary = _pick(header, None, ENTITY_COLUMNS, "entity")
+            ents = (primary, *(c for c in DIMENSION_COLUMNS if c in header and c != primary))
+        t_col = _pick(header, time_column, TIME_COLUMNS, "time")
+        v_col = _pick(header, value_column, VALUE_COLUMNS, "value")
+
+        e_idx = [header.index(c) for c in ents]
+        t_idx = header.index(t_col)
+        v_idx = header.index(v_col)
+        width = max(*e_idx, t_idx, v_idx) + 1
+
+        panel = Panel(path=path, entity_columns=ents, time_column=t_col, value_column=v_col)
+        series = panel.series
+        for row in reader:
+            panel.rows += 1
+            if len(row) < width:
+                panel.skipped += 1
+                continue
+            raw = row[v_idx].strip()
+            if raw in NA_VALUES:
+                panel.skipped += 1
+                continue
+            try:
+                v = float(raw)
+            except ValueError:
+                panel.skipped += 1
+                continue
+            key = row[e_idx[0]] if len(e_idx) == 1 else tuple(row[i] for i in e_idx)
+            s = series.get(key)
+            if s is None:
+                s = series[key] = ([], [])
+            s[0].append(row[t_idx])
+            s[1].append(v)
+
+    if len(ents) > 1:
+        keep = list(range(len(ents)))
+        if not entity_columns:
+            keep = [0] + [j for j in keep[1:] if len({k[j] for k in series}) > 1]
+        panel.entity_columns = tuple(ents[j] for j in keep)
+        panel.series = {"|".join(k[j] for j in keep): v for k, v in series.items()}
+    return panel
+
+
+def _time_key(t: str) -> Any:
+    try:
+        return (0, float(t))
+    except ValueError:
+        return (1, t)
+
+
+def series_dd(
+    ts: List[str],
+    vs: List[float],
+    split_index: Optional[int] = None,
+    split_t: Optional[str] = None,
+) -> Dict[str, Any]:
+    """DD report for one entity (rows sorted by time first)."""
+    order = sorted(range(len(ts)), key=lambda i: _time_key(ts[i]))
+    ts = [ts[i] for i in order]
+    vs = [vs[i] for i in order]
+    if split_t is not None:
+        ref = _time_key(split_t)
+        split_index = next((i for i, t in enumerate(ts) if _time_key(t) >= ref), len(ts))
+    dd = compute_dd(vs, split_index=split_index)
+    dd["time_range"] = [ts[0], ts[-1]] if ts else []
+    return dd
+
+
+def _row(entity: str, dd: Dict[str, Any]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {
+        "entity": entity,
+        "n": dd["windowing"]["n"],
+        "split_index": dd["windowing"]["split_index"],
+        "t_first": dd["time_range"][0] if dd["time_range"] else None,
+        "t_last": dd["time_range"][-1] if dd["time_range"] else None,
+    }
+    for side in ("pre", "post"):
+        for m in METRICS:
+            row[f"{side}_{m}"] = dd[side]["stats"][m]
+    row["warnings"] = ",".join(dd.get("warnings") or [])
+    return row
+
+
+def _analyze_chunk(
+    items: List[Tuple[str, List[str], List[float]]],
+    split_index: Optional[int],
+    split_t: Optional[str],
+) -> List[Dict[str, Any]]:
+    return [_row(entity, series_dd(ts, vs, split_index, split_t)) for entity, ts, vs in items]
+
+
+def run_panel(
+    panel: Panel,
+    split_index: Optional[int] = None,
+    split_t: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Analyse every entity; returns the columnar panel report.
+
+    Entities are sent to `workers` processes in chunks (default: CPU count;
+    1 runs in-process).
+    """
+    items = [(k, ts, vs) for k, (ts, vs) in sorted(panel.series.items())]
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1 or len(items) < 2:
+        rows = _analyze_chunk(items, split_index, split_t)
+    else:
+        # A few chunks per worker: balances load without per-entity IPC.
+        size = max(1, -(-len(items) // (workers * 4)))
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        rows = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            for part in pool.map(_analyze_chunk, chunks, [split_index] * len(chunks), [split_t] * len(chunks)):
+                rows.extend(part)
+
+    names = list(rows[0]) if rows else ["entity"]
+    columns = {name: [r[name] for r in rows] for name in names}
+    if rows:
+        warnings = columns.pop("warnings")
+        ddr = compute_ddr_batch(columns, METRICS)
+        columns.update(ddr)
+        columns.update(compute_e_batch(ddr, METRICS))
+        columns["warnings"] = warnings
+    states: Dict[str, int] = {}
+    for s in columns.get("equilibrium_state", []):
+        states[s] = states.get(s, 0) + 1
+    return {
+        "version": "0.1",
+        "mode": "panel",
+        "columns_used": {
+            "entity": list(panel.entity_columns),
+            "time": panel.time_column,
+            "value": panel.value_column,
+        },
+        "windowing": {"split_index": split_index, "split_t": split_t},
+        "rows_read": panel.rows,
+        "rows_skipped": panel.skipped,
+        "n_entities": len(rows),
+        "equilibrium_states": dict(sorted(states.items())),
+        "columns": columns,
+    }
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+System D — lecture en flux des sections d'un TEST_MATRIX.md.
+
+Partagé par run_ddr.py et 01_tests_multisector/harness.py : chacun fournit
+ses motifs de titres, sa normalisation et sa règle de fermeture des fences ;
+le parcours (fences, titres, items de liste) est commun.
+
+Les lignes sont consommées une à une (itérateur de fichier ou toute
+séquence) ; seuls les compteurs par section, les sections détectées et un
+aperçu borné des items non assignés sont conservés.
+
+Aucune dépendance externe.
+"""
+
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Pattern
+
+LIST_ITEM_RE = re.compile(r"^\s{0,3}(-|\*|\d+\.)\s+")
+HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+")
+
+# Titres normalisés gardés en cache (les matrices générées répètent les mêmes).
+NORM_CACHE_MAX = 4096
+
+
+# Séparateurs de str.splitlines() (hors "\r\n", déjà traduit en "\n" en mode texte).
+_LINE_BREAKS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+def iter_lines(path: str, encoding: str = "utf-8", chunk_size: int = 1 << 20) -> Iterator[str]:
+    """Lignes d'un fichier texte, découpées exactement comme str.splitlines() sur le texte entier.
+
+    Lecture par blocs de `chunk_size` caractères ; seule la ligne inachevée
+    d'un bloc est reportée sur le suivant.
+    """
+    with open(path, "r", encoding=encoding, errors="ignore") as f:
+        carry = ""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buf = carry + chunk if carry else chunk
+            lines = buf.splitlines()
+            carry = "" if buf[-1] in _LINE_BREAKS else lines.pop()
+            yield from lines
+        if carry:
+            yield carry
+
+
+class SectionScanner:
+    """Compte les items de liste par section, ligne par ligne.
+
+    - fence_re : ouverture de bloc de code, groupe 1 = jeton de fence ;
+      exact_fence_close=False : ferme sur une ligne fence_re de même jeton,
+      True : ferme si la ligne (strip) est exactement le jeton.
+    - break_on_blank : une ligne vide (hors fence) termine la section courante.
+    - preview : nombre d'items non assignés conservés (None : tous) ;
+      keep_items=True garde aussi les items de chaque section.
+    """
+
+    def __init__(
+        self,
+        section_keys: Iterable[str],
+        patterns: Dict[str, Pattern],
+        normalize: Callable[[str], str],
+        fence_re: Pattern,
+        exact_fence_close: bool = False,
+        break_on_blank: bool = False,
+        preview: Optional[int] = 20,
+        keep_items: bool = False,
+    ):
+        self.patterns = patterns
+        self.normalize = normalize
+        self.fence_re = fence_re
+        self.exact_fence_close = exact_fence_close
+        self.break_on_blank = break_on_blank
+        self.preview = preview
+        self.counts: Dict[str, int] = {k: 0 for k in section_keys}
+        self.items: Optional[Dict[str, List[str]]] = {k: [] for k in self.counts} if keep_items else None
+        self.unassigned_count = 0
+        self.unassigned_preview: List[str] = []
+        self.detected: List[str] = []
+        self.total_lines = 0
+        self.ignored_codeblock_lines = 0
+        self._current: Optional[str] = None
+        self._fence: Optional[str] = None
+        self._norm_cache: Dict[str, str] = {}
+
+    def _section_of(self, title: str) -> Optional[str]:
+        key = self._norm_cache.get(title)
+        if key is None:
+            key = self.normalize(title)
+            if len(self._norm_cache) < NORM_CACHE_MAX:
+                self._norm_cache[title] = key
+        for k, rx in self.patterns.items():
+            if rx.search(key):
+                return k
+        return None
+
+    def feed(self, line: str) -> None:
+        self.scan((line,))
+
+    def scan(self, lines: Iterable[str]) -> "SectionScanner":
+        # Boucle unique, état en variables locales (appelée sur des millions de lignes).
+        counts, items, preview = self.counts, self.items, self.unassigned_preview
+        fence_match = self.fence_re.match
+        heading_match, item_match = HEADING_RE.match, LIST_ITEM_RE.match
+        exact_close, break_on_blank = self.exact_fence_close, self.break_on_blank
+        current, fence = self._current, self._fence
+        total = ignored = unassigned = 0
+        for line in lines:
+            total += 1
+            if fence is not None:
+                ignored += 1
+                if exact_close:
+                    if line.strip() == fence:
+                        fence = None
+                else:
+                    m = fence_match(line)
+                    if m and m.group(1) == fence:
+                        fence = None
+                continue
+            if break_on_blank and not line.strip():
+                current = None
+                continue
+            m = fence_match(line)
+            if m:
+                fence = m.group(1)
+                ignored += 1
+                continue
+            if heading_match(line):
+                current = self._section_of(HEADING_RE.sub("", line).strip())
+                if current is not None:
+                    self.detected.append(current)
+                continue
+            if item_match(line):
+                if current is not None and current in counts:
+                    counts[current] += 1
+                    if items is not None:
+                        items[current].append(line.strip())
+                else:
+                    unassigned += 1
+                    if self.preview is None or len(preview) < self.preview:
+                        preview.append(line.strip())
+        self._current, self._fence = current, fence
+        self.total_lines += total
+        self.ignored_codeblock_lines += ignored
+        self.unassigned_count += unassigned
+        return self
@@ -21,6 +21,8 @@ Aucune dépendance externe.
 """
 
 import argparse
+import bisect
+import csv
 import json
 import math
 import os
@@ -28,9 +30,13 @@ import re
 import statistics
 import sys
 import unicodedata
+from array import array
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
+from md_sections import SectionScanner, iter_lines
+import struct_n
+
 # -------------------------
 # Normalisation texte
 # -------------------------
@@ -115,74 +121,28 @@ SECTION_PATTERNS = {
     "B_metrologie": re.compile(r"\bb\b.*(metrologie)"),
 }
 
-LIST_ITEM_RE = re.compile(r"^\s{0,3}(-|\*|\d+\.)\s+")
-HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+")
 FENCE_RE = re.compile(r"^\s{0,3}(```|~~~)")
 
-def _strip_fenced_code_blocks(lines: List[str]) -> Tuple[List[str], int]:
-    """
-    Supprime les blocs fenced (``` ou ~~~) pour éviter de compter des listes internes au code.
-    Retourne (lignes_filtrees, nb_lignes_ignores).
-    """
-    out = []
-    in_fence = False
-    fence_token = None
-    ignored = 0
-    for ln in lines:
-        m = FENCE_RE.match(ln)
-        if m:
-            tok = m.group(1)
-            if not in_fence:
-                in_fence = True
-                fence_token = tok
-            else:
-                # fermer si même token
-                if tok == fence_token:
-                    in_fence = False
-                    fence_token = None
-            ignored += 1
-            continue
-        if in_fence:
-            ignored += 1
-            continue
-        out.append(ln)
-    return out, ignored
+def _scanner(keep_items: bool = False) -> SectionScanner:
+    # Fence : ouverture ``` ou ~~~ ; fermeture par une ligne ouvrant avec le même jeton.
+    return SectionScanner(SECTION_KEYS, SECTION_PATTERNS, _norm_key, FENCE_RE,
+                          preview=None if keep_items else 20, keep_items=keep_items)
 
-def parse_test_matrix(md_text: str) -> Tuple[Dict[str, List[str]], List[str], List[str], Dict]:
-    lines = md_text.splitlines()
-    lines, ignored_code = _strip_fenced_code_blocks(lines)
-
-    items: Dict[str, List[str]] = {k: [] for k in SECTION_KEYS}
-    unassigned: List[str] = []
-    detected_sections: List[str] = []
-    current: Optional[str] = None
-
-    for ln in lines:
-        # heading?
-        if HEADING_RE.match(ln):
-            title = HEADING_RE.sub("", ln).strip()
-            title_n = _norm_key(title)
-            current = None
-            for k, rx in SECTION_PATTERNS.items():
-                if rx.search(title_n):
-                    current = k
-                    detected_sections.append(k)
-                    break
-            continue
-
-        # list item?
-        if LIST_ITEM_RE.match(ln):
-            if current in items:
-                items[current].append(ln.strip())
-            else:
-                unassigned.append(ln.strip())
-
-    meta = {
-        "ignored_codeblock_lines": ignored_code,
-        "total_lines": len(md_text.splitlines()),
-        "total_lines_after_filter": len(lines),
+def _parsing_meta(sc: SectionScanner) -> Dict:
+    return {
+        "ignored_codeblock_lines": sc.ignored_codeblock_lines,
+        "total_lines": sc.total_lines,
+        "total_lines_after_filter": sc.total_lines - sc.ignored_codeblock_lines,
     }
-    return items, unassigned, detected_sections, meta
+
+def parse_test_matrix(md_text: str) -> Tuple[Dict[str, List[str]], List[str], List[str], Dict]:
+    """Items par section, items non assignés, sections détectées, méta (texte en mémoire)."""
+    sc = _scanner(keep_items=True).scan(md_text.splitlines())
+    return sc.items, sc.unassigned_preview, sc.detected, _parsing_meta(sc)
+
+def scan_test_matrix(path: str) -> SectionScanner:
+    """Parcours en flux du fichier : compteurs + aperçu borné des non assignés (mémoire constante)."""
+    return _scanner().scan(iter_lines(path))
 
 # -------------------------
 # DD-R + E logic
@@ -215,6 +175,13 @@ def compute_invariants(series: List[int], thr: Thresholds) -> Dict[str, Optional
         inv["std"] = statistics.stdev(xs)          # ddof=1
     return inv
 
+def compute_invariants_struct_n(n: int, thr: Thresholds) -> Dict[str, Optional[float]]:
+    """Noyau STRUCT_N : invariants de la série proxy 1..n en O(1) (cf. struct_n.py).
+
+    Égal bit à bit à compute_invariants(list(range(1, n + 1))) (cf. TestStructN).
+    """
+    return struct_n.invariants(n, thr)
+
 def ddr_compare(inv_pre: Dict[str, Optional[float]], inv_post: Dict[str, Optional[float]], thr: Thresholds) -> Dict:
     diffs: Dict[str, Optional[float]] = {}
     ok, ko, nc = [], [], []
@@ -259,6 +226,158 @@ def e_compatibility(inv_pre: Dict[str, Optional[float]], inv_post: Dict[str, Opt
         status = "COMPATIBLE"
     return {"E": status, "ko": ko, "nc": nc}
 
+# -------------------------
+# Mode séries numériques (CSV)
+# -------------------------
+
+def _kth_of_two(a, la: int, b, lb: int, k: int) -> float:
+    """k-ième plus petit (0-based) de la fusion de deux suites croissantes a(i), b(j)."""
+    lo, hi = max(0, k + 1 - lb), min(k + 1, la)
+    while lo < hi:
+        i = (lo + hi) // 2
+        if a(i) < b(k - i):
+            lo = i + 1
+        else:
+            hi = i
+    i, j = lo, k + 1 - lo
+    cands = []
+    if i > 0:
+        cands.append(a(i - 1))
+    if j > 0:
+        cands.append(b(j - 1))
+    return max(cands)
+
+def _mad_from_sorted(xs_sorted: List[float], med: float) -> float:
+    """Médiane des |x - med| sans second tri ni liste d'écarts.
+
+    Les écarts des valeurs < med (lues de droite à gauche) et des valeurs >= med
+    (lues de gauche à droite) forment deux suites croissantes : le rang médian
+    de leur fusion se trouve par dichotomie (O(log n)). Mêmes flottants que _mad.
+    """
+    n = len(xs_sorted)
+    s = bisect.bisect_left(xs_sorted, med)
+
+    def left(i: int) -> float:
+        return med - xs_sorted[s - 1 - i]
+
+    def right(j: int) -> float:
+        return xs_sorted[s + j] - med
+
+    m = n // 2
+    if n % 2 == 1:
+        return _kth_of_two(left, s, right, n - s, m)
+    return (_kth_of_two(left, s, right, n - s, m - 1) + _kth_of_two(left, s, right, n - s, m)) / 2.0
+
+def compute_invariants_values(values: "array", thr: Thresholds) -> Dict[str, Optional[float]]:
+    """Invariants d'une fenêtre de valeurs numériques (un seul tri).
+
+    Le tri sert à la médiane, aux quantiles et au MAD (_mad_from_sorted).
+    mean = fsum/n ; variance (ddof=1) en deux passes sur `values` (fsum des
+    carrés des écarts) : mêmes définitions que compute_invariants, sans
+    l'arithmétique exacte de `statistics` (trop lente sur 10^6+ valeurs).
+    """
+    n = len(values)
+    inv: Dict[str, Optional[float]] = {
+        "mean": None, "median": None, "MAD": None, "p90": None, "p99": None,
+        "variance": None, "std": None, "entropy": None,
+    }
+    if n == 0:
+        return inv
+    mean = math.fsum(values) / n
+    inv["mean"] = mean
+    if n >= thr.min_n_for_moments and n >= 2:
+        var = math.fsum((x - mean) * (x - mean) for x in values) / (n - 1)
+        inv["variance"] = var
+        inv["std"] = math.sqrt(var)
+    xs_sorted = sorted(values)
+    med = _median_sorted(xs_sorted)
+    inv["median"] = med
+    if n >= thr.min_n_for_MAD:
+        inv["MAD"] = _mad_from_sorted(xs_sorted, med)
+    inv["p90"] = _q_linear_sorted(xs_sorted, 0.90, thr.min_n_for_quantiles)
+    inv["p99"] = _q_linear_sorted(xs_sorted, 0.99, thr.min_n_for_quantiles)
+    return inv
+
+def _t_key(t: str):
+    try:
+        return (0, float(t))
+    except ValueError:
+        return (1, t)
+
+def read_series_csv(
+    path: str,
+    value_col: Optional[str] = None,
+    pre_col: Optional[str] = None,
+    post_col: Optional[str] = None,
+    split_index: Optional[int] = None,
+    time_col: Optional[str] = None,
+    split_t: Optional[str] = None,
+    delimiter: str = ",",
+) -> Tuple["array", "array", Dict]:
+    """Lit le CSV en flux et remplit les fenêtres pre/post (array('d'), 8 octets/valeur).
+
+    Deux formes :
+      - `value_col` + coupure : lignes [0, split_index) → pre, le reste → post
+        (sans coupure : milieu des lignes, compté par une première passe) ;
+        ou, avec `time_col` + `split_t`, t < split_t → pre (comparaison
+        numérique si possible) ;
+      - `pre_col` + `post_col` : chaque ligne alimente les deux fenêtres.
+    Valeurs vides / non numériques / non finies : ignorées et comptées.
+    Lève KeyError si une colonne est absente de l'en-tête.
+    """
+    pre, post = array("d"), array("d")
+    meta = {"rows_read": 0, "skipped_pre": 0, "skipped_post": 0}
+    if value_col is not None and split_index is None and time_col is None:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            split_index = max(0, sum(1 for _ in csv.reader(f, delimiter=delimiter)) - 1) // 2
+        meta["split_index"] = split_index
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = [h.strip() for h in next(reader, None) or []]
+
+        def idx(col: str) -> int:
+            if col not in header:
+                raise KeyError(col)
+            return header.index(col)
+
+        def num(raw: str) -> Optional[float]:
+            try:
+                v = float(raw)
+            except ValueError:
+                return None
+            return v if math.isfinite(v) else None
+
+        if value_col is not None:
+            vi = idx(value_col)
+            ti = idx(time_col) if time_col is not None else None
+            ref = _t_key(split_t) if split_t is not None else None
+            row_no = 0
+            for row in reader:
+                meta["rows_read"] += 1
+                if ti is not None:
+                    to_pre = len(row) > ti and _t_key(row[ti].strip()) < ref
+                else:
+                    to_pre = split_index is not None and row_no < split_index
+                row_no += 1
+                v = num(row[vi]) if len(row) > vi else None
+                if v is None:
+                    meta["skipped_pre" if to_pre else "skipped_post"] += 1
+                elif to_pre:
+                    pre.append(v)
+                else:
+                    post.append(v)
+        else:
+            pi, qi = idx(pre_col), idx(post_col)
+            for row in reader:
+                meta["rows_read"] += 1
+                for i, win, key in ((pi, pre, "skipped_pre"), (qi, post, "skipped_post")):
+                    v = num(row[i]) if len(row) > i else None
+                    if v is None:
+                        meta[key] += 1
+                    else:
+                        win.append(v)
+    return pre, post, meta
+
 def _summary_human(ddr: Dict, thr: Thresholds) -> str:
     # Résumé non technique minimal, sans interprétation causale.
     nc = ddr["invariants_nc"]
@@ -328,8 +447,105 @@ def _run_tests() -> int:
             self.assertIsNone(inv["variance"])
             self.assertIsNone(inv["std"])
 
-
-    suite = unittest.defaultTestLoader.loadTestsFromTestCase(TestCore)
+    class TestStructN(unittest.TestCase):
+        """Propriété : noyau O(1) == calcul sur la liste 1..n, bit à bit."""
+
+        def _check(self, n, thr):
+            ref = compute_invariants(list(range(1, n + 1)), thr)
+            got = compute_invariants_struct_n(n, thr)
+            self.assertEqual(set(got), set(ref))
+            for k, v in ref.items():
+                self.assertEqual(repr(got[k]), repr(v), f"n={n} {k}")
+
+        def test_small_n(self):
+            thr = Thresholds()
+            for n in range(0, 600):
+                self._check(n, thr)
+
+        def test_large_n(self):
+            thr = Thresholds()
+            for n in (999, 1000, 1001, 4095, 4096, 65537, 99991, 100000, 250001):
+                self._check(n, thr)
+
+        def test_thresholds(self):
+            for thr in (Thresholds(min_n_for_moments=0, min_n_for_quantiles=0, min_n_for_MAD=0),
+                        Thresholds(min_n_for_moments=50, min_n_for_quantiles=7, min_n_for_MAD=9)):
+                for n in range(0, 60):
+                    self._check(n, thr)
+
+        def test_huge_n(self):
+            # Hors de portée du calcul sur liste : valeurs attendues exactes.
+            n = 10 ** 9
+            inv = compute_invariants_struct_n(n, Thresholds())
+            self.assertEqual(inv["mean"], 500000000.5)
+            self.assertEqual(inv["median"], 500000000.5)
+            self.assertEqual(inv["MAD"], 250000000.0)
+            self.assertEqual(inv["variance"], n * (n + 1) / 12)
+
+    class TestSeries(unittest.TestCase):
+        def test_invariants_match_list_path(self):
+            import random
+            rng = random.Random(0)
+            thr = Thresholds()
+            for n in list(range(0, 40)) + [101, 1000, 1001]:
+                for gen in (lambda: rng.gauss(0.0, 1.0), lambda: float(rng.randint(-3, 3))):
+                    xs = [gen() for _ in range(n)]
+                    ref = compute_invariants(xs, thr)
+                    got = compute_invariants_values(array("d", xs), thr)
+                    for k in ("median", "MAD", "p90", "p99", "entropy"):
+                        self.assertEqual(got[k], ref[k], f"n={n} {k}")
+                    for k in ("mean", "variance", "std"):
+                        if ref[k] is None:
+                            self.assertIsNone(got[k])
+                        else:
+                            self.assertAlmostEqual(got[k], ref[k], delta=1e-12 * max(1.0, abs(ref[k])))
+
+        def test_read_series_csv(self):
+            import tempfile
+            csv_text = "t,y,a,b\n2001,1,1,10\n2002,NA,2,\n2003,3,3,30\n2004,4,x,40\n"
+            with tempfile.TemporaryDirectory() as tmp:
+                p = os.path.join(tmp, "s.csv")
+                with open(p, "w", encoding="utf-8") as f:
+                    f.write(csv_text)
+                pre, post, meta = read_series_csv(p, value_col="y", split_index=2)
+                self.assertEqual((list(pre), list(post)), ([1.0], [3.0, 4.0]))
+                self.assertEqual((meta["skipped_pre"], meta["skipped_post"]), (1, 0))
+                pre, post, _ = read_series_csv(p, value_col="y", time_col="t", split_t="2003")
+                self.assertEqual((list(pre), list(post)), ([1.0], [3.0, 4.0]))
+                pre, post, meta = read_series_csv(p, value_col="y")
+                self.assertEqual((list(pre), list(post), meta["split_index"]), ([1.0], [3.0, 4.0], 2))
+                pre, post, meta = read_series_csv(p, pre_col="a", post_col="b")
+                self.assertEqual((list(pre), list(post)), ([1.0, 2.0, 3.0], [10.0, 30.0, 40.0]))
+                self.assertEqual(meta["rows_read"], 4)
+                with self.assertRaises(KeyError):
+                    read_series_csv(p, value_col="missing", split_index=1)
+
+    class TestScan(unittest.TestCase):
+        def test_stream_matches_text_parse(self):
+            import tempfile
+            md = ("# A tests structure\r\n- a1\n- a2\x0c- a3\n```py\n- code\n```\n"
+                  "- x\n\n# Divers\n- u1\n- u2\n## B métrologie\n~~~\n- c\n~~~\n- b1\n")
+            items, unassigned, detected, meta = parse_test_matrix(md)
+            with tempfile.TemporaryDirectory() as tmp:
+                p = os.path.join(tmp, "m.md")
+                with open(p, "w", encoding="utf-8", newline="") as f:
+                    f.write(md)
+                sc = scan_test_matrix(p)
+            self.assertEqual(sc.counts, {k: len(v) for k, v in items.items()})
+            self.assertEqual(sc.unassigned_preview, unassigned)
+            self.assertEqual(sc.unassigned_count, len(unassigned))
+            self.assertEqual((sc.detected, _parsing_meta(sc)), (detected, meta))
+            self.assertEqual(sc.counts["A_structure"], 4)
+
+        def test_preview_bounded(self):
+            lines = ["# Hors section"] + [f"- u{i}" for i in range(1000)]
+            sc = _scanner().scan(lines)
+            self.assertEqual(sc.unassigned_count, 1000)
+            self.assertEqual(sc.unassigned_preview, [f"- u{i}" for i in range(20)])
+
+    suite = unittest.TestSuite()
+    for case in (TestCore, TestStructN, TestSeries, TestScan):
+        suite.addTests(unittest.defaultTestLoader.loadTestsFromTestCase(case))
     runner = unittest.TextTestRunner(verbosity=2)
     res = runner.run(suite)
     return 0 if res.wasSuccessful() else 1
@@ -338,6 +554,90 @@ def _run_tests() -> int:
 # Main
 # -------------------------
 
+def run_series(args: argparse.Namespace, thr: Thresholds) -> int:
+    """Mode séries numériques : mêmes invariants, DD-R et E sur deux fenêtres d'un CSV."""
+    try:
+        pre, post, meta = read_series_csv(
+            args.series_csv,
+            value_col=args.value_col, pre_col=args.pre_col, post_col=args.post_col,
+            split_index=args.split_index, time_col=args.time_col, split_t=args.split_t,
+            delimiter=args.delimiter,
+        )
+    except FileNotFoundError:
+        print(f"ERROR: fichier introuvable: {args.series_csv}", file=sys.stderr)
+        return 3
+    except KeyError as e:
+        print(f"ERROR: colonne absente de l'en-tête CSV: {e.args[0]}", file=sys.stderr)
+        return 2
+
+    if args.value_col:
+        if args.split_t is not None:
+            split = {"time_col": args.time_col, "split_t": args.split_t}
+        elif args.split_index is not None:
+            split = {"split_index": args.split_index}
+        else:
+            split = {"split_index": meta["split_index"], "rule": "midpoint"}
+        windows = {"pre": f"{args.value_col} (avant coupure)", "post": f"{args.value_col} (après coupure)"}
+    else:
+        split = None
+        windows = {"pre": args.pre_col, "post": args.post_col}
+    nA, nB = len(pre), len(post)
+
+    # Une fenêtre à la fois : le tri de pre est libéré avant celui de post.
+    inv_pre = compute_invariants_values(pre, thr)
+    del pre
+    inv_post = compute_invariants_values(post, thr)
+    del post
+    ddr = ddr_compare(inv_pre, inv_post, thr)
+
+    os.makedirs(args.out, exist_ok=True)
+    extraction_report = {
+        "version": "0.3.1-final",
+        "mode": "series",
+        "input": args.series_csv,
+        "columns": {"value": args.value_col, "pre": args.pre_col, "post": args.post_col},
+        "split": split,
+        "rows_read": meta["rows_read"],
+        "counts": {"pre": nA, "post": nB},
+        "skipped_values": {"pre": meta["skipped_pre"], "post": meta["skipped_post"]},
+        "note": "Valeurs vides, non numériques ou non finies ignorées.",
+    }
+    with open(os.path.join(args.out, "extraction_report.json"), "w", encoding="utf-8") as f:
+        json.dump(extraction_report, f, ensure_ascii=False, indent=2)
+
+    compat = "KO" if ddr["invariants_ko"] else ("INCONCLUSIF" if ddr["invariants_nc"] else "OK")
+    neutralized = ["variance","std","entropy"] if (nA < thr.min_n_for_moments or nB < thr.min_n_for_moments) else []
+    ddr_report = {
+        "version": "0.3.1-final",
+        "mode": "series",
+        "thresholds": thr.__dict__,
+        "neutralized_by_min_n_for_moments": neutralized,
+        "pre": {"window": windows["pre"], "n": nA, "invariants": inv_pre},
+        "post": {"window": windows["post"], "n": nB, "invariants": inv_post},
+        "diffs_rel": ddr["diffs"],
+        "invariants_ok": ddr["invariants_ok"],
+        "invariants_ko": ddr["invariants_ko"],
+        "invariants_non_calculable": ddr["invariants_nc"],
+        "DDR": ddr["DDR"],
+        "status": {"execution": "OK", "compatibilite": compat},
+        "summary": _summary_human(ddr, thr),
+        "limits": [
+            "Fenêtres définies par la coupure fournie ; aucune interprétation causale.",
+            "O-06 (moments) : variance/std/entropie neutralisés si n<min_n_for_moments.",
+        ],
+    }
+    with open(os.path.join(args.out, "ddr_report.json"), "w", encoding="utf-8") as f:
+        json.dump(ddr_report, f, ensure_ascii=False, indent=2)
+
+    if args.with_e:
+        e_rep = e_compatibility(inv_pre, inv_post, thr)
+        with open(os.path.join(args.out, "e_report.json"), "w", encoding="utf-8") as f:
+            json.dump(e_rep, f, ensure_ascii=False, indent=2)
+
+    if args.verbose:
+        print(ddr_report["summary"])
+    return 0
+
 def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--test-matrix", required=False, help="Path to TEST_MATRIX.md")
@@ -351,14 +651,20 @@ def main(argv: Optional[List[str]] = None) -> int:
     ap.add_argument("--strict-parsing", action="store_true", help="Fail immediately if any unassigned list item exists (exit code 2)")
     ap.add_argument("--max-unassigned-ratio", type=float, default=0.10, help="Fail if unassigned_ratio > X (exit code 2)")
     ap.add_argument("--run-tests", action="store_true", help="Run internal unit tests and exit")
+    g = ap.add_argument_group("numeric series mode (CSV instead of TEST_MATRIX.md)")
+    g.add_argument("--series-csv", help="CSV with numeric pre/post series")
+    g.add_argument("--value-col", help="Value column, split into pre/post by --split-index or --time-col/--split-t")
+    g.add_argument("--split-index", type=int, help="Rows [0, K) are pre, the rest post (default: half of the rows)")
+    g.add_argument("--time-col", help="Time column compared with --split-t")
+    g.add_argument("--split-t", help="Rows with time < T are pre (numeric comparison when possible)")
+    g.add_argument("--pre-col", help="Pre series column (with --post-col; every row feeds both)")
+    g.add_argument("--post-col", help="Post series column")
+    g.add_argument("--delimiter", default=",", help="CSV delimiter (default ',')")
     args = ap.parse_args(argv)
 
     if args.run_tests:
         return _run_tests()
 
-    if not args.test_matrix:
-        ap.error("--test-matrix is required unless --run-tests is used")
-
     thr = Thresholds(
         eps=args.eps,
         min_n_for_moments=args.min_n_moments,
@@ -366,19 +672,34 @@ def main(argv: Optional[List[str]] = None) -> int:
         min_n_for_MAD=args.min_n_mad,
     )
 
+    if args.series_csv:
+        if args.test_matrix:
+            ap.error("--series-csv and --test-matrix are mutually exclusive")
+        if bool(args.pre_col) != bool(args.post_col):
+            ap.error("--pre-col and --post-col go together")
+        if bool(args.value_col) == bool(args.pre_col):
+            ap.error("--series-csv needs either --value-col or --pre-col/--post-col")
+        if args.value_col and args.split_index is not None and args.split_t is not None:
+            ap.error("--split-index and --split-t are mutually exclusive")
+        if (args.split_t is None) != (args.time_col is None):
+            ap.error("--split-t and --time-col go together")
+        return run_series(args, thr)
+
+    if not args.test_matrix:
+        ap.error("--test-matrix is required unless --run-tests or --series-csv is used")
+
     try:
-        with open(args.test_matrix, "r", encoding="utf-8", errors="ignore") as f:
-            md = f.read()
+        sc = scan_test_matrix(args.test_matrix)
     except FileNotFoundError:
         print(f"ERROR: fichier introuvable: {args.test_matrix}", file=sys.stderr)
         return 3
 
-    items, unassigned, detected, meta = parse_test_matrix(md)
-
-    counts = {k: len(items[k]) for k in items}
+    detected, meta = sc.detected, _parsing_meta(sc)
+    n_unassigned = sc.unassigned_count
+    counts = dict(sc.counts)
     total_items = sum(counts.values())
-    total_list_items = total_items + len(unassigned)
-    unassigned_ratio = (len(unassigned) / total_list_items) if total_list_items > 0 else 0.0
+    total_list_items = total_items + n_unassigned
+    unassigned_ratio = (n_unassigned / total_list_items) if total_list_items > 0 else 0.0
 
     warnings: List[str] = []
     if "A_structure" not in detected:
@@ -387,8 +708,8 @@ def main(argv: Optional[List[str]] = None) -> int:
         warnings.append("Section B_metrologie non détectée (pattern heading).")
     # Parsing rules (v0.3.1-final)
     # strict-parsing: stop immediately if any unassigned list item exists.
-    if args.strict_parsing and len(unassigned) > 0:
-        print(f"ERROR: strict-parsing: {len(unassigned)} item(s) de liste hors section valide.", file=sys.stderr)
+    if args.strict_parsing and n_unassigned > 0:
+        print(f"ERROR: strict-parsing: {n_unassigned} item(s) de liste hors section valide.", file=sys.stderr)
         return 2
 
     # max-unassigned-ratio: stop if ratio exceeded (independent of strict-parsing).
@@ -396,13 +717,13 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"ERROR: unassigned_ratio={unassigned_ratio:.3f} > {args.max_unassigned_ratio:.3f}", file=sys.stderr)
         return 2
 
-    nA = len(items["A_structure"])
-    nB = len(items["B_metrologie"])
+    nA = counts["A_structure"]
+    nB = counts["B_metrologie"]
     pre_ids = list(range(1, nA + 1))
     post_ids = list(range(1, nB + 1))
 
-    inv_pre = compute_invariants(pre_ids, thr)
-    inv_post = compute_invariants(post_ids, thr)
+    inv_pre = compute_invariants_struct_n(nA, thr)
+    inv_post = compute_invariants_struct_n(nB, thr)
     ddr = ddr_compare(inv_pre, inv_post, thr)
 
     os.makedirs(args.out, exist_ok=True)
@@ -413,9 +734,9 @@ def main(argv: Optional[List[str]] = None) -> int:
         "counts": counts,
         "assigned_items_count": total_items,
         "total_list_items_count": total_list_items,
-        "unassigned_items_count": len(unassigned),
+        "unassigned_items_count": n_unassigned,
         "unassigned_items_ratio": unassigned_ratio,
-        "unassigned_items_preview": unassigned[:20],
+        "unassigned_items_preview": sc.unassigned_preview,
         "warnings": warnings,
         "parsing_meta": meta,
         "note": "Les séries proxy sont IDs 1..n (n = nombre d'items listés dans la section).",
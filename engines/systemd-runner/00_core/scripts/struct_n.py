@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+System D — noyau STRUCT_N : invariants de la série proxy 1..n en O(1).
+
+Partagé par run_ddr.py et 01_tests_multisector/harness.py. Formes closes,
+égales bit à bit au calcul sur la liste 1..n (statistics.mean, médiane,
+MAD, quantiles linéaires, statistics.variance/stdev ; cf. TestStructN dans
+run_ddr.py) :
+  - mean = median = (n+1)/2 ;
+  - MAD : écarts triés |i - (n+1)/2| = 0,1,1,2,2,... (n impair) ou
+    0.5,0.5,1.5,1.5,... (n pair), dont on prend la médiane par indice ;
+  - pX : interpolation entre lo+1 et lo+2 (écart 1) ;
+  - variance = n(n+1)/12 (ddof=1), std = sa racine.
+
+Les seuils sont lus par attribut (min_n_for_MAD, min_n_for_quantiles,
+min_n_for_moments) : les dataclasses Thresholds des deux appelants
+conviennent telles quelles.
+
+Aucune dépendance externe.
+"""
+
+import math
+import sys
+from fractions import Fraction
+from typing import Any, Dict, Optional
+
+# statistics.stdev arrondit correctement la racine de la variance exacte
+# depuis 3.11 ; avant, il prend math.sqrt de la variance arrondie.
+_STDEV_EXACT_ROOT = sys.version_info >= (3, 11)
+
+
+def sqrt_frac(num: int, den: int) -> float:
+    """Racine de num/den (> 0), arrondie comme statistics.stdev sur cette version."""
+    y = math.sqrt(num / den)
+    if not _STDEV_EXACT_ROOT:
+        return y
+    # Arrondi au plus proche de la racine exacte : on compare num/den au
+    # carré du milieu entre y et son voisin (arithmétique exacte).
+    x = Fraction(num, den)
+    while True:
+        up = math.nextafter(y, math.inf)
+        if x > ((Fraction(y) + Fraction(up)) / 2) ** 2:
+            y = up
+            continue
+        down = math.nextafter(y, 0.0)
+        if x < ((Fraction(y) + Fraction(down)) / 2) ** 2:
+            y = down
+            continue
+        return y
+
+
+def invariants(n: int, thr: Any) -> Dict[str, Optional[float]]:
+    """Invariants de 1..n : mean, median, MAD, p90, p99, variance, std, entropy."""
+    inv: Dict[str, Optional[float]] = {
+        "mean": None, "median": None, "MAD": None, "p90": None, "p99": None,
+        "variance": None, "std": None, "entropy": None,
+    }
+    if n < 1:
+        return inv
+    inv["mean"] = (n + 1) / 2
+    inv["median"] = (n + 1) / 2
+    if n >= thr.min_n_for_MAD:
+        if n % 2 == 1:
+            inv["MAD"] = float(((n - 1) // 2 + 1) // 2)
+        else:
+            h = n // 2
+            inv["MAD"] = (((h - 1) // 2 + 0.5) + (h // 2 + 0.5)) / 2.0
+    if n >= thr.min_n_for_quantiles:
+        for key, q in (("p90", 0.90), ("p99", 0.99)):
+            pos = (n - 1) * q
+            lo = int(math.floor(pos))
+            hi = int(math.ceil(pos))
+            inv[key] = float(lo + 1) if lo == hi else float((lo + 1) + (pos - lo))
+    if n >= thr.min_n_for_moments and n >= 2:
+        inv["variance"] = n * (n + 1) / 12
+        inv["std"] = sqrt_frac(n * (n + 1), 12)
+    return inv
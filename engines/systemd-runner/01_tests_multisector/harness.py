@@ -5,13 +5,31 @@
 # - Outputs: schema short {ok,ko,nc,ddr,e,div_rel,meta} + extraction + hash
 from __future__ import annotations
 
-import argparse, csv, hashlib, json, math, os, re, statistics, unicodedata
+import argparse, csv, hashlib, json, math, os, re, statistics, sys, time, unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+# Shared streaming Markdown scanner and STRUCT_N kernel (00_core/scripts/).
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "00_core" / "scripts"))
+import md_sections  # noqa: E402
+import struct_n  # noqa: E402
+from md_sections import SectionScanner, iter_lines  # noqa: E402
+
+# Reported in meta.kernel (and so in the golden snapshots).
+KERNEL_ID = "STRUCT_N_v0.1"
+CACHE_DIRNAME = ".harness_cache"
+# Code behind a report: the harness (adapters) and the shared kernel/scanner.
+# Their sha256 is part of every cache key, so any edit invalidates the cache.
+CODE_FILES = (
+    Path(__file__).resolve(),
+    Path(md_sections.__file__).resolve(),
+    Path(struct_n.__file__).resolve(),
+)
+
 # ---------------------------
 # Path resolution
 # ---------------------------
@@ -91,6 +109,15 @@ def compute_invariants(ids: List[int], th: Thresholds) -> Dict[str, Optional[flo
     }
     return out
 
+def compute_invariants_struct_n(n: int, th: Thresholds) -> Dict[str, Optional[float]]:
+    """Same result as compute_invariants(list(range(1, n+1)), th), in O(1).
+
+    Closed forms shared with 00_core/scripts/run_ddr.py (00_core/scripts/struct_n.py,
+    property-tested there by TestStructN).
+    """
+    inv = struct_n.invariants(n, th)
+    return {k: inv[k] for k in ("mean", "median", "MAD", "p90", "p99")}
+
 def classify_ddr(ok: List[str], ko: List[str], nc: List[str]) -> str:
     if nc:
         return "INCONCLUSIF"
@@ -103,10 +130,8 @@ def classify_ddr(ok: List[str], ko: List[str], nc: List[str]) -> str:
     return "INCONCLUSIF"
 
 def compute_ddr_short(pre_n: int, post_n: int, th: Thresholds) -> Dict[str, Any]:
-    pre_ids = list(range(1, pre_n + 1))
-    post_ids = list(range(1, post_n + 1))
-    pre_inv = compute_invariants(pre_ids, th)
-    post_inv = compute_invariants(post_ids, th)
+    pre_inv = compute_invariants_struct_n(pre_n, th)
+    post_inv = compute_invariants_struct_n(post_n, th)
 
     diffs: Dict[str, Optional[float]] = {}
     ok: List[str] = []
@@ -144,8 +169,6 @@ def sha256_hex(obj: Any) -> str:
 def normalize_unicode(text: str) -> str:
     return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("utf-8")
 
-LIST_ITEM_RX = re.compile(r"^\s{0,3}(-|\*|\d+\.)\s+")
-HEADING_RX = re.compile(r"^\s{0,3}#{1,6}\s+")
 FENCED_START = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
 
 DOCS_TARGETS = {
@@ -157,48 +180,19 @@ DOCS_TARGETS = {
 
 SECTION_KEYS = ["rules_globales", "conventions_sorties", "A_structure", "B_metrologie"]
 
+def _docs_scanner(break_on_blank: bool, preview: Optional[int]) -> SectionScanner:
+    # Fence closes only on a line that is exactly the opening fence (after strip).
+    return SectionScanner(SECTION_KEYS, DOCS_TARGETS, normalize_unicode, FENCED_START,
+                          exact_fence_close=True, break_on_blank=break_on_blank, preview=preview)
+
 def adapter_docs(md_text: str, break_on_blank: bool = True) -> Tuple[Dict[str,int], List[str]]:
-    items = {k: 0 for k in SECTION_KEYS}
-    unassigned: List[str] = []
-    current: Optional[str] = None
-    in_fence = False
-    fence = None
-
-    for raw in md_text.splitlines():
-        line = raw.rstrip("\n")
-        if break_on_blank and (not in_fence) and line.strip() == "":
-            current = None
-            continue
-
-        if in_fence:
-            if fence and re.match(r"^\s{0,3}"+re.escape(fence)+r"$", line.strip()):
-                in_fence = False
-                fence = None
-            continue
-
-        m = FENCED_START.match(line)
-        if m:
-            in_fence = True
-            fence = m.group(1)
-            continue
-
-        if HEADING_RX.match(line):
-            title = HEADING_RX.sub("", line).strip()
-            ntitle = normalize_unicode(title)
-            current = None
-            for k, rx in DOCS_TARGETS.items():
-                if rx.search(ntitle):
-                    current = k
-                    break
-            continue
-
-        if LIST_ITEM_RX.match(line):
-            if current in items:
-                items[current] += 1
-            else:
-                unassigned.append(line.strip())
+    sc = _docs_scanner(break_on_blank, preview=None).scan(md_text.splitlines())
+    return sc.counts, sc.unassigned_preview
 
-    return items, unassigned
+def adapter_docs_file(md_path: Path, break_on_blank: bool = True) -> Tuple[Dict[str,int], int]:
+    """Streaming variant: (counts, unassigned count), constant memory."""
+    sc = _docs_scanner(break_on_blank, preview=0).scan(iter_lines(str(md_path)))
+    return sc.counts, sc.unassigned_count
 
 def adapter_tickets_csv(csv_path: Path, group_col: str) -> Dict[str,int]:
     counts: Dict[str,int] = {}
@@ -228,7 +222,8 @@ def adapter_generic_json(json_path: Path) -> Dict[str,int]:
 # Harness execution
 # ---------------------------
 
-def run_case(profile: Dict[str,Any], repo_root: Path, update_expected: bool) -> Dict[str,Any]:
+def compute_report(profile: Dict[str,Any], repo_root: Path) -> Dict[str,Any]:
+    """Report for one profile (no snapshot comparison): extraction + kernel + hash."""
     mode = profile["mode"]
     if mode != "STRUCT_N":
         raise ValueError(f"Unsupported mode in this harness: {mode}")
@@ -250,9 +245,7 @@ def run_case(profile: Dict[str,Any], repo_root: Path, update_expected: bool) ->
     unassigned_count = 0
     items_count: Dict[str,int] = {}
     if adapter_id == "docs":
-        md = fixture_path.read_text(encoding="utf-8", errors="ignore")
-        items_count, unassigned = adapter_docs(md, break_on_blank=True)
-        unassigned_count = len(unassigned)
+        items_count, unassigned_count = adapter_docs_file(fixture_path, break_on_blank=True)
     elif adapter_id == "tickets":
         group_col = profile.get("group_col", "Status")
         items_count = adapter_tickets_csv(fixture_path, group_col=group_col)
@@ -284,7 +277,7 @@ def run_case(profile: Dict[str,Any], repo_root: Path, update_expected: bool) ->
             "mode": mode,
             "ingestion": ingestion,
             "adapter_id": adapter_id,
-            "kernel": "STRUCT_N_v0.1",
+            "kernel": KERNEL_ID,
             "eps": th.eps,
             "min_n_for_moments": th.min_n_for_moments,
             "min_n_for_quantiles": th.min_n_for_quantiles,
@@ -304,7 +297,10 @@ def run_case(profile: Dict[str,Any], repo_root: Path, update_expected: bool) ->
     }
 
     report["hash_sha256"] = sha256_hex(report)
+    return report
 
+def check_expected(report: Dict[str,Any], profile: Dict[str,Any], repo_root: Path, update_expected: bool) -> Dict[str,Any]:
+    """Compare `report` with its golden snapshot (or rewrite it); sets expected_status."""
     expected_rel = profile.get("expected")
     if expected_rel:
         expected_path = resolve_rel(repo_root, expected_rel)
@@ -326,21 +322,126 @@ def run_case(profile: Dict[str,Any], repo_root: Path, update_expected: bool) ->
 
     return report
 
+def run_case(profile: Dict[str,Any], repo_root: Path, update_expected: bool) -> Dict[str,Any]:
+    return check_expected(compute_report(profile, repo_root), profile, repo_root, update_expected)
+
+# ---------------------------
+# Result cache + parallel runs
+# ---------------------------
+
+def sha256_path(p: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(p.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+_code_sha: Optional[str] = None
+
+def code_sha256() -> str:
+    """sha256 over CODE_FILES (computed once per process)."""
+    global _code_sha
+    if _code_sha is None:
+        _code_sha = sha256_hex({p.name: sha256_path(p) for p in CODE_FILES})
+    return _code_sha
+
+def cache_key(profile: Dict[str,Any], repo_root: Path) -> Optional[str]:
+    """(profile content, fixture bytes, kernel id, code sha256) -> key; None if the fixture is unreadable."""
+    fixture_sha = sha256_path(resolve_rel(repo_root, profile["fixture"]))
+    if fixture_sha is None:
+        return None
+    return sha256_hex({"profile": profile, "fixture_sha256": fixture_sha, "kernel": KERNEL_ID,
+                       "code_sha256": code_sha256()})
+
+def cache_load(cache_dir: Path, profile_id: str, key: str) -> Optional[Dict[str,Any]]:
+    try:
+        entry = json.loads((cache_dir / f"{profile_id}.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return entry.get("report") if isinstance(entry, dict) and entry.get("key") == key else None
+
+def cache_store(cache_dir: Path, profile_id: str, key: str, report: Dict[str,Any]) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{profile_id}.json"
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"key": key, "report": report}, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+def _timed_report(profile: Dict[str,Any], repo_root: Path) -> Tuple[Dict[str,Any], float]:
+    t0 = time.perf_counter()
+    report = compute_report(profile, repo_root)
+    return report, time.perf_counter() - t0
+
+def run_profiles(
+    profiles: List[Dict[str,Any]],
+    repo_root: Path,
+    update_expected: bool,
+    cache_dir: Optional[Path],
+    workers: Optional[int] = None,
+) -> Tuple[List[Dict[str,Any]], List[Tuple[str,str,float]]]:
+    """Reports in profile order, plus (profile_id, "cached"|"run", seconds) per profile.
+
+    Profiles whose cache key matches their cache entry are not recomputed; the
+    others run on `workers` processes (default: CPU count; 1 = in-process).
+    Snapshot comparison always runs, against the (cached or fresh) report.
+    """
+    reports: List[Optional[Dict[str,Any]]] = [None] * len(profiles)
+    timings: List[Tuple[str,str,float]] = [("", "", 0.0)] * len(profiles)
+    keys: List[Optional[str]] = [None] * len(profiles)
+    todo: List[int] = []
+    for i, profile in enumerate(profiles):
+        if cache_dir is not None:
+            t0 = time.perf_counter()
+            keys[i] = cache_key(profile, repo_root)
+            cached = cache_load(cache_dir, profile["id"], keys[i]) if keys[i] else None
+            if cached is not None:
+                reports[i] = cached
+                timings[i] = (profile["id"], "cached", time.perf_counter() - t0)
+                continue
+        todo.append(i)
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1 or len(todo) < 2:
+        done = [_timed_report(profiles[i], repo_root) for i in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            done = list(pool.map(_timed_report, [profiles[i] for i in todo], [repo_root] * len(todo),
+                                 chunksize=max(1, len(todo) // (workers * 4))))
+    for i, (report, dt) in zip(todo, done):
+        reports[i] = report
+        timings[i] = (profiles[i]["id"], "run", dt)
+        if cache_dir is not None and keys[i]:
+            cache_store(cache_dir, profiles[i]["id"], keys[i], report)
+
+    results = [check_expected(dict(r), p, repo_root, update_expected) for r, p in zip(reports, profiles)]
+    return results, timings
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--repo-root", default=".", help="Repo root containing tests/")
     ap.add_argument("--profiles", default="01_tests_multisector/tests/profiles", help="Directory with profile YAMLs")
     ap.add_argument("--update-expected", action="store_true", help="Write expected snapshots")
     ap.add_argument("--out", default="01_tests_multisector/tests/results.json", help="Aggregated results JSON")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 = in-process)")
+    ap.add_argument("--cache-dir", default=None, help=f"Report cache (default: <profiles>/../{CACHE_DIRNAME})")
+    ap.add_argument("--no-cache", action="store_true", help="Recompute every profile, leave the cache untouched")
     args = ap.parse_args()
 
     repo_root = Path(args.repo_root).resolve()
     profiles_dir = resolve_rel(repo_root, args.profiles).resolve()
+    if args.no_cache:
+        cache_dir = None
+    else:
+        cache_dir = Path(args.cache_dir).resolve() if args.cache_dir else profiles_dir.parent / CACHE_DIRNAME
+
+    t0 = time.perf_counter()
+    profiles = [yaml.safe_load(p.read_text(encoding="utf-8")) for p in sorted(profiles_dir.glob("*.yaml"))]
+    results, timings = run_profiles(profiles, repo_root, args.update_expected, cache_dir, args.workers)
 
-    results: List[Dict[str,Any]] = []
-    for p in sorted(profiles_dir.glob("*.yaml")):
-        profile = yaml.safe_load(p.read_text(encoding="utf-8"))
-        results.append(run_case(profile, repo_root, update_expected=args.update_expected))
+    # timings on stderr: stdout stays the JSON summary
+    for pid, how, dt in timings:
+        print(f"{pid:<40} {how:<6} {dt * 1000.0:9.2f} ms", file=sys.stderr)
+    n_cached = sum(1 for _, how, _ in timings if how == "cached")
+    print(f"{len(timings)} profiles ({n_cached} cached) in {time.perf_counter() - t0:.3f} s", file=sys.stderr)
 
     out_path = resolve_rel(repo_root, args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
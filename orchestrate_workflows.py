@@ -2,12 +2,17 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import calendar
 import json
+import os
+import shlex
+import statistics
 import subprocess
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
 
@@ -21,8 +26,8 @@ def run_capture(cmd: List[str]) -> Tuple[int, str]:
     return p.returncode, p.stdout or ""
 
 
-def ensure_gh() -> None:
-    rc, out = run_capture(["gh", "--version"])
+def ensure_gh(gh: List[str]) -> None:
+    rc, out = run_capture([*gh, "--version"])
     if rc != 0:
         raise SystemExit("gh introuvable sur le runner.\n" + out)
 
@@ -79,80 +84,386 @@ def selector(wf: WorkflowTarget) -> Optional[str]:
     return wf.file or wf.name
 
 
-def gh_workflow_list(owner: str, repo: str) -> Tuple[int, str]:
-    cmd = ["gh", "workflow", "list", "-R", f"{owner}/{repo}"]
-    return run_capture(cmd)
+class Gh:
+    """Appels `gh` asynchrones, au plus `max_concurrent` sous-processus à la fois."""
 
+    def __init__(self, argv: List[str], max_concurrent: int = 4):
+        self.argv = argv
+        self.calls = 0
+        self._sem = asyncio.Semaphore(max(1, max_concurrent))
 
-def gh_workflow_run(owner: str, repo: str, wf: WorkflowTarget) -> Tuple[bool, str]:
+    async def capture(self, args: List[str]) -> Tuple[int, str]:
+        async with self._sem:
+            self.calls += 1
+            proc = await asyncio.create_subprocess_exec(
+                *self.argv, *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+            )
+            out, _ = await proc.communicate()
+        return proc.returncode, out.decode("utf-8", errors="replace")
+
+
+# Champs de `gh run list` / `gh run view` utilisés pour le suivi.
+RUN_FIELDS = "databaseId,workflowDatabaseId,workflowName,event,status,conclusion,createdAt,updatedAt,url"
+# Recherche du run créé par un dispatch : intervalle de polling et attente max.
+FIND_POLL_S = 3.0
+FIND_TIMEOUT_S = 180.0
+# Tolérance d'horloge runner / GitHub pour comparer createdAt à l'heure du dispatch.
+CLOCK_SKEW_S = 5.0
+# Durées de runs terminés gardées par workflow pour estimer la durée typique.
+DURATION_HISTORY = 20
+
+
+def parse_ts(s: Optional[str]) -> Optional[float]:
+    try:
+        return float(calendar.timegm(time.strptime(s or "", "%Y-%m-%dT%H:%M:%SZ")))
+    except ValueError:
+        return None
+
+
+def parse_json_list(out: str) -> List[Dict[str, Any]]:
+    try:
+        data = json.loads(out or "[]")
+    except Exception:
+        return []
+    return data if isinstance(data, list) else []
+
+
+def workflow_id_for(wf: WorkflowTarget, workflows: List[Dict[str, Any]]) -> Optional[int]:
+    """workflowDatabaseId du sélecteur (id, puis file, puis name), d'après `gh workflow list --json`."""
+    if wf.id is not None:
+        return wf.id
+    if wf.file:
+        fname = Path(wf.file).name
+        for w in workflows:
+            if Path(str(w.get("path") or "")).name == fname:
+                return int(w["id"])
+    if wf.name:
+        for w in workflows:
+            if w.get("name") == wf.name:
+                return int(w["id"])
+    return None
+
+
+def next_poll_delay(elapsed: float, typical: Optional[float], min_s: float, max_s: float) -> float:
+    """Délai avant le prochain poll d'un run en cours depuis `elapsed` secondes.
+
+    Sans historique : backoff proportionnel à l'âge du run. Avec une durée
+    typique : on se rapproche de la fin attendue par moitiés, puis on
+    espace les polls une fois la durée typique dépassée.
+    """
+    if typical is None:
+        d = elapsed / 4
+    elif elapsed < typical:
+        d = (typical - elapsed) / 2
+    else:
+        d = (elapsed - typical) / 4
+    return min(max_s, max(min_s, d))
+
+
+@dataclass
+class _Dispatch:
+    sel: str
+    wf_id: Optional[int]
+    t0: float
+    deadline: float
+    due: float
+    fut: asyncio.Future
+
+
+@dataclass
+class _Tracked:
+    wf_id: Optional[int]
+    deadline: float
+    due: float
+    fut: asyncio.Future
+    created: float
+
+
+async def gh_workflow_list(gh: Gh, owner: str, repo: str) -> Tuple[int, str]:
+    return await gh.capture(["workflow", "list", "-R", f"{owner}/{repo}", "--json", "id,name,path,state"])
+
+
+async def gh_workflow_run(gh: Gh, owner: str, repo: str, wf: WorkflowTarget) -> Tuple[bool, str]:
     sel = selector(wf)
     if not sel:
         return False, "workflow_selector_missing"
-    cmd = ["gh", "workflow", "run", sel, "-R", f"{owner}/{repo}"]
-    rc, out = run_capture(cmd)
+    rc, out = await gh.capture(["workflow", "run", sel, "-R", f"{owner}/{repo}"])
     return rc == 0, out.strip()
 
 
-def gh_find_latest_run_id(owner: str, repo: str, wf: WorkflowTarget, timeout_s: int = 120) -> Optional[int]:
-    sel = selector(wf)
-    if not sel:
-        return None
+class RunTracker:
+    """Boucle de polling partagée, un seul `gh run list` par repo et par tick.
+
+    - find() rend l'id du run créé par un dispatch : le plus ancien run
+      workflow_dispatch du même workflow, créé après le dispatch et pas
+      encore attribué (et non data[0], qui peut être un run concurrent).
+    - wait() rend la vue finale d'un run (status=completed, ou
+      error=timeout après timeout_s).
+    Chaque run a sa prochaine échéance (next_poll_delay, d'après les durées
+    des runs terminés du même workflow vues dans les listes) ; un repo est
+    interrogé dès qu'un de ses runs ou dispatches est dû, et ce poll sert
+    à tous. Les runs absents de la liste (trop anciens) passent par `gh run view`.
+    """
+
+    def __init__(self, gh: Gh, owner: str, min_poll_s: float = 10, max_poll_s: float = 120,
+                 timeout_s: float = 5400):
+        self.gh = gh
+        self.owner = owner
+        self.min_poll_s = min_poll_s
+        self.max_poll_s = max_poll_s
+        self.timeout_s = timeout_s
+        self.workflows: Dict[str, List[Dict[str, Any]]] = {}
+        self._dispatches: Dict[str, List[_Dispatch]] = {}
+        self._runs: Dict[str, Dict[int, _Tracked]] = {}
+        self._claimed: Set[Tuple[str, int]] = set()
+        self._seen: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._durations: Dict[Tuple[str, int], Dict[int, float]] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _start(self) -> None:
+        self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def find(self, repo: str, wf: WorkflowTarget, t0: float) -> Optional[int]:
+        now = time.time()
+        fut = asyncio.get_running_loop().create_future()
+        d = _Dispatch(sel=selector(wf) or "", wf_id=workflow_id_for(wf, self.workflows.get(repo, [])),
+                      t0=t0, deadline=now + FIND_TIMEOUT_S, due=now + FIND_POLL_S, fut=fut)
+        self._dispatches.setdefault(repo, []).append(d)
+        self._start()
+        return await fut
+
+    async def wait(self, repo: str, run_id: int) -> Dict[str, Any]:
+        now = time.time()
+        fut = asyncio.get_running_loop().create_future()
+        row = self._seen.get((repo, run_id), {})
+        created = parse_ts(row.get("createdAt")) or now
+        wf_id = row.get("workflowDatabaseId")
+        due = now + next_poll_delay(now - created, self.typical(repo, wf_id), self.min_poll_s, self.max_poll_s)
+        self._runs.setdefault(repo, {})[run_id] = _Tracked(
+            wf_id=wf_id, deadline=now + self.timeout_s, due=due, fut=fut, created=created)
+        self._start()
+        return await fut
+
+    def typical(self, repo: str, wf_id: Optional[int]) -> Optional[float]:
+        hist = self._durations.get((repo, wf_id)) if wf_id is not None else None
+        return statistics.median(hist.values()) if hist else None
+
+    def _due(self, repo: str) -> Optional[float]:
+        dues = [d.due for d in self._dispatches.get(repo, [])]
+        dues += [r.due for r in self._runs.get(repo, {}).values()]
+        return min(dues) if dues else None
+
+    async def _list(self, repo: str, extra: List[str], limit: int) -> List[Dict[str, Any]]:
+        rc, out = await self.gh.capture(
+            ["run", "list", "-R", f"{self.owner}/{repo}", "--limit", str(limit), "--json", RUN_FIELDS, *extra])
+        return parse_json_list(out) if rc == 0 else []
+
+    async def _view(self, repo: str, run_id: int) -> Dict[str, Any]:
+        rc, out = await self.gh.capture(["run", "view", str(run_id), "-R", f"{self.owner}/{repo}", "--json", RUN_FIELDS])
+        if rc != 0:
+            return {"error": "gh_run_view_failed", "output": out.strip()}
+        try:
+            return json.loads(out)
+        except Exception:
+            return {"error": "json_parse_failed", "output": out.strip()}
 
-    deadline = time.time() + timeout_s
-    while time.time() < deadline:
-        cmd = [
-            "gh", "run", "list",
-            "-R", f"{owner}/{repo}",
-            "--workflow", sel,
-            "--limit", "5",
-            "--json", "databaseId,createdAt,status,conclusion,displayTitle,htmlUrl",
-        ]
-        rc, out = run_capture(cmd)
-        if rc == 0:
+    def _learn(self, repo: str, rows: List[Dict[str, Any]]) -> None:
+        for r in rows:
+            if r.get("status") != "completed" or r.get("workflowDatabaseId") is None:
+                continue
+            start, end = parse_ts(r.get("createdAt")), parse_ts(r.get("updatedAt"))
+            if start is None or end is None:
+                continue
+            hist = self._durations.setdefault((repo, int(r["workflowDatabaseId"])), {})
+            hist[int(r["databaseId"])] = end - start
+            while len(hist) > DURATION_HISTORY:
+                del hist[next(iter(hist))]
+
+    def _match(self, repo: str, d: _Dispatch, rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        best = None
+        for r in rows:
+            if d.wf_id is not None and r.get("workflowDatabaseId") != d.wf_id:
+                continue
+            if r.get("event") not in (None, "", "workflow_dispatch"):
+                continue
+            created = parse_ts(r.get("createdAt"))
+            if created is None or created < d.t0 - CLOCK_SKEW_S:
+                continue
+            if (repo, int(r["databaseId"])) in self._claimed:
+                continue
+            key = (created, int(r["databaseId"]))
+            if best is None or key < best[0]:
+                best = (key, r)
+        return best[1] if best else None
+
+    async def _poll_repo(self, repo: str) -> None:
+        dispatches = self._dispatches.get(repo, [])
+        runs = self._runs.get(repo, {})
+        # Dispatches sans workflowDatabaseId (workflow list indisponible) : liste filtrée par sélecteur.
+        sels = sorted({d.sel for d in dispatches if d.wf_id is None})
+        limit = max(20, 2 * (len(dispatches) + len(runs)) + 10)
+        lists = await asyncio.gather(self._list(repo, [], limit),
+                                     *(self._list(repo, ["--workflow", s], 10) for s in sels))
+        rows, by_sel = lists[0], dict(zip(sels, lists[1:]))
+        self._learn(repo, rows)
+        now = time.time()
+
+        for d in list(dispatches):  # dans l'ordre des dispatches
+            r = self._match(repo, d, rows if d.wf_id is not None else by_sel[d.sel])
+            if r is not None:
+                rid = int(r["databaseId"])
+                self._claimed.add((repo, rid))
+                self._seen[(repo, rid)] = r
+                dispatches.remove(d)
+                d.fut.set_result(rid)
+            elif now >= d.deadline:
+                dispatches.remove(d)
+                d.fut.set_result(None)
+            else:
+                d.due = now + FIND_POLL_S
+
+        by_id = {int(r["databaseId"]): r for r in rows if r.get("databaseId") is not None}
+        missing = [rid for rid in runs if rid not in by_id]
+        for rid, view in zip(missing, await asyncio.gather(*(self._view(repo, rid) for rid in missing))):
+            by_id[rid] = view
+        now = time.time()
+        for rid, t in list(runs.items()):
+            view = dict(by_id[rid])
+            if view.get("status") == "completed":
+                del runs[rid]
+                t.fut.set_result(view)
+            elif now >= t.deadline:
+                del runs[rid]
+                view["error"] = "timeout"
+                t.fut.set_result(view)
+            else:
+                t.due = now + next_poll_delay(now - t.created, self.typical(repo, t.wf_id),
+                                              self.min_poll_s, self.max_poll_s)
+
+    async def _loop(self) -> None:
+        while True:
+            self._wake.clear()
+            dues = {repo: due for repo in set(self._dispatches) | set(self._runs)
+                    if (due := self._due(repo)) is not None}
+            if not dues:
+                return
+            now = time.time()
+            ready = [repo for repo, due in dues.items() if due <= now]
+            if ready:
+                await asyncio.gather(*(self._poll_repo(repo) for repo in sorted(ready)))
+                continue
             try:
-                data = json.loads(out or "[]")
-            except Exception:
-                data = []
-            if data:
-                return int(data[0]["databaseId"])
-        time.sleep(3)
-    return None
+                await asyncio.wait_for(self._wake.wait(), min(dues.values()) - now)
+            except asyncio.TimeoutError:
+                pass
 
 
-def gh_wait_run(owner: str, repo: str, run_id: int, poll_s: int = 10, timeout_s: int = 5400) -> Dict[str, Any]:
-    deadline = time.time() + timeout_s
-    last: Dict[str, Any] = {}
-    while time.time() < deadline:
-        cmd = [
-            "gh", "run", "view", str(run_id),
-            "-R", f"{owner}/{repo}",
-            "--json", "databaseId,status,conclusion,createdAt,updatedAt,htmlUrl",
-        ]
-        rc, out = run_capture(cmd)
-        if rc != 0:
-            last = {"error": "gh_run_view_failed", "output": out.strip()}
-            time.sleep(poll_s)
+async def gh_download_artifacts(gh: Gh, owner: str, repo: str, run_id: int, dest: Path) -> Tuple[bool, str]:
+    dest.mkdir(parents=True, exist_ok=True)
+    rc, out = await gh.capture(["run", "download", str(run_id), "-R", f"{owner}/{repo}", "-D", str(dest)])
+    return rc == 0, out.strip()
+
+
+async def finish_run(
+    gh: Gh, tracker: RunTracker, args: argparse.Namespace, out_dir: Path,
+    repo: str, wf: WorkflowTarget, label: str, t0: float, run_rec: Dict[str, Any],
+) -> bool:
+    """Retrouve le run d'un dispatch, attend sa fin, télécharge ses artefacts ; True si échec."""
+    run_id = await tracker.find(repo, wf, t0)
+    if run_id is None:
+        print(f"[{repo}] {label}: FAILED: run_id_not_found", flush=True)
+        run_rec["run"] = {"error": "run_id_not_found"}
+        run_rec["utc_end"] = now_utc()
+        return True
+
+    run_rec["run"]["id"] = run_id
+    print(f"[{repo}] {label}: waiting run_id={run_id} ...", flush=True)
+    view = await tracker.wait(repo, run_id)
+    run_rec["run"]["view"] = view
+    print(f"[{repo}] {label}: completed status={view.get('status')} conclusion={view.get('conclusion')}", flush=True)
+
+    concl = (view.get("conclusion") or "").lower()
+    failed = concl not in ("success", "")
+
+    if args.download_artifacts:
+        dest = out_dir / "artifacts" / repo / f"{label}_{run_id}"
+        dl_ok, dl_out = await gh_download_artifacts(gh, args.owner, repo, run_id, dest)
+        run_rec["run"]["download"] = {"ok": dl_ok, "dest": str(dest), "output": dl_out}
+        print(f"[{repo}] {label}: artifacts download ok={dl_ok}", flush=True)
+
+    run_rec["utc_end"] = now_utc()
+    return failed
+
+
+async def orchestrate_repo(
+    gh: Gh, tracker: RunTracker, args: argparse.Namespace, out_dir: Path, rt: RepoTarget,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Déclenche les workflows d'un repo dans l'ordre, sans attendre leur fin."""
+    recs: List[Dict[str, Any]] = []
+    finishing: List[asyncio.Task] = []
+    any_fail = False
+
+    for wf in rt.workflows:
+        sel = selector(wf) or "unknown"
+        label = wf.label or wf.name or wf.file or sel
+        print(f"=== TRIGGER {rt.repo} :: {label} (selector={sel}) ===", flush=True)
+
+        run_rec: Dict[str, Any] = {
+            "repo": rt.repo,
+            "workflow": label,
+            "selector": sel,
+            "utc_start": now_utc(),
+            "trigger": {},
+            "run": {},
+        }
+        recs.append(run_rec)
+
+        t0 = time.time()
+        ok, out = await gh_workflow_run(gh, args.owner, rt.repo, wf)
+        run_rec["trigger"] = {"ok": ok, "output": out}
+
+        if not ok:
+            any_fail = True
+            print(f"[{rt.repo}] {label}: FAILED trigger: {out}", flush=True)
+            run_rec["utc_end"] = now_utc()
+            if not args.keep_going:
+                break
             continue
 
-        try:
-            last = json.loads(out)
-        except Exception:
-            last = {"error": "json_parse_failed", "output": out.strip()}
+        finishing.append(asyncio.create_task(finish_run(gh, tracker, args, out_dir, rt.repo, wf, label, t0, run_rec)))
 
-        if last.get("status") == "completed":
-            return last
+    for failed in await asyncio.gather(*finishing):
+        any_fail = any_fail or failed
+    return recs, any_fail
 
-        time.sleep(poll_s)
 
-    last["error"] = "timeout"
-    return last
+async def orchestrate(args: argparse.Namespace, targets: List[RepoTarget], out_dir: Path, summary: Dict[str, Any]) -> bool:
+    gh = Gh(args.gh, args.max_gh)
+    tracker = RunTracker(gh, args.owner, min_poll_s=args.poll_s, max_poll_s=args.max_poll_s,
+                         timeout_s=args.run_timeout_s)
 
+    print("=== PRE-FLIGHT: gh workflow list ===", flush=True)
+    lists = await asyncio.gather(*(gh_workflow_list(gh, args.owner, rt.repo) for rt in targets))
+    for rt, (rc, out) in zip(targets, lists):
+        print(f"[{rt.repo}] rc={rc}", flush=True)
+        summary["preflight"].append({"repo": rt.repo, "rc": rc, "output": out.strip()})
+        # Sortie --json si l'appel a réussi, sinon le message d'erreur de gh.
+        write_text(out_dir / "preflight" / f"{rt.repo}_workflow_list.{'json' if rc == 0 else 'txt'}", out)
+        if rc == 0:
+            tracker.workflows[rt.repo] = parse_json_list(out)
 
-def gh_download_artifacts(owner: str, repo: str, run_id: int, dest: Path) -> Tuple[bool, str]:
-    dest.mkdir(parents=True, exist_ok=True)
-    cmd = ["gh", "run", "download", str(run_id), "-R", f"{owner}/{repo}", "-D", str(dest)]
-    rc, out = run_capture(cmd)
-    return rc == 0, out.strip()
+    # Tous les repos en parallèle : la durée totale suit le workflow le plus long.
+    results = await asyncio.gather(*(orchestrate_repo(gh, tracker, args, out_dir, rt) for rt in targets))
+
+    any_fail = False
+    for recs, failed in results:
+        summary["runs"].extend(recs)
+        any_fail = any_fail or failed
+    summary["gh_calls"] = gh.calls
+    return any_fail
 
 
 def main() -> int:
@@ -162,9 +473,16 @@ def main() -> int:
     ap.add_argument("--out", default="_orchestrate_out", help="Dossier de sortie")
     ap.add_argument("--keep-going", action="store_true", help="Continuer même si un workflow échoue")
     ap.add_argument("--download-artifacts", action="store_true", help="Télécharger les artefacts des runs")
+    ap.add_argument("--gh", default=os.environ.get("GH_BIN", "gh"),
+                    help="Commande gh (défaut: $GH_BIN ou gh ; ex: \"python3 scripts/fake_gh.py\")")
+    ap.add_argument("--max-gh", type=int, default=4, help="Nombre max de processus gh simultanés")
+    ap.add_argument("--poll-s", type=float, default=10, help="Intervalle min de polling des runs (secondes)")
+    ap.add_argument("--max-poll-s", type=float, default=120, help="Intervalle max de polling des runs (secondes)")
+    ap.add_argument("--run-timeout-s", type=float, default=5400, help="Attente max d'un run (secondes)")
     args = ap.parse_args()
+    args.gh = shlex.split(args.gh)
 
-    ensure_gh()
+    ensure_gh(args.gh)
 
     cfg_path = Path(args.config).resolve()
     out_dir = Path(args.out).resolve()
@@ -178,73 +496,11 @@ def main() -> int:
         "preflight": [],
     }
 
-    any_fail = False
-
-    print("=== PRE-FLIGHT: gh workflow list ===", flush=True)
-    for rt in targets:
-        rc, out = gh_workflow_list(args.owner, rt.repo)
-        print(f"[{rt.repo}] rc={rc}", flush=True)
-        summary["preflight"].append({"repo": rt.repo, "rc": rc, "output": out.strip()})
-        write_text(out_dir / "preflight" / f"{rt.repo}_workflow_list.txt", out)
-
-    for rt in targets:
-        for wf in rt.workflows:
-            sel = selector(wf) or "unknown"
-            label = wf.label or wf.name or wf.file or sel
-            print(f"=== TRIGGER {rt.repo} :: {label} (selector={sel}) ===", flush=True)
-
-            run_rec: Dict[str, Any] = {
-                "repo": rt.repo,
-                "workflow": label,
-                "selector": sel,
-                "utc_start": now_utc(),
-                "trigger": {},
-                "run": {},
-            }
-
-            ok, out = gh_workflow_run(args.owner, rt.repo, wf)
-            run_rec["trigger"] = {"ok": ok, "output": out}
-
-            if not ok:
-                any_fail = True
-                print(f"FAILED trigger: {out}", flush=True)
-                run_rec["utc_end"] = now_utc()
-                summary["runs"].append(run_rec)
-                if not args.keep_going:
-                    break
-                continue
-
-            run_id = gh_find_latest_run_id(args.owner, rt.repo, wf, timeout_s=180)
-            if run_id is None:
-                any_fail = True
-                print("FAILED: run_id_not_found", flush=True)
-                run_rec["run"] = {"error": "run_id_not_found"}
-                run_rec["utc_end"] = now_utc()
-                summary["runs"].append(run_rec)
-                if not args.keep_going:
-                    break
-                continue
-
-            run_rec["run"]["id"] = run_id
-            print(f"Waiting run_id={run_id} ...", flush=True)
-            view = gh_wait_run(args.owner, rt.repo, run_id, poll_s=10, timeout_s=5400)
-            run_rec["run"]["view"] = view
-            print(f"Completed: status={view.get('status')} conclusion={view.get('conclusion')}", flush=True)
-
-            concl = (view.get("conclusion") or "").lower()
-            if concl not in ("success", ""):
-                any_fail = True
-
-            if args.download_artifacts:
-                dest = out_dir / "artifacts" / rt.repo / f"{label}_{run_id}"
-                dl_ok, dl_out = gh_download_artifacts(args.owner, rt.repo, run_id, dest)
-                run_rec["run"]["download"] = {"ok": dl_ok, "dest": str(dest), "output": dl_out}
-                print(f"Artifacts download ok={dl_ok}", flush=True)
-
-            run_rec["utc_end"] = now_utc()
-            summary["runs"].append(run_rec)
+    t0 = time.monotonic()
+    any_fail = asyncio.run(orchestrate(args, targets, out_dir, summary))
 
     summary["utc_end"] = now_utc()
+    summary["elapsed_s"] = round(time.monotonic() - t0, 3)
     summary["overall_rc"] = 1 if any_fail else 0
     write_json(out_dir / "summary.json", summary)
 
@@ -6,5 +6,19 @@ CREATE TABLE IF NOT EXISTS cycles (
   phio_coherence_score REAL,
   dd_json TEXT,
   ddr_json TEXT,
-  e_json TEXT
+  e_json TEXT,
+  mode TEXT,
+  systemd_ddr TEXT,
+  systemd_e TEXT,
+  sost_e_state TEXT,
+  phio_status TEXT,
+  systemd_status TEXT,
+  sost_status TEXT,
+  manifest_stat TEXT,
+  ingested_utc TEXT
 );
+CREATE INDEX IF NOT EXISTS idx_cycles_fixture ON cycles (fixture_sha256);
+CREATE INDEX IF NOT EXISTS idx_cycles_created ON cycles (created_utc);
+CREATE INDEX IF NOT EXISTS idx_cycles_systemd_ddr ON cycles (systemd_ddr, created_utc);
+CREATE INDEX IF NOT EXISTS idx_cycles_systemd_e ON cycles (systemd_e, created_utc);
+CREATE INDEX IF NOT EXISTS idx_cycles_sost_e ON cycles (sost_e_state, created_utc);
@@ -2,12 +2,18 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
+import random
 import re
+import shlex
+import shutil
+import sqlite3
 import subprocess
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -21,13 +27,29 @@ def ts_compact() -> str:
     return time.strftime("%Y%m%d_%H%M%S", time.gmtime())
 
 
-def run_capture(cmd: List[str], *, cwd: Optional[Path] = None) -> Tuple[int, str]:
-    p = subprocess.run(cmd, cwd=str(cwd) if cwd else None, text=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+def run_capture(cmd: List[str], *, cwd: Optional[Path] = None, timeout: Optional[float] = None) -> Tuple[int, str]:
+    try:
+        p = subprocess.run(cmd, cwd=str(cwd) if cwd else None, text=True, stdout=subprocess.PIPE,
+                           stderr=subprocess.STDOUT, timeout=timeout)
+    except subprocess.TimeoutExpired as e:
+        out = e.output.decode("utf-8", errors="replace") if isinstance(e.output, bytes) else (e.output or "")
+        return 124, out + f"\ntimeout after {timeout:.0f}s"
     return p.returncode, p.stdout or ""
 
 
+# Compression du bundle : stored (aucune), fast (deflate niveau 1), deflated (défaut zlib).
+ZIP_MODES = {
+    "stored": (zipfile.ZIP_STORED, None),
+    "fast": (zipfile.ZIP_DEFLATED, 1),
+    "deflated": (zipfile.ZIP_DEFLATED, None),
+}
+
+
+GH: List[str] = ["gh"]
+
+
 def ensure_gh() -> None:
-    rc, out = run_capture(["gh", "--version"])
+    rc, out = run_capture([*GH, "--version"])
     if rc != 0:
         raise SystemExit("gh introuvable sur le runner.\n" + out)
 
@@ -63,9 +85,9 @@ class RunInfo:
     html_url: Optional[str]
 
 
-def gh_list_runs(repo: str, workflow: str = "", limit: int = 30) -> Tuple[bool, str, List[RunInfo]]:
+def gh_list_runs(repo: str, workflow: str = "", limit: int = 30, timeout: Optional[float] = None) -> Tuple[bool, str, List[RunInfo]]:
     cmd = [
-        "gh", "run", "list",
+        *GH, "run", "list",
         "-R", repo,
         "--limit", str(limit),
         "--json", "databaseId,status,conclusion,createdAt,displayTitle,workflowName,htmlUrl",
@@ -73,7 +95,7 @@ def gh_list_runs(repo: str, workflow: str = "", limit: int = 30) -> Tuple[bool,
     if workflow:
         cmd += ["--workflow", workflow]
 
-    rc, out = run_capture(cmd)
+    rc, out = run_capture(cmd, timeout=timeout)
     if rc != 0:
         return False, out.strip(), []
 
@@ -109,26 +131,295 @@ def pick_run(runs: List[RunInfo]) -> Optional[RunInfo]:
     return runs[0] if runs else None
 
 
-def gh_download_run(repo: str, run_id: int, dest: Path) -> Tuple[bool, str]:
+def gh_download_run(repo: str, run_id: int, dest: Path, timeout: Optional[float] = None) -> Tuple[bool, str]:
+    # gh refuse d'écraser un artefact déjà extrait : on repart d'un dossier vide.
+    if dest.exists():
+        shutil.rmtree(dest)
     dest.mkdir(parents=True, exist_ok=True)
-    cmd = ["gh", "run", "download", str(run_id), "-R", repo, "-D", str(dest)]
-    rc, out = run_capture(cmd)
+    cmd = [*GH, "run", "download", str(run_id), "-R", repo, "-D", str(dest)]
+    rc, out = run_capture(cmd, timeout=timeout)
     return rc == 0, out.strip()
 
 
-def zip_folder(src_dir: Path, zip_path: Path) -> None:
-    if zip_path.exists():
-        zip_path.unlink()
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as z:
-        for p in sorted(src_dir.rglob("*")):
-            if p.is_file():
-                z.write(p, p.relative_to(src_dir.parent))
+def with_retries(call, deadline: float, retries: int, base_s: float = 2.0):
+    """Appelle call(timeout) jusqu'à succès (res[0] vrai), au plus 1 + retries fois.
+
+    Attente entre essais : backoff exponentiel avec jitter complet, sans
+    dépasser l'échéance du repo. Rend (résultat, nombre d'essais).
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        res = call(max(1.0, deadline - time.monotonic()))
+        if res[0] or attempt > retries:
+            return res, attempt
+        pause = random.uniform(0, base_s * 2 ** (attempt - 1))
+        if time.monotonic() + pause >= deadline:
+            return res, attempt
+        time.sleep(pause)
 
 
 def sanitize_repo(repo: str) -> str:
     return repo.replace("/", "__")
 
 
+INDEX_NAME = "index.sqlite"
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+  repo TEXT NOT NULL,
+  database_id INTEGER NOT NULL,
+  status TEXT,
+  conclusion TEXT,
+  created_at TEXT,
+  workflow_name TEXT,
+  display_title TEXT,
+  html_url TEXT,
+  seen_utc TEXT NOT NULL,
+  PRIMARY KEY (repo, database_id)
+);
+CREATE TABLE IF NOT EXISTS downloads (
+  repo TEXT NOT NULL,
+  database_id INTEGER NOT NULL,
+  workflow_filter TEXT NOT NULL,
+  ok INTEGER NOT NULL,
+  attempts INTEGER,
+  error TEXT,
+  run_dir TEXT NOT NULL,
+  utc TEXT NOT NULL,
+  run_status TEXT,
+  PRIMARY KEY (repo, database_id)
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+  repo TEXT NOT NULL,
+  database_id INTEGER NOT NULL,
+  path TEXT NOT NULL,
+  sha256 TEXT NOT NULL,
+  bytes INTEGER NOT NULL,
+  PRIMARY KEY (repo, database_id, path)
+);
+"""
+
+
+def open_index(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(str(path))
+    con.executescript(INDEX_SCHEMA)
+    # Index antérieur à run_status : ses téléchargements ne sont plus réutilisés (statut inconnu).
+    if "run_status" not in {row[1] for row in con.execute("PRAGMA table_info(downloads)")}:
+        con.execute("ALTER TABLE downloads ADD COLUMN run_status TEXT")
+    return con
+
+
+def sha256_file(p: Path) -> str:
+    h = hashlib.sha256()
+    with p.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_artifacts(run_dir: Path) -> List[Dict[str, Any]]:
+    art_dir = run_dir / "artifacts"
+    return [
+        {"path": p.relative_to(run_dir).as_posix(), "sha256": sha256_file(p), "bytes": p.stat().st_size}
+        for p in sorted(art_dir.rglob("*")) if p.is_file()
+    ]
+
+
+def index_downloaded(con: sqlite3.Connection, outdir: Path) -> Dict[Tuple[str, int], List[Dict[str, Any]]]:
+    """Runs téléchargés une fois terminés dont tous les fichiers indexés sont encore présents (même taille).
+
+    Un run encore queued/in_progress au moment du téléchargement n'a que des
+    artefacts partiels : il est retéléchargé à la collecte suivante.
+    """
+    have: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+    for repo, rid, run_dir in con.execute(
+            "SELECT repo, database_id, run_dir FROM downloads WHERE ok = 1 AND run_status = 'completed'"):
+        arts = [
+            {"path": path, "sha256": sha, "bytes": size}
+            for path, sha, size in con.execute(
+                "SELECT path, sha256, bytes FROM artifacts WHERE repo = ? AND database_id = ? ORDER BY path", (repo, rid))
+        ]
+        base = outdir / run_dir
+        if all((base / a["path"]).is_file() and (base / a["path"]).stat().st_size == a["bytes"] for a in arts):
+            have[(repo, rid)] = arts
+    return have
+
+
+def index_record(con: sqlite3.Connection, outdir: Path, item: Dict[str, Any], runs: List[RunInfo]) -> None:
+    """Enregistre les runs listés et le résultat du téléchargement d'un repo (une transaction)."""
+    repo, now = item["repo"], utc_now()
+    with con:
+        con.executemany(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(repo, r.database_id, r.status, r.conclusion, r.created_at, r.workflow_name, r.display_title,
+              r.html_url, now) for r in runs],
+        )
+        sel = item["selected_run"]
+        if not sel or item.get("cached"):
+            return
+        rid = sel["databaseId"]
+        run_dir = (outdir / sanitize_repo(repo) / f"run_{rid}").relative_to(outdir).as_posix()
+        con.execute(
+            "INSERT OR REPLACE INTO downloads (repo, database_id, workflow_filter, ok, attempts, error, run_dir, utc,"
+            " run_status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (repo, rid, item["workflow_filter"], int(item["download_ok"]), item.get("download_attempts"),
+             item["error"], run_dir, now, sel["status"]),
+        )
+        con.execute("DELETE FROM artifacts WHERE repo = ? AND database_id = ?", (repo, rid))
+        con.executemany(
+            "INSERT INTO artifacts VALUES (?, ?, ?, ?, ?)",
+            [(repo, rid, a["path"], a["sha256"], a["bytes"]) for a in item.get("artifacts", [])],
+        )
+
+
+def manifest_items_from_index(con: sqlite3.Connection, repos: List[str], workflow_filter: str) -> List[Dict[str, Any]]:
+    """Items de manifest.json reconstruits depuis l'index, sans réseau.
+
+    Dernier run téléchargé terminé par repo, sinon dernier run téléchargé ; le
+    statut rapporté est celui du run au moment du téléchargement.
+    """
+    items: List[Dict[str, Any]] = []
+    for repo in repos:
+        item: Dict[str, Any] = {
+            "repo": repo,
+            "workflow_filter": workflow_filter,
+            "selected_run": None,
+            "download_ok": False,
+            "error": "not_in_index",
+        }
+        row = con.execute(
+            """SELECT r.database_id, d.run_status,
+                      CASE WHEN d.run_status = 'completed' THEN r.conclusion ELSE '' END, r.created_at, r.workflow_name, r.display_title,
+                      r.html_url, d.attempts
+               FROM downloads d JOIN runs r USING (repo, database_id)
+               WHERE d.repo = ? AND d.workflow_filter = ? AND d.ok = 1
+               ORDER BY d.run_status IS 'completed' DESC, r.created_at DESC, r.database_id DESC LIMIT 1""",
+            (repo, workflow_filter),
+        ).fetchone()
+        if row:
+            rid = row[0]
+            item["selected_run"] = dict(zip(
+                ("databaseId", "status", "conclusion", "createdAt", "workflowName", "displayTitle", "htmlUrl"), row[:7]))
+            item["download_ok"] = True
+            item["download_attempts"] = row[7]
+            item["error"] = None
+            item["artifacts"] = [
+                {"path": path, "sha256": sha, "bytes": size}
+                for path, sha, size in con.execute(
+                    "SELECT path, sha256, bytes FROM artifacts WHERE repo = ? AND database_id = ? ORDER BY path",
+                    (repo, rid))
+            ]
+        items.append(item)
+    return items
+
+
+def harvest_repo(
+    repo: str, outdir: Path, args: argparse.Namespace, have: Dict[Tuple[str, int], List[Dict[str, Any]]],
+) -> Tuple[Dict[str, Any], List[RunInfo]]:
+    """Liste les runs d'un repo, choisit le run, télécharge ses artefacts (avec reprises).
+
+    Un run déjà présent dans l'index (`have`) n'est pas retéléchargé.
+    Rend l'item du manifest et les runs listés (pour l'index).
+    """
+    deadline = time.monotonic() + args.timeout_s
+    item: Dict[str, Any] = {
+        "repo": repo,
+        "workflow_filter": args.workflow,
+        "selected_run": None,
+        "download_ok": False,
+        "error": None,
+    }
+
+    (ok, msg, runs), _ = with_retries(
+        lambda t: gh_list_runs(repo, workflow=args.workflow, limit=args.limit, timeout=t), deadline, args.retries)
+    if not ok:
+        item["error"] = f"run_list_failed:{msg}"
+        return item, []
+
+    selected = pick_run(runs)
+    if not selected:
+        item["error"] = "no_runs_found"
+        return item, runs
+
+    item["selected_run"] = {
+        "databaseId": selected.database_id,
+        "status": selected.status,
+        "conclusion": selected.conclusion,
+        "createdAt": selected.created_at,
+        "workflowName": selected.workflow_name,
+        "displayTitle": selected.display_title,
+        "htmlUrl": selected.html_url,
+    }
+
+    repo_dir = outdir / sanitize_repo(repo) / f"run_{selected.database_id}"
+    cached = have.get((repo, selected.database_id))
+    if cached is not None:
+        item.update(download_ok=True, cached=True, download_attempts=0, artifacts=cached)
+        return item, runs
+
+    repo_dir.mkdir(parents=True, exist_ok=True)
+
+    write_json(repo_dir / "run_meta.json", item["selected_run"])
+    (ok_dl, out_dl), attempts = with_retries(
+        lambda t: gh_download_run(repo, selected.database_id, repo_dir / "artifacts", timeout=t), deadline, args.retries)
+    write_text(repo_dir / "download.log", out_dl + "\n")
+
+    item["download_ok"] = bool(ok_dl)
+    item["download_attempts"] = attempts
+    if not ok_dl:
+        item["error"] = f"download_failed:{out_dl[:2000]}"
+    else:
+        item["error"] = None
+        item["artifacts"] = hash_artifacts(repo_dir)
+    return item, runs
+
+
+def prune_outdir(con: sqlite3.Connection, outdir: Path, items: List[Dict[str, Any]], since_utc: str) -> Dict[str, int]:
+    """Ne garde que les runs sélectionnés par cette collecte (dossiers et lignes d'index).
+
+    Les runs listés avant `since_utc` et qui n'ont plus de téléchargement
+    sont aussi retirés de l'index : le cache reste borné au nombre de repos.
+    Un repo dont la liste des runs a échoué garde ses runs précédents.
+    """
+    keep = {
+        (sanitize_repo(it["repo"]), f"run_{it['selected_run']['databaseId']}")
+        for it in items if it.get("selected_run")
+    }
+    unlisted = {sanitize_repo(it["repo"]) for it in items if (it.get("error") or "").startswith("run_list_failed")}
+
+    def stale_run(repo_name: str, run_name: str) -> bool:
+        return repo_name not in unlisted and (repo_name, run_name) not in keep
+
+    removed = 0
+    for run_dir in sorted(outdir.glob("*/run_*")):
+        if run_dir.is_dir() and stale_run(run_dir.parent.name, run_dir.name):
+            shutil.rmtree(run_dir)
+            removed += 1
+    for repo_dir in outdir.iterdir():
+        if repo_dir.is_dir() and not any(repo_dir.iterdir()):
+            repo_dir.rmdir()
+    with con:
+        stale = [
+            (repo, rid) for repo, rid in con.execute("SELECT repo, database_id FROM downloads")
+            if stale_run(sanitize_repo(repo), f"run_{rid}")
+        ]
+        con.executemany("DELETE FROM downloads WHERE repo = ? AND database_id = ?", stale)
+        con.executemany("DELETE FROM artifacts WHERE repo = ? AND database_id = ?", stale)
+        con.execute(
+            """DELETE FROM runs WHERE seen_utc < ? AND NOT EXISTS (
+                 SELECT 1 FROM downloads d WHERE d.repo = runs.repo AND d.database_id = runs.database_id)""",
+            (since_utc,))
+    con.execute("VACUUM")
+    return {"run_dirs_removed": removed, "downloads_removed": len(stale)}
+
+
+def zip_add_tree(z: zipfile.ZipFile, src_dir: Path, base: Path) -> None:
+    for p in sorted(src_dir.rglob("*")):
+        if p.is_file():
+            z.write(p, p.relative_to(base))
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Collecte transverse des artefacts GitHub Actions (multi-repos).")
     ap.add_argument("--repos-file", required=True, help="Fichier repos.txt (owner/repo par ligne).")
@@ -136,13 +427,24 @@ def main() -> int:
     ap.add_argument("--workflow", default="", help="Filtre optionnel de workflow (nom ou fichier).")
     ap.add_argument("--zip", action="store_true", help="Créer un bundle zip final.")
     ap.add_argument("--limit", type=int, default=30, help="Nombre de runs inspectés par repo.")
+    ap.add_argument("--workers", type=int, default=8, help="Repos traités en parallèle.")
+    ap.add_argument("--timeout-s", type=float, default=900, help="Temps max par repo (liste + téléchargement).")
+    ap.add_argument("--retries", type=int, default=2, help="Nouvelles tentatives par appel gh en échec.")
+    ap.add_argument("--zip-mode", choices=sorted(ZIP_MODES), default="deflated",
+                    help="Compression du bundle (stored: aucune, fast: deflate niveau 1).")
+    ap.add_argument("--gh", default=os.environ.get("GH_BIN", "gh"), help="Commande gh (défaut: $GH_BIN ou gh).")
+    ap.add_argument("--index", default=None, help=f"Index SQLite des runs (défaut: <outdir>/{INDEX_NAME}).")
+    ap.add_argument("--rebuild-manifest", action="store_true",
+                    help="Reconstruire manifest.json depuis l'index, sans appel réseau.")
+    ap.add_argument("--prune", action="store_true",
+                    help="Après la collecte, supprimer les runs non sélectionnés (dossiers et index).")
     args = ap.parse_args()
-
-    ensure_gh()
+    GH[:] = shlex.split(args.gh)
 
     repos_path = Path(args.repos_file).resolve()
     outdir = Path(args.outdir).resolve()
     outdir.mkdir(parents=True, exist_ok=True)
+    index = open_index(Path(args.index).resolve() if args.index else outdir / INDEX_NAME)
 
     repos = read_repos_file(repos_path)
     manifest: Dict[str, Any] = {
@@ -152,59 +454,50 @@ def main() -> int:
         "items": [],
     }
 
-    for repo in repos:
-        item: Dict[str, Any] = {
-            "repo": repo,
-            "workflow_filter": args.workflow,
-            "selected_run": None,
-            "download_ok": False,
-            "error": None,
-        }
-
-        ok, msg, runs = gh_list_runs(repo, workflow=args.workflow, limit=args.limit)
-        if not ok:
-            item["error"] = f"run_list_failed:{msg}"
-            manifest["items"].append(item)
-            continue
-
-        selected = pick_run(runs)
-        if not selected:
-            item["error"] = "no_runs_found"
-            manifest["items"].append(item)
-            continue
-
-        item["selected_run"] = {
-            "databaseId": selected.database_id,
-            "status": selected.status,
-            "conclusion": selected.conclusion,
-            "createdAt": selected.created_at,
-            "workflowName": selected.workflow_name,
-            "displayTitle": selected.display_title,
-            "htmlUrl": selected.html_url,
-        }
-
-        repo_dir = outdir / sanitize_repo(repo) / f"run_{selected.database_id}"
-        repo_dir.mkdir(parents=True, exist_ok=True)
-
-        write_json(repo_dir / "run_meta.json", item["selected_run"])
-        ok_dl, out_dl = gh_download_run(repo, selected.database_id, repo_dir / "artifacts")
-        write_text(repo_dir / "download.log", out_dl + "\n")
+    if args.rebuild_manifest:
+        manifest["source"] = "index"
+        manifest["items"] = manifest_items_from_index(index, repos, args.workflow)
+        manifest["utc_end"] = utc_now()
+        write_json(outdir / "manifest.json", manifest)
+        index.close()
+        return 0
 
-        item["download_ok"] = bool(ok_dl)
-        if not ok_dl:
-            item["error"] = f"download_failed:{out_dl[:2000]}"
-        else:
-            item["error"] = None
-
-        manifest["items"].append(item)
-
-    manifest["utc_end"] = utc_now()
-    write_json(outdir / "manifest.json", manifest)
+    ensure_gh()
+    have = index_downloaded(index, outdir)
 
+    # Le bundle est alimenté au fil des repos terminés, pendant que les autres téléchargent.
+    bundle: Optional[zipfile.ZipFile] = None
     if args.zip:
-        zip_name = f"all_reports_bundle_{ts_compact()}.zip"
-        zip_path = outdir.parent / zip_name
-        zip_folder(outdir, zip_path)
+        zip_path = outdir.parent / f"all_reports_bundle_{ts_compact()}.zip"
+        compression, level = ZIP_MODES[args.zip_mode]
+        bundle = zipfile.ZipFile(zip_path, "w", compression=compression, compresslevel=level)
+
+    items: List[Optional[Dict[str, Any]]] = [None] * len(repos)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futures = {pool.submit(harvest_repo, repo, outdir, args, have): i for i, repo in enumerate(repos)}
+            for fut in as_completed(futures):
+                i = futures[fut]
+                item, runs = fut.result()
+                items[i] = item
+                index_record(index, outdir, item, runs)
+                print(f"[{item['repo']}] download_ok={item['download_ok']} cached={bool(item.get('cached'))} "
+                      f"error={item['error']}", flush=True)
+                if bundle is not None and item["selected_run"]:
+                    run_dir = outdir / sanitize_repo(item["repo"]) / f"run_{item['selected_run']['databaseId']}"
+                    zip_add_tree(bundle, run_dir, outdir.parent)
+
+        manifest["items"] = items
+        if args.prune:
+            manifest["pruned"] = prune_outdir(index, outdir, items, manifest["utc_start"])
+        manifest["utc_end"] = utc_now()
+        write_json(outdir / "manifest.json", manifest)
+        if bundle is not None:
+            bundle.write(outdir / "manifest.json", (outdir / "manifest.json").relative_to(outdir.parent))
+    finally:
+        if bundle is not None:
+            bundle.close()
+        index.close()
 
     return 0
 
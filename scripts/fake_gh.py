@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Faux `gh` local pour tester les scripts d'orchestration sans GitHub.
+
+Implémente le sous-ensemble utilisé par orchestrate_workflows.py et
+scripts/collect_all_reports.py :
+
+  gh --version
+  gh workflow list -R owner/repo [--json champs]
+  gh workflow run <sel> -R owner/repo
+  gh run list -R owner/repo [--workflow <sel>] [--limit N] [--json champs]
+  gh run view <id> -R owner/repo [--json champs]
+  gh run download <id> -R owner/repo -D <dest>
+
+État partagé dans le dossier $FAKE_GH_STATE (défaut : ./_fake_gh) :
+  runs.json  runs créés par `workflow run` (verrou fcntl, appels concurrents OK)
+  calls.log  une ligne JSON par appel (argv, t) pour compter les appels
+
+Comportement réglable par variables d'environnement :
+  FAKE_GH_DURATION   durée d'un run en secondes (défaut 2)
+  FAKE_GH_DURATIONS  JSON {"<sel>": secondes} par workflow
+  FAKE_GH_FAIL       sélecteurs séparés par des virgules -> conclusion "failure"
+  FAKE_GH_LATENCY    délai ajouté à chaque appel, en secondes (défaut 0)
+  FAKE_GH_WORKFLOWS  fichiers de workflow connus, séparés par des virgules
+                     (défaut : ceux de targets.yml) ; les autres sont refusés
+  FAKE_GH_FLAKY      probabilité d'échec (exit 1) de `run list` / `run download`
+  FAKE_GH_SEED       graine du tirage FAKE_GH_FLAKY, combinée au numéro de
+                     l'appel (lignes de calls.log) : échecs reproductibles
+  FAKE_GH_ARTIFACT_KB  taille d'un fichier de données ajouté à chaque artefact
+  FAKE_GH_NOISE      si "1", chaque dispatch crée aussi, juste après, un run
+                     `push` du même workflow (course sur "le dernier run")
+
+Exemple :
+  FAKE_GH_STATE=/tmp/fgh FAKE_GH_DURATIONS='{"ci.yml": 3}' \\
+    python orchestrate_workflows.py --gh "python3 scripts/fake_gh.py" --poll-s 1 --out /tmp/orch
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import random
+import sys
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+STATE = Path(os.environ.get("FAKE_GH_STATE", "_fake_gh"))
+QUEUED_S = 0.2
+DEFAULT_WORKFLOWS = "ci.yml,smoke.yml,dd_smoke.yml,band_suite_isolated.yml,collect_all_reports.yml"
+
+
+def iso(t: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t))
+
+
+@contextmanager
+def locked_runs() -> Iterator[List[Dict[str, Any]]]:
+    STATE.mkdir(parents=True, exist_ok=True)
+    with (STATE / "runs.lock").open("w") as lk:
+        fcntl.flock(lk, fcntl.LOCK_EX)
+        path = STATE / "runs.json"
+        runs = json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+        n = len(runs)
+        yield runs
+        if len(runs) != n:
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(runs, indent=2), encoding="utf-8")
+            os.replace(tmp, path)
+
+
+def opt(argv: List[str], name: str, default: Optional[str] = None) -> Optional[str]:
+    if name in argv:
+        i = argv.index(name)
+        if i + 1 < len(argv):
+            return argv[i + 1]
+    return default
+
+
+def workflows() -> List[str]:
+    return [w for w in (os.environ.get("FAKE_GH_WORKFLOWS") or DEFAULT_WORKFLOWS).split(",") if w]
+
+
+def workflow_id(sel: str) -> int:
+    return zlib.crc32(sel.encode("utf-8"))
+
+
+def duration_of(sel: str) -> float:
+    per = json.loads(os.environ.get("FAKE_GH_DURATIONS") or "{}")
+    return float(per.get(sel, os.environ.get("FAKE_GH_DURATION", "2")))
+
+
+def public(run: Dict[str, Any], now: float) -> Dict[str, Any]:
+    elapsed = now - run["t"]
+    if elapsed < QUEUED_S:
+        status, conclusion = "queued", ""
+    elif elapsed < run["duration"]:
+        status, conclusion = "in_progress", ""
+    else:
+        status, conclusion = "completed", run["conclusion"]
+    end = run["t"] + run["duration"] if status == "completed" else now
+    url = f"https://github.com/{run['repo']}/actions/runs/{run['id']}"
+    return {
+        "databaseId": run["id"],
+        "workflowDatabaseId": workflow_id(run["workflow"]),
+        "event": run.get("event", "workflow_dispatch"),
+        "status": status,
+        "conclusion": conclusion,
+        "createdAt": iso(run["t"]),
+        "updatedAt": iso(end),
+        "displayTitle": run["workflow"],
+        "workflowName": run["workflow"],
+        "url": url,
+        "htmlUrl": url,
+    }
+
+
+def pick_fields(obj: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    if not fields:
+        return obj
+    return {k: obj.get(k) for k in fields.split(",")}
+
+
+def main(argv: List[str]) -> int:
+    STATE.mkdir(parents=True, exist_ok=True)
+    with (STATE / "calls.log").open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"argv": argv, "t": time.time()}) + "\n")
+    time.sleep(float(os.environ.get("FAKE_GH_LATENCY", "0")))
+
+    if argv[:1] == ["--version"]:
+        print("gh version 0.0.0-fake")
+        return 0
+
+    cmd = argv[:2]
+    repo = opt(argv, "-R")
+    if not repo:
+        print("fake gh: -R owner/repo requis", file=sys.stderr)
+        return 2
+
+    if cmd == ["workflow", "list"]:
+        wfs = [{"id": workflow_id(w), "name": w.rsplit(".", 1)[0], "path": f".github/workflows/{w}", "state": "active"}
+               for w in workflows()]
+        if opt(argv, "--json"):
+            print(json.dumps([pick_fields(w, opt(argv, "--json")) for w in wfs]))
+        else:
+            print("\n".join(f"{w['name']}\t{w['state']}\t{w['id']}" for w in wfs))
+        return 0
+
+    if cmd == ["workflow", "run"]:
+        sel = argv[2]
+        if sel not in workflows():
+            print(f"could not find workflow {sel}", file=sys.stderr)
+            return 1
+        fail = {s for s in (os.environ.get("FAKE_GH_FAIL") or "").split(",") if s}
+        noise = os.environ.get("FAKE_GH_NOISE") == "1"
+        with locked_runs() as runs:
+            t = time.time()
+            for event, dt in [("workflow_dispatch", 0.0)] + ([("push", 0.5)] if noise else []):
+                runs.append({
+                    "id": 1000 + len(runs) + 1,
+                    "repo": repo,
+                    "workflow": sel,
+                    "event": event,
+                    "t": t + dt,
+                    "duration": duration_of(sel),
+                    "conclusion": "failure" if sel in fail else "success",
+                })
+        print(f"✓ Created workflow_dispatch event for {sel}")
+        return 0
+
+    seed = os.environ.get("FAKE_GH_SEED")
+    if seed:
+        with (STATE / "calls.log").open(encoding="utf-8") as f:
+            rng = random.Random(f"{seed}:{sum(1 for _ in f)}")
+    else:
+        rng = random
+    if cmd in (["run", "list"], ["run", "download"]) and rng.random() < float(os.environ.get("FAKE_GH_FLAKY", "0")):
+        print("HTTP 502: Bad Gateway (fake)", file=sys.stderr)
+        return 1
+
+    if cmd == ["run", "list"]:
+        wf = opt(argv, "--workflow")
+        limit = int(opt(argv, "--limit", "20"))
+        now = time.time()
+        with locked_runs() as runs:
+            sel = [r for r in runs if r["repo"] == repo and r["t"] <= now and (wf is None or r["workflow"] == wf)]
+        sel.sort(key=lambda r: r["t"], reverse=True)
+        print(json.dumps([pick_fields(public(r, now), opt(argv, "--json")) for r in sel[:limit]]))
+        return 0
+
+    if cmd == ["run", "view"]:
+        rid = int(argv[2])
+        with locked_runs() as runs:
+            run = next((r for r in runs if r["id"] == rid and r["repo"] == repo), None)
+        if run is None:
+            print(f"could not find any workflow run with ID {rid}", file=sys.stderr)
+            return 1
+        print(json.dumps(pick_fields(public(run, time.time()), opt(argv, "--json"))))
+        return 0
+
+    if cmd == ["run", "download"]:
+        rid = int(argv[2])
+        with locked_runs() as runs:
+            run = next((r for r in runs if r["id"] == rid and r["repo"] == repo), None)
+        if run is None:
+            print(f"could not find any workflow run with ID {rid}", file=sys.stderr)
+            return 1
+        dest = Path(opt(argv, "-D", "."))
+        art = dest / f"report_{rid}"
+        art.mkdir(parents=True, exist_ok=True)
+        (art / "report.json").write_text(json.dumps(public(run, time.time()), indent=2), encoding="utf-8")
+        kb = int(os.environ.get("FAKE_GH_ARTIFACT_KB", "0"))
+        if kb:
+            line = json.dumps(public(run, time.time())) + "\n"
+            with (art / "data.jsonl").open("w", encoding="utf-8") as f:
+                f.write(line * (kb * 1024 // len(line) + 1))
+        return 0
+
+    print(f"fake gh: commande non gérée: {' '.join(argv)}", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
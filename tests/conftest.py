@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# The SOST engine is imported from its checkout, as run_sost.py does.
+SOST_ROOT = REPO_ROOT / "engines" / "sost"
+if str(SOST_ROOT) not in sys.path:
+    sys.path.insert(0, str(SOST_ROOT))
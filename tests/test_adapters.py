@@ -0,0 +1,35 @@
+import json
+import sys
+
+import pytest
+
+from transobserver import adapters
+
+
+@pytest.mark.parametrize("name", sorted(adapters.ENTRYPOINTS))
+def test_load_module_inprocess(name):
+    mod = adapters.load_module(name)
+    assert sys.modules[mod.__name__] is mod
+    assert callable(adapters._entrypoint(mod))
+
+
+def test_load_module_failure_unregisters(tmp_path, monkeypatch):
+    script = tmp_path / "broken.py"
+    script.write_text("raise RuntimeError('boom')\n", encoding="utf-8")
+    entry = adapters.EngineEntry(repo=tmp_path, script=script, sys_path=())
+    monkeypatch.setitem(adapters.ENTRYPOINTS, "broken", entry)
+    with pytest.raises(RuntimeError):
+        adapters.load_module("broken")
+    assert "transobserver_engine_broken" not in sys.modules
+    assert "broken" not in adapters._modules
+
+
+def test_phio_probe_inprocess_writes_baseline(tmp_path):
+    out = tmp_path / "phio_baseline.json"
+    res = adapters.call("phio_probe", adapters.phio_probe_argv(out, "inprocess"),
+                        cwd=adapters.ENTRYPOINTS["phio_probe"].repo, isolation="inprocess")
+    assert res.returncode == 0, res.stderr
+    baseline = json.loads(out.read_text(encoding="utf-8"))
+    assert baseline["instrument_hash"]
+    assert baseline["cli"]["help_valid"]
+    assert baseline["cli"]["_forensics"]["cmd"][0] == "<in-process>"
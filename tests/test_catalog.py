@@ -0,0 +1,68 @@
+import json
+import shutil
+from pathlib import Path
+
+from transobserver import catalog
+
+ROOT = Path(__file__).resolve().parents[1]
+SOST_RUN = ROOT / "examples" / "sost_ci" / "run1" / "run"
+SYSTEMD_RUN = ROOT / "examples" / "systemd_ci" / "ddr_smoke"
+
+
+def _cycle(out_root: Path, cycle_id: str, sost_run_id: str = "run") -> Path:
+    """A finished cycle laid out as the real engines write it."""
+    cycle = out_root / cycle_id
+    shutil.copytree(SOST_RUN, cycle / "sost" / sost_run_id)
+    shutil.copytree(SYSTEMD_RUN, cycle / "systemd")
+    manifest = {
+        "input": {"fixture_sha256": "ab" * 32},
+        "timing": {"mode": "real"},
+        "engines": {name: {"status": "ok", "started_utc": "2026-10-01T00:00:00.000Z"}
+                    for name in ("phio", "systemd", "sost")},
+    }
+    (cycle / "unified_manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return cycle
+
+
+def _expected_state() -> str:
+    return json.loads((SOST_RUN / "e" / "e_report.json").read_text(encoding="utf-8"))["equilibrium_state"]
+
+
+def test_cycle_row_reads_sost_run_dir(tmp_path):
+    row = catalog.cycle_row(_cycle(tmp_path, "c1"))
+    assert row["sost_e_state"] == _expected_state()
+    assert json.loads(row["dd_json"])["sost"]["run_id"] == "run"
+    assert set(json.loads(row["ddr_json"])) == {"systemd", "sost"}
+    assert set(json.loads(row["e_json"])) == {"systemd", "sost"}
+
+
+def test_cycle_row_custom_run_id(tmp_path):
+    row = catalog.cycle_row(_cycle(tmp_path, "c1", sost_run_id="band_x"))
+    assert row["sost_e_state"] == _expected_state()
+    assert row["dd_json"] is not None
+
+
+def test_ingest_and_query_sost_state(tmp_path):
+    _cycle(tmp_path, "c1")
+    _cycle(tmp_path, "c2")
+    report = catalog.ingest_root(tmp_path)
+    assert report["ingested"] == 2
+    con = catalog.open_catalog(tmp_path / catalog.CATALOG_NAME)
+    try:
+        rows = catalog.query(con, sost_e=_expected_state())
+    finally:
+        con.close()
+    assert [r["cycle_id"] for r in rows] == ["c2", "c1"]
+
+
+def test_count_matches_query(tmp_path):
+    _cycle(tmp_path, "c1")
+    _cycle(tmp_path, "c2")
+    catalog.ingest_root(tmp_path)
+    con = catalog.open_catalog(tmp_path / catalog.CATALOG_NAME)
+    try:
+        for filters in ({}, {"sost_e": _expected_state()}, {"sost_e": "none"}, {"fixture": "abab"},
+                        {"since": "2026-10-01", "until": "2026-10-02"}, {"until": "2026-10-01"}):
+            assert catalog.count(con, **filters) == len(catalog.query(con, **filters))
+    finally:
+        con.close()
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import shlex
+import sys
+import time
+import zipfile
+
+import pytest
+
+from conftest import REPO_ROOT
+
+FAKE_GH = [sys.executable, str(REPO_ROOT / "scripts" / "fake_gh.py")]
+
+
+@pytest.fixture
+def cr(monkeypatch):
+    monkeypatch.syspath_prepend(str(REPO_ROOT / "scripts"))
+    import collect_all_reports
+
+    monkeypatch.setattr(collect_all_reports, "GH", list(FAKE_GH))
+    monkeypatch.setattr(collect_all_reports.time, "sleep", lambda s: None)  # no backoff pauses
+    return collect_all_reports
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    path = tmp_path / "fgh"
+    path.mkdir()
+    monkeypatch.setenv("FAKE_GH_STATE", str(path))
+    return path
+
+
+def add_run(state, repo, rid, age_s=100.0, duration_s=1.0, conclusion="success"):
+    """A fake_gh run of ci.yml started `age_s` ago (completed once duration_s has elapsed)."""
+    path = state / "runs.json"
+    runs = json.loads(path.read_text()) if path.exists() else []
+    runs.append({"id": rid, "repo": repo, "workflow": "ci.yml", "event": "workflow_dispatch",
+                 "t": time.time() - age_s, "duration": duration_s, "conclusion": conclusion})
+    path.write_text(json.dumps(runs))
+
+
+def gh_calls(state, *cmd):
+    calls = [json.loads(line)["argv"] for line in (state / "calls.log").read_text().splitlines()]
+    return [argv for argv in calls if argv[:len(cmd)] == list(cmd)]
+
+
+def collect(cr, monkeypatch, repos, outdir, *extra):
+    repos_file = outdir.parent / "repos.txt"
+    repos_file.write_text("\n".join(repos) + "\n")
+    monkeypatch.setattr(sys, "argv", ["collect_all_reports.py", "--repos-file", str(repos_file),
+                                      "--outdir", str(outdir), "--workers", "1", "--gh", shlex.join(FAKE_GH), *extra])
+    assert cr.main() == 0
+    return json.loads((outdir / "manifest.json").read_text())
+
+
+def test_flaky_gh_retries_and_zip_bundle(cr, state, tmp_path, monkeypatch):
+    repos = [f"o/r{i}" for i in range(4)]
+    for i, repo in enumerate(repos):
+        add_run(state, repo, 100 + i)
+    monkeypatch.setenv("FAKE_GH_FLAKY", "0.5")
+    monkeypatch.setenv("FAKE_GH_SEED", "7")
+    monkeypatch.setenv("FAKE_GH_ARTIFACT_KB", "64")
+    out = tmp_path / "out"
+
+    manifest = collect(cr, monkeypatch, repos, out, "--retries", "10", "--zip", "--zip-mode", "fast")
+
+    assert len(gh_calls(state, "run", "list")) > len(repos)  # some listings were retried
+    attempts = []
+    for item in manifest["items"]:
+        rid = item["selected_run"]["databaseId"]
+        assert item["download_ok"] and item["error"] is None
+        # One `gh run download` per attempt, the last one successful.
+        assert item["download_attempts"] == len(gh_calls(state, "run", "download", str(rid)))
+        attempts.append(item["download_attempts"])
+    assert max(attempts) > 1
+
+    (bundle,) = tmp_path.glob("all_reports_bundle_*.zip")
+    with zipfile.ZipFile(bundle) as z:
+        names = set(z.namelist())
+        on_disk = {p.relative_to(tmp_path).as_posix() for p in out.glob("*/run_*/**/*") if p.is_file()}
+        assert names == on_disk | {"out/manifest.json"}
+        assert json.loads(z.read("out/manifest.json")) == manifest
+        for item in manifest["items"]:
+            run_dir = f"out/{cr.sanitize_repo(item['repo'])}/run_{item['selected_run']['databaseId']}"
+            assert {a["path"] for a in item["artifacts"]} == {
+                f"artifacts/report_{item['selected_run']['databaseId']}/{f}" for f in ("report.json", "data.jsonl")}
+            for a in item["artifacts"]:
+                data = z.read(f"{run_dir}/{a['path']}")
+                assert (len(data), hashlib.sha256(data).hexdigest()) == (a["bytes"], a["sha256"])
+                assert a["bytes"] >= 64 * 1024 or a["path"].endswith("report.json")
+
+
+def test_completed_run_reused_from_index(cr, state, tmp_path, monkeypatch):
+    add_run(state, "o/a", 10)
+    out = tmp_path / "out"
+    first = collect(cr, monkeypatch, ["o/a"], out)
+    assert first["items"][0]["download_attempts"] == 1
+
+    second = collect(cr, monkeypatch, ["o/a"], out)
+    (item,) = second["items"]
+    assert item["cached"] and item["download_attempts"] == 0
+    assert item["artifacts"] == first["items"][0]["artifacts"]
+    assert len(gh_calls(state, "run", "download")) == 1
+
+    # A file changed on disk (size differs): the run is downloaded again.
+    (report,) = out.glob("o__a/run_10/artifacts/*/report.json")
+    report.write_text("{}")
+    third = collect(cr, monkeypatch, ["o/a"], out)
+    assert not third["items"][0].get("cached")
+    assert len(gh_calls(state, "run", "download")) == 2
+
+
+def test_in_progress_run_downloaded_again(cr, state, tmp_path, monkeypatch):
+    add_run(state, "o/a", 10, age_s=5, duration_s=3600)
+    out = tmp_path / "out"
+    first = collect(cr, monkeypatch, ["o/a"], out)
+    assert first["items"][0]["selected_run"]["status"] == "in_progress"
+    assert first["items"][0]["download_ok"]
+
+    second = collect(cr, monkeypatch, ["o/a"], out)
+    assert not second["items"][0].get("cached")
+    assert second["items"][0]["download_attempts"] == 1
+    assert len(gh_calls(state, "run", "download", "10")) == 2
+
+
+def test_prune_keeps_runs_of_unlisted_repo(cr, state, tmp_path, monkeypatch):
+    add_run(state, "o/a", 10, age_s=200)
+    add_run(state, "o/b", 20)
+    out = tmp_path / "out"
+    collect(cr, monkeypatch, ["o/a", "o/b"], out)
+    assert (out / "o__a" / "run_10").is_dir() and (out / "o__b" / "run_20").is_dir()
+
+    # o/a has a newer run; listing o/b fails this time.
+    add_run(state, "o/a", 11, age_s=100)
+    since = cr.utc_now()
+    con = cr.open_index(out / cr.INDEX_NAME)
+    args = cr.argparse.Namespace(workflow="", limit=30, timeout_s=60, retries=0)
+    item_a, runs_a = cr.harvest_repo("o/a", out, args, cr.index_downloaded(con, out))
+    cr.index_record(con, out, item_a, runs_a)
+    item_b = {"repo": "o/b", "workflow_filter": "", "selected_run": None, "download_ok": False,
+              "error": "run_list_failed:HTTP 502"}
+
+    pruned = cr.prune_outdir(con, out, [item_a, item_b], since)
+
+    assert pruned == {"run_dirs_removed": 1, "downloads_removed": 1}
+    assert sorted(p.relative_to(out).as_posix() for p in out.glob("*/run_*")) == ["o__a/run_11", "o__b/run_20"]
+    assert set(cr.index_downloaded(con, out)) == {("o/a", 11), ("o/b", 20)}
+    assert con.execute("SELECT COUNT(*) FROM artifacts WHERE database_id = 10").fetchone() == (0,)
+    con.close()
+
+
+def test_rebuild_manifest_offline(cr, state, tmp_path, monkeypatch):
+    add_run(state, "o/a", 10)
+    add_run(state, "o/b", 20, age_s=5, duration_s=3600)
+    out = tmp_path / "out"
+    collected = collect(cr, monkeypatch, ["o/a", "o/b", "o/c"], out)
+    ncalls = len(gh_calls(state))
+
+    rebuilt = collect(cr, monkeypatch, ["o/a", "o/b", "o/c"], out, "--rebuild-manifest", "--gh", "/nonexistent/gh")
+
+    assert len(gh_calls(state)) == ncalls  # no gh call at all
+    assert rebuilt["source"] == "index"
+    for got, ref in zip(rebuilt["items"], collected["items"][:2]):
+        assert got["selected_run"]["databaseId"] == ref["selected_run"]["databaseId"]
+        assert got["selected_run"]["status"] == ref["selected_run"]["status"]
+        assert (got["download_ok"], got["artifacts"]) == (True, ref["artifacts"])
+    assert rebuilt["items"][2]["error"] == "not_in_index"
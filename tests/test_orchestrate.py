@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT
+
+pytest.importorskip("yaml")  # orchestrate_workflows reads targets.yml with PyYAML
+import orchestrate_workflows as ow  # noqa: E402
+
+FAKE_GH = [sys.executable, str(REPO_ROOT / "scripts" / "fake_gh.py")]
+
+
+def _args(**kw):
+    base = dict(gh=FAKE_GH, max_gh=4, owner="o", poll_s=0.2, max_poll_s=1.0, run_timeout_s=60,
+                keep_going=True, download_artifacts=True)
+    base.update(kw)
+    return argparse.Namespace(**base)
+
+
+def test_orchestrate_against_fake_gh(tmp_path, monkeypatch):
+    state = tmp_path / "fgh"
+    monkeypatch.setenv("FAKE_GH_STATE", str(state))
+    monkeypatch.setenv("FAKE_GH_DURATION", "1")
+    monkeypatch.setenv("FAKE_GH_NOISE", "1")  # a push run of the same workflow lands right after each dispatch
+    monkeypatch.setenv("FAKE_GH_FAIL", "smoke.yml")
+    monkeypatch.setattr(ow, "FIND_POLL_S", 0.2)
+    targets = [
+        ow.RepoTarget("a", [ow.WorkflowTarget("a", file="ci.yml"),
+                            ow.WorkflowTarget("a", file="ci.yml", label="ci_again"),
+                            ow.WorkflowTarget("a", file="smoke.yml")]),
+        ow.RepoTarget("b", [ow.WorkflowTarget("b", file="ci.yml")]),
+    ]
+    out = tmp_path / "out"
+    summary = {"runs": [], "preflight": []}
+
+    any_fail = asyncio.run(ow.orchestrate(_args(), targets, out, summary))
+
+    assert any_fail  # smoke.yml concludes "failure": overall_rc would be 1
+    runs = json.loads((state / "runs.json").read_text())
+    dispatched = {r["id"]: r for r in runs if r["event"] == "workflow_dispatch"}
+    assert len(runs) == 2 * len(dispatched) == 8
+
+    ids = [rec["run"]["id"] for rec in summary["runs"]]
+    assert len(set(ids)) == 4
+    for rec in summary["runs"]:
+        run = dispatched[rec["run"]["id"]]  # never one of the push runs
+        assert (run["repo"], run["workflow"]) == (f"o/{rec['repo']}", rec["selector"])
+        assert rec["run"]["view"]["status"] == "completed"
+        assert rec["run"]["view"]["conclusion"] == ("failure" if rec["selector"] == "smoke.yml" else "success")
+        dest = out / "artifacts" / rec["repo"] / f"{rec['workflow']}_{rec['run']['id']}"
+        assert rec["run"]["download"] == {"ok": True, "dest": str(dest), "output": ""}
+        assert json.loads((dest / f"report_{run['id']}" / "report.json").read_text())["databaseId"] == run["id"]
+    # The two dispatches of a/ci.yml got their own runs, in dispatch order.
+    a_ci = [rec["run"]["id"] for rec in summary["runs"] if rec["repo"] == "a" and rec["selector"] == "ci.yml"]
+    assert a_ci == sorted(a_ci)
+
+    for repo in ("a", "b"):
+        listing = json.loads((out / "preflight" / f"{repo}_workflow_list.json").read_text())
+        assert {w["path"] for w in listing} >= {".github/workflows/ci.yml", ".github/workflows/smoke.yml"}
+
+
+def test_orchestrate_all_green(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_GH_STATE", str(tmp_path / "fgh"))
+    monkeypatch.setenv("FAKE_GH_DURATION", "0.5")
+    monkeypatch.setattr(ow, "FIND_POLL_S", 0.2)
+    summary = {"runs": [], "preflight": []}
+    targets = [ow.RepoTarget("a", [ow.WorkflowTarget("a", file="ci.yml")])]
+    assert not asyncio.run(ow.orchestrate(_args(download_artifacts=False), targets, tmp_path / "out", summary))
+    assert [p["rc"] for p in summary["preflight"]] == [0]
+
+
+def test_cli_overall_rc(tmp_path):
+    cfg = tmp_path / "targets.yml"
+    cfg.write_text("targets:\n  - repo: a\n    workflows:\n      - file: ci.yml\n      - file: smoke.yml\n",
+                   encoding="utf-8")
+    env = {**os.environ, "FAKE_GH_STATE": str(tmp_path / "fgh"), "FAKE_GH_DURATION": "0.5",
+           "FAKE_GH_NOISE": "1", "FAKE_GH_FAIL": "smoke.yml"}
+    out = tmp_path / "out"
+    proc = subprocess.run(
+        [sys.executable, str(REPO_ROOT / "orchestrate_workflows.py"), "--config", str(cfg), "--owner", "o",
+         "--out", str(out), "--keep-going", "--poll-s", "0.2", "--gh", shlex.join(FAKE_GH)],
+        env=env, capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 1, proc.stdout + proc.stderr
+    summary = json.loads((out / "summary.json").read_text())
+    assert summary["overall_rc"] == 1
+    assert [r["run"]["view"]["conclusion"] for r in summary["runs"]] == ["success", "failure"]
+
+
+def _row(rid, created, wf_id=7, event="workflow_dispatch", status="in_progress", conclusion="", updated=None):
+    return {"databaseId": rid, "workflowDatabaseId": wf_id, "event": event, "status": status,
+            "conclusion": conclusion, "createdAt": created, "updatedAt": updated or created}
+
+
+def _dispatch(t0, wf_id=7, sel="ci.yml"):
+    return ow._Dispatch(sel=sel, wf_id=wf_id, t0=t0, deadline=t0 + 60, due=t0, fut=None)
+
+
+T0 = ow.parse_ts("2026-01-01T12:00:00Z")
+
+
+def test_match_oldest_dispatch_run_created_after_dispatch():
+    tracker = ow.RunTracker(gh=None, owner="o")
+    rows = [
+        _row(9, "2026-01-01T12:00:20Z", event="push"),  # newest, but not a dispatch
+        _row(8, "2026-01-01T12:00:10Z", wf_id=3),  # another workflow
+        _row(6, "2026-01-01T12:00:08Z"),
+        _row(5, "2026-01-01T12:00:03Z"),
+        _row(4, "2026-01-01T11:59:57Z"),  # 3 s before the dispatch: within the clock-skew tolerance
+        _row(2, "2026-01-01T11:50:00Z"),  # before the dispatch
+    ]
+    assert tracker._match("r", _dispatch(T0), rows)["databaseId"] == 4
+    assert tracker._match("r", _dispatch(T0 + 3), rows)["databaseId"] == 5
+    assert tracker._match("r", _dispatch(T0 + 30), rows) is None
+    # Without a workflow id (selector-filtered list), any dispatch run qualifies.
+    assert tracker._match("r", _dispatch(T0 + 14, wf_id=None), rows)["databaseId"] == 8
+
+
+def test_match_skips_claimed_runs():
+    tracker = ow.RunTracker(gh=None, owner="o")
+    rows = [_row(11, "2026-01-01T12:00:02Z"), _row(10, "2026-01-01T12:00:01Z")]
+    first, second = _dispatch(T0), _dispatch(T0 + 0.5)
+    tracker._claimed.add(("r", int(tracker._match("r", first, rows)["databaseId"])))
+    assert tracker._match("r", second, rows)["databaseId"] == 11
+    assert tracker._match("other", second, rows)["databaseId"] == 10  # claims are per repo
+    tracker._claimed.add(("r", 11))
+    assert tracker._match("r", _dispatch(T0), rows) is None
+
+
+class _CannedGh:
+    """Gh stand-in: answers `run list` / `run view` from fixed rows and records the calls."""
+
+    def __init__(self, rows, views):
+        self.rows, self.views, self.calls = rows, views, []
+
+    async def capture(self, args):
+        self.calls.append(args)
+        if args[:2] == ["run", "list"]:
+            return 0, json.dumps(self.rows)
+        if args[:2] == ["run", "view"] and int(args[2]) in self.views:
+            return 0, json.dumps(self.views[int(args[2])])
+        return 1, "not found"
+
+
+def test_poll_falls_back_to_run_view_for_runs_missing_from_list():
+    listed = _row(21, "2026-01-01T12:00:00Z", status="completed", conclusion="success", updated="2026-01-01T12:01:40Z")
+    old = _row(3, "2025-12-01T00:00:00Z", status="completed", conclusion="failure")
+    gh = _CannedGh([listed], {3: old})
+    tracker = ow.RunTracker(gh, "o")
+
+    async def poll():
+        loop = asyncio.get_running_loop()
+        futs = {rid: loop.create_future() for rid in (21, 3, 404)}
+        for rid, fut in futs.items():
+            tracker._runs.setdefault("r", {})[rid] = ow._Tracked(wf_id=7, deadline=0, due=0, fut=fut, created=T0)
+        await tracker._poll_repo("r")
+        return {rid: fut.result() for rid, fut in futs.items()}
+
+    views = asyncio.run(poll())
+    assert views[21] == listed and views[3] == old
+    assert views[404]["error"] == "timeout"  # view failed and the deadline passed
+    assert sorted(int(c[2]) for c in gh.calls if c[:2] == ["run", "view"]) == [3, 404]
+    assert sum(c[:2] == ["run", "list"] for c in gh.calls) == 1
+    assert tracker.typical("r", 7) == 100.0  # learned from the completed listed run
+
+
+def test_next_poll_delay_schedule():
+    # No history: a quarter of the run's age, within [min, max].
+    assert [ow.next_poll_delay(e, None, 10, 120) for e in (0, 20, 100, 400, 1000)] == [10, 10, 25, 100, 120]
+    # Typical duration 200 s: halve the distance to the expected end...
+    assert [ow.next_poll_delay(e, 200, 10, 120) for e in (0, 100, 160, 190)] == [100, 50, 20, 10]
+    # ...then back off once it is overdue.
+    assert [ow.next_poll_delay(e, 200, 10, 120) for e in (200, 280, 400, 2000)] == [10, 20, 50, 120]
+    # A run followed with this schedule converges on the typical end.
+    elapsed, polls = 0.0, []
+    while elapsed < 200:
+        elapsed += ow.next_poll_delay(elapsed, 200, 1, 120)
+        polls.append(elapsed)
+    assert polls == [100, 150, 175, 187.5, 193.75, 196.875, 198.4375, 199.4375, 200.4375]
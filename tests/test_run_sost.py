@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from conftest import SOST_ROOT
+
+
+@pytest.fixture
+def run_sost(monkeypatch):
+    monkeypatch.syspath_prepend(str(SOST_ROOT / "scripts"))
+    import run_sost
+
+    return run_sost
+
+
+def test_split_sweep_parses_input_once(run_sost, monkeypatch, tmp_path):
+    reads = []
+    for name in ("_read_input", "_iter_csv_series"):
+        real = getattr(run_sost, name)
+        monkeypatch.setattr(run_sost, name, lambda *a, _real=real, _name=name, **k: reads.append(_name) or _real(*a, **k))
+
+    src = SOST_ROOT / "test_data" / "band_imf_colombia_log_shift.csv"
+    assert run_sost.main(["--input", str(src), "--out", str(tmp_path), "--split-sweep", "2:10"]) == 0
+    assert reads == ["_read_input", "_iter_csv_series"]
+
+    run_dir = tmp_path / "run"
+    sweep = json.loads((run_dir / "dd" / "dd_sweep.json").read_text())
+    dd = json.loads((run_dir / "dd" / "dd_report.json").read_text())
+    assert sweep["splits"] == list(range(2, 10))
+    assert sweep["input"] == dd["input"]
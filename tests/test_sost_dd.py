@@ -0,0 +1,95 @@
+import json
+import math
+import random
+
+import pytest
+
+from sost.dd_coherence import compute_dd, compute_dd_stream, compute_dd_sweep
+
+
+def _series(seed, n):
+    rng = random.Random(seed)
+    scale = 10.0 ** rng.randint(-3, 9)
+    return [rng.gauss(1.0, 0.3) * scale for _ in range(n)]
+
+
+def test_numpy_backend_same_json_as_python():
+    np = pytest.importorskip("numpy")
+    for seed in range(300):
+        values = _series(seed, 50 + seed)
+        py = compute_dd(values, backend="python")
+        vec = compute_dd(np.asarray(values), backend="numpy")
+        assert json.dumps(vec, sort_keys=True) == json.dumps(py, sort_keys=True), seed
+
+
+def test_np_sum_reproduces_builtin_sum():
+    np = pytest.importorskip("numpy")
+    from sost.dd_coherence import _np_sum, _np_sum_columns
+
+    rng = random.Random(3)
+    for _ in range(500):
+        xs = [rng.choice([1e16, -1e16, 1.0, -1.0, 3.5, 1e-3]) * rng.random() for _ in range(rng.randint(1, 200))]
+        assert _np_sum(np.asarray(xs)) == sum(xs)
+    cols = [[rng.gauss(0, 1) * 10 ** rng.randint(-8, 16) for _ in range(200)] for _ in range(4)]
+    got = _np_sum_columns([np.asarray(c) for c in cols]).tolist()
+    assert got == [sum(row) for row in zip(*cols)]
+
+
+def _assert_stats_match(got, ref, scale):
+    for side in ("pre", "post"):
+        g, r = got[side]["stats"], ref[side]["stats"]
+        assert (g["n"], g["min"], g["max"]) == (r["n"], r["min"], r["max"]), side
+        for key in ("mean", "std"):
+            assert math.isclose(g[key], r[key], rel_tol=1e-9, abs_tol=1e-12 * scale), (side, key, g[key], r[key])
+
+
+def test_stream_matches_compute_dd():
+    for seed in range(40):
+        n = 1 + seed * 7
+        values = _series(seed, n)
+        scale = max(map(abs, values))
+        points = list(enumerate(values))
+        for split in (None, -3, 0, 1, 2, n // 3, n - 1, n, n + 5):
+            ref = compute_dd(values, split_index=split, backend="python")
+            if split is None:
+                split = n // 2  # the stream needs the midpoint from the caller (run_sost --stream)
+            got = compute_dd_stream(iter(points), split_index=split)
+            assert got["windowing"] == ref["windowing"], (seed, split)
+            _assert_stats_match(got, ref, scale)
+
+
+def test_stream_split_at_matches_compute_dd():
+    for seed in range(40):
+        n = 2 + seed * 5
+        values = _series(seed, n)
+        scale = max(map(abs, values))
+        ts = [f"2020-01-{i // 24 + 1:02d}T{i % 24:02d}" for i in range(n)]  # ISO, compared lexically
+        for cut in (0, 1, n // 2, n - 1, n, n + 3):
+            split_t = ts[cut] if cut < n else "2999"
+            # compute_dd's split: the first t >= split_t, clamped to [1, n - 1].
+            split = next((i for i, t in enumerate(ts) if t >= split_t), n)
+            ref = compute_dd(values, split_index=split, backend="python")
+            got = compute_dd_stream(zip(ts, values), split_at=lambda t: t >= split_t)
+            assert got["windowing"] == ref["windowing"], (seed, cut)
+            _assert_stats_match(got, ref, scale)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_sweep_columns_match_compute_dd(backend):
+    np = pytest.importorskip("numpy") if backend == "numpy" else None
+    for seed in range(25):
+        n = 2 + seed * 9
+        values = _series(seed, n)
+        scale = max(map(abs, values))
+        splits = sorted({1, 2, n // 3, n // 2, n - 2, n - 1} | set(range(1, n, 5)))
+        splits = [k for k in splits if 1 <= k <= n - 1]
+        sweep = compute_dd_sweep(np.asarray(values) if np is not None else values, splits=splits, backend=backend)
+        assert sweep["n"] == n and sweep["splits"] == splits
+        cols = sweep["columns"]
+        for i, k in enumerate(splits):
+            ref = compute_dd(values, split_index=k, backend="python")
+            row = {side: {"stats": {key: cols[f"{side}_{key}"][i] for key in ("n", "mean", "std", "min", "max")}}
+                   for side in ("pre", "post")}
+            _assert_stats_match(row, ref, scale)
+            for d in ref["differences"]:
+                assert math.isclose(cols[f"delta_{d['metric']}"][i], d["delta"], rel_tol=1e-9, abs_tol=1e-9 * scale)
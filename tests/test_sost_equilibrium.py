@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from sost.dd_coherence import compute_dd
+from sost.dd_restoration import METRICS, compute_ddr, compute_ddr_batch
+from sost.equilibrium import compute_e, compute_e_batch
+
+
+def _dd_table(count):
+    rng = random.Random(7)
+    reports = []
+    for i in range(count):
+        scale = 10.0 ** rng.randint(-3, 9)
+        values = [rng.gauss(1.0, 0.3) * scale + (0.4 * scale if j >= 40 else 0.0) for j in range(80)]
+        reports.append(compute_dd(values, backend="python"))
+    table = {}
+    for m, stat in zip(METRICS, ("mean", "std", "min", "max")):
+        table[f"pre_{m}"] = [r["pre"]["stats"][stat] for r in reports]
+        table[f"post_{m}"] = [r["post"]["stats"][stat] for r in reports]
+    return reports, table
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_e_batch_equals_scalar(backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    reports, table = _dd_table(300)
+    batch = compute_e_batch(compute_ddr_batch(table, METRICS, backend=backend), METRICS, backend=backend)
+    for i, dd in enumerate(reports):
+        e = compute_e(compute_ddr(dd))
+        assert batch["pressure"][i] == e["metrics"]["pressure"], i
+        assert batch["dispersion"][i] == e["metrics"]["dispersion"], i
+        assert batch["equilibrium_state"][i] == e["equilibrium_state"], i
@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
-import argparse, json, hashlib, datetime, shutil
+import argparse, json, datetime, sys
 from pathlib import Path
 
-def sha256_file(p: Path) -> str:
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from transobserver.hashing import HashCache, sha256_file
+from transobserver.objects import ObjectStore
+from transobserver.storage import STORAGE_MODES
 
 def write_json(p: Path, obj: dict) -> None:
     p.write_text(json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
@@ -25,23 +24,31 @@ def parse_sources(source_args):
         out.append((name.strip(), Path(path.strip())))
     return out
 
-def collect_once(out_root: Path, sources, notes: str = ""):
+def collect_once(out_root: Path, sources, notes: str = "", storage=None):
     cycle_id = utc_cycle_id()
     out_dir = out_root / cycle_id
     raw_dir = out_dir / "raw"
     raw_dir.mkdir(parents=True, exist_ok=True)
 
+    store = ObjectStore.for_fixtures(out_root)
+    # Kept next to the store so re-collecting an unchanged source skips its hash.
+    cache = HashCache.load(store.root)
     files = []
     for logical_name, src_path in sources:
         if not src_path.exists():
             raise SystemExit(f"Source file does not exist: {src_path}")
         dst = raw_dir / src_path.name
-        shutil.copy2(src_path, dst)
+        # Each distinct content is stored once under <out_root>/.objects; raw/
+        # shares its blocks (reflink/hardlink). The sha256 is the immutability
+        # reference: a raw/ file edited later fails verification.
+        blob = store.ingest(src_path, cache)
+        store.materialize(blob, dst, storage)
         files.append({
             "name": logical_name,
             "filename": f"raw/{dst.name}",
-            "sha256": sha256_file(dst),
+            "sha256": ObjectStore.digest(blob),
             "bytes": dst.stat().st_size,
+            "blob": blob,
         })
 
     fixture = {
@@ -58,6 +65,7 @@ def collect_once(out_root: Path, sources, notes: str = ""):
     fixture_sha = sha256_file(fixture_path)
     fixture["fixture_sha256"] = fixture_sha
     write_json(fixture_path, fixture)
+    cache.save()
 
     return out_dir
 
@@ -66,13 +74,15 @@ def main():
     ap.add_argument("--out", default="shared_fixtures", help="Output root directory for fixtures")
     ap.add_argument("--source", action="append", default=[], help="logical_name:/path/to/file (repeatable)")
     ap.add_argument("--notes", default="", help="Optional notes for fixture.json")
+    ap.add_argument("--storage", choices=STORAGE_MODES, default=None,
+                    help="raw/ placement: auto (default: reflink, else hardlink, else copy), reflink, hardlink, copy")
     args = ap.parse_args()
 
     out_root = Path(args.out)
     out_root.mkdir(parents=True, exist_ok=True)
     sources = parse_sources(args.source)
 
-    out_dir = collect_once(out_root, sources, notes=args.notes)
+    out_dir = collect_once(out_root, sources, notes=args.notes, storage=args.storage)
     print(str(out_dir))
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
-"""CSV -> TEST_MATRIX.md generator for SystemD.
+"""CSV -> TEST_MATRIX.md generator for SystemD, plus a structured test_matrix.json sidecar.
 
 Goal:
-- Produce a deterministic Markdown file with headings + list items so SystemD's DDR parser can ingest it.
+- Produce a deterministic Markdown file with headings + list items (human-readable artifact).
+- Write the same content as JSON next to it (test_matrix.json): section item
+  counts, column stats and the value column SystemD runs on. tools/systemd_run.py
+  reads the sidecar and feeds the raw CSV straight to run_ddr.py's numeric
+  series mode; the Markdown is not parsed back.
 - No external deps (stdlib only).
 
 Usage:
@@ -10,28 +14,291 @@ Usage:
 
 Notes:
 - This is descriptive only. It does not infer meaning.
+- Column stats cover the whole file, read once (the sha256 is computed on the
+  same read). The median is exact up to --exact-median-max numeric values per
+  column, then a P² estimate (bounded memory).
 - It samples the first N rows (default 50) for "ROWS_SAMPLE".
 """
 
 import argparse
 import csv
 import hashlib
-import statistics
+import io
+import json
+import math
+from array import array
+from bisect import bisect_right
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-def sha256_file(p: Path) -> str:
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-def is_number(s: str) -> bool:
-    try:
-        float(s)
+SIDECAR_NAME = "test_matrix.json"
+SIDECAR_VERSION = "0.2"
+
+# Value column preference for SystemD's series mode; time-like columns are never picked.
+VALUE_COLUMNS = ("value", "y", "Value", "OBS_VALUE")
+TIME_COLUMNS = ("t", "time", "Year", "TIME_PERIOD", "date")
+
+MISSING = frozenset({"na", "nan", "null", "none"})
+EXACT_MEDIAN_MAX = 200_000
+READ_CHUNK = 1024 * 1024
+# Numeric values buffered per column between stats updates.
+BLOCK = 4096
+
+
+class _HashingReader(io.RawIOBase):
+    """Raw reader that feeds every byte read to a hashlib object."""
+
+    def __init__(self, f, h):
+        self._f = f
+        self._h = h
+
+    def readable(self) -> bool:
         return True
-    except Exception:
-        return False
+
+    def readinto(self, b) -> int:
+        n = self._f.readinto(b)
+        if n:
+            self._h.update(memoryview(b)[:n])
+        return n
+
+
+class P2Median:
+    """P² estimator of a quantile (Jain & Chlamtac, 1985): five markers, O(1) memory."""
+
+    def __init__(self, p: float = 0.5):
+        self.p = p
+        self.n = 0
+        self.q: List[float] = []
+        self.pos = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.want = [1.0, 1.0 + 2 * p, 1.0 + 4 * p, 3.0 + 2 * p, 5.0]
+        self.step = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        self.extend((x,))
+
+    def extend(self, xs: Iterable[float]) -> None:
+        # Marker state in locals: this loop sees every value past the exact-median cap.
+        q, pos, want, step = self.q, self.pos, self.want, self.step
+        it = iter(xs)
+        while self.n < 5:
+            x = next(it, None)
+            if x is None:
+                return
+            q.append(x)
+            self.n += 1
+            if self.n == 5:
+                q.sort()
+        n = self.n
+        for x in it:
+            n += 1
+            if x < q[0]:
+                q[0] = x
+                k = 1
+            elif x >= q[4]:
+                q[4] = x
+                k = 4
+            else:
+                k = bisect_right(q, x, 1, 4)
+            for i in range(k, 5):
+                pos[i] += 1
+            for i in (1, 2, 3):
+                want[i] += step[i]
+                d = want[i] - pos[i]
+                if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                    s = 1 if d > 0 else -1
+                    qp = q[i] + s / (pos[i + 1] - pos[i - 1]) * (
+                        (pos[i] - pos[i - 1] + s) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                        + (pos[i + 1] - pos[i] - s) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1])
+                    )
+                    if not q[i - 1] < qp < q[i + 1]:
+                        qp = q[i] + s * (q[i + s] - q[i]) / (pos[i + s] - pos[i])
+                    q[i] = qp
+                    pos[i] += s
+        want[4] += step[4] * (n - self.n)
+        self.n = n
+
+    def value(self) -> Optional[float]:
+        if self.n == 0:
+            return None
+        if self.n < 5:
+            return _median_sorted(sorted(self.q))
+        return self.q[2]
+
+
+def _median_sorted(xs: List[float]) -> float:
+    n = len(xs)
+    m = n // 2
+    return xs[m] if n % 2 == 1 else (xs[m - 1] + xs[m]) / 2
+
+
+class NumericStats:
+    """count/min/max/mean and median of one column, bounded memory.
+
+    Values are buffered in blocks of BLOCK; each block updates min/max, a
+    compensated sum of per-block fsums, and the median state (exact values
+    up to exact_max, then P²).
+    """
+
+    __slots__ = ("count", "min", "max", "_sum", "_comp", "_block", "_values", "_p2", "_exact_max")
+
+    def __init__(self, exact_max: int = EXACT_MEDIAN_MAX):
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._sum = 0.0
+        self._comp = 0.0
+        self._block = array("d")
+        self._values: Optional[array] = array("d")
+        self._p2: Optional[P2Median] = None
+        self._exact_max = exact_max
+
+    def add(self, x: float) -> None:
+        self._block.append(x)
+        if len(self._block) >= BLOCK:
+            self.flush()
+
+    def flush(self) -> None:
+        block = self._block
+        if not block:
+            return
+        self.count += len(block)
+        self.min = min(self.min, min(block))
+        self.max = max(self.max, max(block))
+        try:
+            x = math.fsum(block)
+        except ValueError:  # inf + -inf
+            x = math.nan
+        # Neumaier summation over block sums
+        s = self._sum
+        t = s + x
+        if abs(s) >= abs(x):
+            self._comp += (s - t) + x
+        else:
+            self._comp += (x - t) + s
+        self._sum = t
+        if self._values is not None:
+            self._values.extend(block)
+            if len(self._values) > self._exact_max:
+                self._p2 = P2Median()
+                self._p2.extend(self._values)
+                self._values = None
+        else:
+            self._p2.extend(block)
+        self._block = array("d")
+
+    @property
+    def mean(self) -> float:
+        total = self._sum + self._comp
+        # inf/nan inputs poison the compensation term: fall back to the plain sum.
+        return (total if math.isfinite(total) else self._sum) / self.count
+
+    @property
+    def median_exact(self) -> bool:
+        return self._values is not None
+
+    @property
+    def median(self) -> Optional[float]:
+        if self._values is not None:
+            return _median_sorted(sorted(self._values)) if self._values else None
+        return self._p2.value()
+
+
+def profile_csv(
+    csv_path: Path,
+    delimiter: str = ",",
+    sample_rows: int = 50,
+    exact_median_max: int = EXACT_MEDIAN_MAX,
+) -> Tuple[List[str], str, int, List[List[str]], List[Dict[str, Any]]]:
+    """One pass over the file: (header, sha256, data rows, sample rows, per-column stats)."""
+    h = hashlib.sha256()
+    with csv_path.open("rb", buffering=0) as raw:
+        text = io.TextIOWrapper(io.BufferedReader(_HashingReader(raw, h), READ_CHUNK),
+                                encoding="utf-8", errors="ignore", newline="")
+        reader = csv.reader(text, delimiter=delimiter)
+        try:
+            header = next(reader)
+        except StopIteration:
+            raise SystemExit("Empty CSV")
+        header = [c.strip() for c in header]
+        ncols = len(header)
+        missing = [0] * ncols
+        present = [0] * ncols
+        nums = [NumericStats(exact_median_max) for _ in range(ncols)]
+        adds = [st.add for st in nums]
+        sample: List[List[str]] = []
+        nrows = 0
+        for row in reader:
+            nrows += 1
+            if nrows <= sample_rows:
+                sample.append(row)
+            width = len(row)
+            for ci in range(ncols):
+                v = row[ci].strip() if ci < width else ""
+                if not v or (len(v) <= 4 and v.lower() in MISSING):
+                    missing[ci] += 1
+                    continue
+                present[ci] += 1
+                try:
+                    x = float(v)
+                except ValueError:
+                    continue
+                adds[ci](x)
+        text.read()  # hash anything csv left unread
+    for st in nums:
+        st.flush()
+
+    col_stats = []
+    for ci, name in enumerate(header):
+        st = nums[ci]
+        stat: Dict[str, Any] = {
+            "col": name if name else f"col_{ci+1}",
+            "missing": missing[ci],
+            "present": present[ci],
+            "numeric_like": st.count,
+        }
+        # numeric summary if mostly numeric
+        if st.count and st.count >= max(3, int(0.6 * present[ci])):
+            stat["min"] = st.min
+            stat["max"] = st.max
+            stat["mean"] = st.mean
+            stat["median"] = st.median
+            stat["median_exact"] = st.median_exact
+        col_stats.append(stat)
+    return header, h.hexdigest(), nrows, sample, col_stats
+
+
+def pick_value_column(header: List[str], col_stats: List[Dict[str, Any]]) -> Optional[str]:
+    """Mostly-numeric column SystemD should compare pre/post on, or None."""
+    numeric = [st["col"] for st in col_stats if "min" in st and st["col"] in header]
+    for name in VALUE_COLUMNS:
+        if name in numeric:
+            return name
+    rest = [c for c in numeric if c not in TIME_COLUMNS]
+    return rest[-1] if rest else None
+
+def build_sidecar(csv_path: Path, csv_sha256: str, delimiter: str, sample_rows: int, rows: int,
+                  header: List[str], col_stats: List[Dict[str, Any]], sections: Dict[str, int],
+                  markdown_name: str) -> Dict[str, Any]:
+    value_col = pick_value_column(header, col_stats)
+    return {
+        "version": SIDECAR_VERSION,
+        "markdown": markdown_name,
+        "csv": {
+            "file": csv_path.name,
+            "sha256": csv_sha256,
+            "delimiter": delimiter,
+            "columns": header,
+            "rows": rows,
+        },
+        "sample_rows": sample_rows,
+        "sections": sections,
+        "column_stats": col_stats,
+        "systemd": {
+            "mode": "series" if value_col else None,
+            "value_col": value_col,
+            "split": "midpoint",
+        },
+    }
 
 def main():
     ap = argparse.ArgumentParser()
@@ -39,70 +306,29 @@ def main():
     ap.add_argument("--out", required=True, help="Output Markdown path (suggest: raw/TEST_MATRIX.md)")
     ap.add_argument("--delimiter", default=",", help="CSV delimiter (default: ,)")
     ap.add_argument("--sample-rows", type=int, default=50, help="How many rows to sample for ROWS_SAMPLE")
+    ap.add_argument("--exact-median-max", type=int, default=EXACT_MEDIAN_MAX,
+                    help="Numeric values per column kept for an exact median (beyond: P² estimate)")
+    ap.add_argument("--json-out", default=None, help=f"Sidecar path (default: {SIDECAR_NAME} next to --out)")
     args = ap.parse_args()
 
     csv_path = Path(args.csv)
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with csv_path.open("r", encoding="utf-8", errors="ignore", newline="") as f:
-        reader = csv.reader(f, delimiter=args.delimiter)
-        try:
-            header = next(reader)
-        except StopIteration:
-            raise SystemExit("Empty CSV")
-
-        header = [h.strip() for h in header]
-        rows = []
-        for i, r in enumerate(reader):
-            rows.append(r)
-            if i + 1 >= args.sample_rows:
-                break
-
+    header, csv_sha256, nrows, rows, col_stats = profile_csv(
+        csv_path, args.delimiter, args.sample_rows, args.exact_median_max)
     ncols = len(header)
     nrows_sample = len(rows)
 
-    # Basic per-column stats on sample
-    col_stats = []
-    for ci, name in enumerate(header):
-        values = []
-        missing = 0
-        numeric = 0
-        for r in rows:
-            v = r[ci].strip() if ci < len(r) else ""
-            if v == "" or v.lower() in {"na", "nan", "null", "none"}:
-                missing += 1
-                continue
-            values.append(v)
-            if is_number(v):
-                numeric += 1
-
-        stat = {
-            "col": name if name else f"col_{ci+1}",
-            "missing": missing,
-            "present": len(values),
-            "numeric_like": numeric,
-        }
-        # numeric summary if mostly numeric in sample
-        nums = [float(v) for v in values if is_number(v)]
-        if nums and (len(nums) >= max(3, int(0.6 * len(values)))):
-            try:
-                stat["min"] = min(nums)
-                stat["max"] = max(nums)
-                stat["mean"] = statistics.mean(nums)
-                stat["median"] = statistics.median(nums)
-            except Exception:
-                pass
-        col_stats.append(stat)
-
     # Deterministic markdown
     lines = []
     lines.append("# TEST_MATRIX — generated from CSV (TransObserver)")
     lines.append("")
     lines.append("## META")
     lines.append(f"- csv_file: {csv_path.name}")
-    lines.append(f"- csv_sha256: {sha256_file(csv_path)}")
+    lines.append(f"- csv_sha256: {csv_sha256}")
     lines.append(f"- delimiter: {args.delimiter}")
+    lines.append(f"- rows: {nrows}")
     lines.append(f"- sample_rows: {args.sample_rows}")
     lines.append(f"- sample_rows_read: {nrows_sample}")
     lines.append(f"- columns: {ncols}")
@@ -112,7 +338,7 @@ def main():
         nm = name if name else f"col_{ci}"
         lines.append(f"- {ci}. {nm}")
     lines.append("")
-    lines.append("## COLUMN_STATS_SAMPLE")
+    lines.append("## COLUMN_STATS")
     for st in col_stats:
         nm = st["col"]
         parts = [f"present={st.get('present',0)}", f"missing={st.get('missing',0)}", f"numeric_like={st.get('numeric_like',0)}"]
@@ -120,7 +346,7 @@ def main():
             parts.append(f"min={st['min']}")
             parts.append(f"max={st['max']}")
             parts.append(f"mean={st['mean']}")
-            parts.append(f"median={st['median']}")
+            parts.append(f"median={st['median']}" if st["median_exact"] else f"median~{st['median']}")
         lines.append(f"- {nm}: " + ", ".join(parts))
     lines.append("")
     lines.append("## ROWS_SAMPLE")
@@ -138,6 +364,14 @@ def main():
         lines.append(f"- row_{ri}: " + " | ".join(pairs))
 
     out_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    # List items per "##" section, as rendered above.
+    sections = {"META": 7, "COLUMNS": ncols, "COLUMN_STATS": len(col_stats), "ROWS_SAMPLE": nrows_sample}
+    json_path = Path(args.json_out) if args.json_out else out_path.with_name(SIDECAR_NAME)
+    sidecar = build_sidecar(csv_path, csv_sha256, args.delimiter, args.sample_rows, nrows, header, col_stats,
+                            sections, out_path.name)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    json_path.write_text(json.dumps(sidecar, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
     print(str(out_path))
 
 if __name__ == "__main__":
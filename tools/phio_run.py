@@ -1,29 +1,29 @@
 #!/usr/bin/env python3
 """PhiO wrapper for TransObserver cycles.
 
-Runs contract_probe against input fixture and writes:
-- phio_report.json (from contract_probe stdout if JSON else embedded)
+Runs contract_probe on the PhiO instrument and writes:
+- phio_baseline.json (contract_probe --out)
+- phio_report.json (the baseline, else contract_probe's stdout/stderr embedded)
 - phio_manifest.json (hashes + pointers)
 
-This wrapper avoids guessing a CLI. It directly calls the repo's contract_probe.py if present.
+This wrapper avoids guessing a CLI. It directly calls the repo's contract_probe.py if present,
+in this interpreter by default (TRANSOBSERVER_ISOLATION=subprocess spawns it instead).
 """
-import json, subprocess, sys, hashlib, datetime
+import json, sys, datetime
 from pathlib import Path
 
-def sha256_file(p: Path) -> str:
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from transobserver import adapters
+from transobserver.hashing import HashCache, sha256_file
 
 def write_json(p: Path, obj: dict) -> None:
     p.write_text(json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
 
 def main(input_fixture: str, out_dir: str):
-    module_root = Path(__file__).resolve().parents[2]
-    phio_repo = module_root / "engines" / "phio"
-    probe = phio_repo / "contract_probe.py"
+    entry = adapters.ENTRYPOINTS["phio_probe"]
+    phio_repo = entry.repo
+    probe = entry.script
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
 
@@ -31,14 +31,18 @@ def main(input_fixture: str, out_dir: str):
         raise SystemExit(f"PhiO contract_probe.py not found at {probe}")
 
     # Run probe
-    proc = subprocess.run([sys.executable, str(probe), str(Path(input_fixture))],
-                          capture_output=True, text=True, cwd=str(phio_repo))
+    baseline_path = out / "phio_baseline.json"
+    baseline_path.unlink(missing_ok=True)
+    proc = adapters.call("phio_probe", adapters.phio_probe_argv(baseline_path), cwd=phio_repo)
     ts = datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
     report_path = out / "phio_report.json"
-    # Try to parse stdout as JSON, otherwise store as structured envelope
+    # The baseline JSON is the report; otherwise store stdout/stderr as a structured envelope
     try:
-        data = json.loads(proc.stdout.strip()) if proc.stdout.strip() else None
+        if baseline_path.exists():
+            data = json.loads(baseline_path.read_text(encoding="utf-8"))
+        else:
+            data = json.loads(proc.stdout.strip()) if proc.stdout.strip() else None
         if not isinstance(data, dict):
             raise ValueError("stdout not dict")
         data.setdefault("timestamp_utc", ts)
@@ -56,14 +60,20 @@ def main(input_fixture: str, out_dir: str):
             "stderr": proc.stderr[-8000:] if proc.stderr else "",
         })
 
+    # out_dir is <cycle>/phio: share the cycle's hash cache
+    cache = HashCache.load(out.resolve().parent)
     manifest_path = out / "phio_manifest.json"
     manifest = {
         "run_id": "phio",
-        "input": {"path": str(Path(input_fixture)), "sha256": sha256_file(Path(input_fixture))},
+        "input": {"path": str(Path(input_fixture)), "sha256": sha256_file(Path(input_fixture), cache)},
         "artifacts": {"report": report_path.name},
-        "hashes": {report_path.name: sha256_file(report_path)},
+        "hashes": {report_path.name: sha256_file(report_path, cache)},
     }
+    if baseline_path.exists():
+        manifest["artifacts"]["baseline"] = baseline_path.name
+        manifest["hashes"][baseline_path.name] = sha256_file(baseline_path, cache)
     write_json(manifest_path, manifest)
+    cache.save()
 
     if proc.returncode != 0:
         sys.exit(proc.returncode)
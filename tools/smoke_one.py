@@ -13,14 +13,17 @@ But:
 from __future__ import annotations
 
 import argparse
-import hashlib
 import json
 import os
 import subprocess
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from transobserver.hashing import HashCache, sha256_many
 
 
 def gh_notice(msg: str) -> None:
@@ -50,14 +53,6 @@ def gh_error(msg: str, file: str = "") -> None:
         print(f"ERROR: {msg}", file=sys.stderr)
 
 
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
 def load_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
@@ -72,7 +67,9 @@ def pick_latest_cycle_id(fixtures_root: Path) -> str:
     return sorted(d.name for d in dirs)[-1]
 
 
-def verify_unified_manifest(cycle_dir: Path) -> Dict[str, Any]:
+def verify_unified_manifest(cycle_dir: Path, rehash: bool = False) -> Dict[str, Any]:
+    # Le cache de hash du cycle évite de relire les fichiers inchangés depuis
+    # build_unified_manifest (inode/taille/mtime/ctime identiques); rehash=True relit tout.
     manifest_path = cycle_dir / "unified_manifest.json"
     if not manifest_path.exists():
         gh_error("unified_manifest.json manquant", file=str(manifest_path))
@@ -86,7 +83,9 @@ def verify_unified_manifest(cycle_dir: Path) -> Dict[str, Any]:
 
     missing: List[str] = []
     bad_hash: List[str] = []
+    cache: Optional[HashCache] = None if rehash else HashCache.load(cycle_dir)
 
+    present: List[tuple] = []
     for a in artifacts:
         rel = a.get("path")
         exp = a.get("sha256")
@@ -98,12 +97,18 @@ def verify_unified_manifest(cycle_dir: Path) -> Dict[str, Any]:
         if not p.exists():
             missing.append(rel)
             continue
+        present.append((rel, exp))
 
-        got = sha256_file(p)
+    # Hash en parallèle (pool de threads), résultats dans l'ordre du manifest
+    digests = sha256_many([cycle_dir / rel for rel, _ in present], cache=cache)
+    for (rel, exp), got in zip(present, digests):
         if got != exp:
             bad_hash.append(rel)
             gh_error(f"Hash mismatch pour {rel}: got={got} expected={exp}", file=rel)
 
+    if cache is not None:
+        cache.save()
+
     if missing:
         for rel in missing:
             gh_error("Fichier artefact manquant (référencé dans manifest)", file=rel)
@@ -130,6 +135,7 @@ def main() -> None:
     ap.add_argument("--out-fixtures", default="shared_fixtures")
     ap.add_argument("--out-cycles", default="unified_cycles")
     ap.add_argument("--label", default="sample")
+    ap.add_argument("--rehash", action="store_true", help="Verify without the cycle hash cache (re-read every artifact)")
     args = ap.parse_args()
 
     in_path = Path(args.file)
@@ -200,7 +206,7 @@ def main() -> None:
     # 5) Verify unified manifest
     started = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
     gh_notice(f"verify: unified_manifest.json ({started})")
-    m = verify_unified_manifest(cycle_dir)
+    m = verify_unified_manifest(cycle_dir, rehash=args.rehash)
 
     # 6) Logs structurés
     artifacts_count = len(m.get("artifacts") or [])
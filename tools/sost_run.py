@@ -4,30 +4,31 @@
 Calls engines/sost/scripts/run_sost.py with:
   --input <fixture.json> --out <out_dir>
 
-Assumes SOST-Framework is self-contained.
+Assumes SOST-Framework is self-contained. The engine runs in this
+interpreter by default; set TRANSOBSERVER_ISOLATION=subprocess to spawn it.
 """
-import subprocess, sys
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from transobserver import adapters
+
 def main(input_fixture: str, out_dir: str):
-    module_root = Path(__file__).resolve().parents[2]
-    repo = module_root / "engines" / "sost"
-    runner = repo / "scripts" / "run_sost.py"
-    if not runner.exists():
-        raise SystemExit(f"SOST runner not found at {runner}")
+    entry = adapters.ENTRYPOINTS["sost"]
+    if not entry.script.exists():
+        raise SystemExit(f"SOST runner not found at {entry.script}")
 
-    out = Path(out_dir)
+    out = Path(out_dir).resolve()
     out.mkdir(parents=True, exist_ok=True)
 
-    cmd = [sys.executable, str(runner), "--input", str(Path(input_fixture)), "--out", str(out)]
-    # Use PYTHONPATH so sost/ package imports work
-    env = dict(os.environ)
-    env["PYTHONPATH"] = str(repo) + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
-    proc = subprocess.run(cmd, cwd=str(repo), env=env)
-    sys.exit(proc.returncode)
+    argv = ["--input", str(Path(input_fixture).resolve()), "--out", str(out)]
+    res = adapters.call("sost", argv, cwd=entry.repo)
+    sys.stdout.write(res.stdout)
+    sys.stderr.write(res.stderr)
+    sys.exit(res.returncode)
 
 if __name__ == "__main__":
-    import os
     if len(sys.argv) != 3:
         raise SystemExit("Usage: sost_run.py input/fixture.json out_dir")
     main(sys.argv[1], sys.argv[2])
@@ -1,13 +1,10 @@
 #!/usr/bin/env python3
-import argparse, json, hashlib
+import argparse, json, sys
 from pathlib import Path
 
-def sha256_file(p: Path) -> str:
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from transobserver.hashing import HashCache, sha256_file
 
 def write_json(p: Path, obj: dict) -> None:
     p.write_text(json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
@@ -30,6 +27,8 @@ def main():
         ("dd", out_dir / "dd_report.json"),
     ]
 
+    # out_dir is <cycle>/systemd: share the cycle's hash cache
+    cache = HashCache.load(out_dir.resolve().parent)
     artifacts = {}
     hashes = {}
 
@@ -44,19 +43,20 @@ def main():
                 artifacts["dd"] = rel
             else:
                 artifacts["extraction"] = rel
-            hashes[p.name] = sha256_file(p)
+            hashes[p.name] = sha256_file(p, cache)
 
     manifest = {
         "run_id": args.run_id,
         "input": {
             "path": str(input_path),
-            "sha256": sha256_file(input_path),
+            "sha256": sha256_file(input_path, cache),
         },
         "artifacts": artifacts,
         "hashes": hashes,
     }
 
     write_json(out_dir / "run_manifest.json", manifest)
+    cache.save()
     print(str(out_dir / "run_manifest.json"))
 
 if __name__ == "__main__":
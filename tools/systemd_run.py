@@ -9,18 +9,24 @@ Output:
 - extraction_report.json (minimal, also used when skipped)
 - run_manifest.json (hashes + pointers)
 
-This wrapper looks for a markdown TEST_MATRIX file in the fixture sources (raw/*.md).
-If none is found, it produces a "skipped" extraction_report and manifest, then exits 0.
+Input selection:
+- raw/test_matrix.json (written by tools/csv_to_test_matrix.py next to
+  TEST_MATRIX.md) whose CSV is present and unchanged (sha256) and names a
+  value column: the CSV is fed straight to run_ddr.py's numeric series mode
+  (--series-csv), without rendering/parsing Markdown;
+- otherwise a markdown TEST_MATRIX file in the fixture sources (raw/*.md).
+If neither is found, it produces a "skipped" extraction_report and manifest, then exits 0.
+
+run_ddr.main(argv) is called in this interpreter by default; set
+TRANSOBSERVER_ISOLATION=subprocess to spawn it instead.
 """
-import json, subprocess, sys, hashlib, datetime, os
+import json, sys, datetime
 from pathlib import Path
 
-def sha256_file(p: Path) -> str:
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from transobserver import adapters
+from transobserver.hashing import HashCache, sha256_file
 
 def write_json(p: Path, obj: dict) -> None:
     p.write_text(json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
@@ -53,18 +59,37 @@ def pick_test_matrix(fixture_path: Path) -> Path | None:
             return hits[0]
     return None
 
+def pick_series_sidecar(fixture_path: Path, cache: HashCache | None = None) -> tuple[Path, Path, dict] | None:
+    """(sidecar, csv, sidecar content) when raw/test_matrix.json can drive the series mode."""
+    sidecar = fixture_path.parent / "raw" / "test_matrix.json"
+    try:
+        tm = json.loads(sidecar.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    systemd = tm.get("systemd") or {}
+    csv_info = tm.get("csv") or {}
+    if systemd.get("mode") != "series" or not systemd.get("value_col") or not csv_info.get("file"):
+        return None
+    csv_path = sidecar.parent / csv_info["file"]
+    if not csv_path.exists() or sha256_file(csv_path, cache) != csv_info.get("sha256"):
+        return None
+    return sidecar, csv_path, tm
+
 def main(input_fixture: str, out_dir: str):
-    module_root = Path(__file__).resolve().parents[2]
-    repo = module_root / "engines" / "systemd-runner"
-    runner = repo / "00_core" / "scripts" / "run_ddr.py"
-    out = Path(out_dir)
+    entry = adapters.ENTRYPOINTS["ddr"]
+    runner = entry.script
+    out = Path(out_dir).resolve()
     out.mkdir(parents=True, exist_ok=True)
 
     ts = datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
     fixture_path = Path(input_fixture)
+    # out_dir is <cycle>/systemd: share the cycle's hash cache
+    cache = HashCache.load(out.parent)
 
-    test_matrix = pick_test_matrix(fixture_path)
+    series = pick_series_sidecar(fixture_path, cache)
+    test_matrix = pick_test_matrix(fixture_path) if series is None else None
     extraction_path = out / "extraction_report.json"
+    runs = False
 
     if not runner.exists():
         write_json(extraction_path, {
@@ -74,6 +99,32 @@ def main(input_fixture: str, out_dir: str):
             "reason": "missing_runner",
             "expected": str(runner),
         })
+    elif series is not None:
+        sidecar, csv_path, tm = series
+        argv = [
+            "--series-csv", str(csv_path.resolve()),
+            "--value-col", tm["systemd"]["value_col"],
+            "--delimiter", tm["csv"].get("delimiter") or ",",
+            "--out", str(out),
+            "--with-e",
+        ]
+        proc = adapters.call("ddr", argv, cwd=entry.repo)
+        runs = True
+        # run_ddr's extraction report (columns, split, counts) is embedded: the wrapper's replaces it.
+        ddr_extraction = out / "extraction_report.json"
+        series_extraction = json.loads(ddr_extraction.read_text(encoding="utf-8")) if ddr_extraction.exists() else None
+        write_json(extraction_path, {
+            "engine": "SystemD",
+            "timestamp_utc": ts,
+            "status": "ok" if proc.returncode == 0 else "failed",
+            "input_mode": "series_csv",
+            "test_matrix_json": str(sidecar),
+            "csv": str(csv_path),
+            "series": series_extraction,
+            "stdout_tail": (proc.stdout or "")[-8000:],
+            "stderr_tail": (proc.stderr or "")[-8000:],
+            "returncode": proc.returncode,
+        })
     elif test_matrix is None:
         write_json(extraction_path, {
             "engine": "SystemD",
@@ -84,17 +135,18 @@ def main(input_fixture: str, out_dir: str):
         })
     else:
         # Run the core DDR runner with E computation
-        cmd = [
-            sys.executable, str(runner),
-            "--test-matrix", str(test_matrix),
+        argv = [
+            "--test-matrix", str(test_matrix.resolve()),
             "--out", str(out),
             "--with-e",
         ]
-        proc = subprocess.run(cmd, cwd=str(repo), capture_output=True, text=True)
+        proc = adapters.call("ddr", argv, cwd=entry.repo)
+        runs = True
         write_json(extraction_path, {
             "engine": "SystemD",
             "timestamp_utc": ts,
             "status": "ok" if proc.returncode == 0 else "failed",
+            "input_mode": "markdown",
             "test_matrix": str(test_matrix),
             "stdout_tail": (proc.stdout or "")[-8000:],
             "stderr_tail": (proc.stderr or "")[-8000:],
@@ -109,18 +161,19 @@ def main(input_fixture: str, out_dir: str):
         p = out / name
         if p.exists():
             artifacts[name.replace("_report.json","").replace("ddr","ddr").replace("extraction","extraction")] = name
-            hashes[name] = sha256_file(p)
+            hashes[name] = sha256_file(p, cache)
 
     manifest = {
         "run_id": "systemd",
-        "input": {"path": str(fixture_path), "sha256": sha256_file(fixture_path) if fixture_path.exists() else None},
+        "input": {"path": str(fixture_path), "sha256": sha256_file(fixture_path, cache) if fixture_path.exists() else None},
         "artifacts": artifacts,
         "hashes": hashes,
     }
     write_json(out / "run_manifest.json", manifest)
+    cache.save()
 
-    # Exit non-zero only if runner existed and test matrix existed and run failed
-    if runner.exists() and test_matrix is not None:
+    # Exit non-zero only if runner existed and an input was found and run failed
+    if runner.exists() and runs:
         # read returncode from extraction report
         rc = json.loads(extraction_path.read_text(encoding="utf-8")).get("returncode", 0)
         if rc:
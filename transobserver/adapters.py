@@ -0,0 +1,202 @@
+"""Engine adapters: call engine entrypoints in-process or in a subprocess.
+
+Every engine CLI used by a cycle exposes `main(argv) -> int`:
+
+- SOST: engines/sost/scripts/run_sost.py (imports sost.dd_coherence,
+  sost.dd_restoration, sost.equilibrium)
+- SystemD: engines/systemd-runner/00_core/scripts/run_ddr.py
+- PhiO: engines/phio/contract_probe.py and the instrument
+  engines/phio/phi_otimes_o_instrument_v0_1.py
+
+`call()` runs one of them either by importing the module once and calling
+`main(argv)` ("inprocess", the default) or by spawning a fresh interpreter
+("subprocess", kept as the isolation fallback). Both return the same
+CompletedRun. In-process calls redirect stdout/stderr and change the working
+directory, which are process-wide: they are serialized by a lock, so run
+engines concurrently in separate processes rather than threads.
+"""
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Sequence
+
+MODULE_ROOT = Path(__file__).resolve().parents[1]
+ENGINES_ROOT = MODULE_ROOT / "engines"
+
+ISOLATION_ENV = "TRANSOBSERVER_ISOLATION"
+ISOLATION_MODES = ("inprocess", "subprocess")
+
+
+@dataclass(frozen=True)
+class EngineEntry:
+    repo: Path
+    script: Path
+    # Directories importable by the entrypoint (the subprocess path gets them via PYTHONPATH).
+    sys_path: tuple
+
+
+ENTRYPOINTS: Dict[str, EngineEntry] = {
+    "sost": EngineEntry(
+        repo=ENGINES_ROOT / "sost",
+        script=ENGINES_ROOT / "sost" / "scripts" / "run_sost.py",
+        sys_path=(ENGINES_ROOT / "sost",),
+    ),
+    "ddr": EngineEntry(
+        repo=ENGINES_ROOT / "systemd-runner",
+        script=ENGINES_ROOT / "systemd-runner" / "00_core" / "scripts" / "run_ddr.py",
+        sys_path=(ENGINES_ROOT / "systemd-runner" / "00_core" / "scripts",),
+    ),
+    "phio_probe": EngineEntry(
+        repo=ENGINES_ROOT / "phio",
+        script=ENGINES_ROOT / "phio" / "contract_probe.py",
+        sys_path=(ENGINES_ROOT / "phio",),
+    ),
+    "phio_instrument": EngineEntry(
+        repo=ENGINES_ROOT / "phio",
+        script=ENGINES_ROOT / "phio" / "phi_otimes_o_instrument_v0_1.py",
+        sys_path=(ENGINES_ROOT / "phio",),
+    ),
+}
+
+
+@dataclass
+class CompletedRun:
+    returncode: int
+    stdout: str
+    stderr: str
+    duration_s: float
+    isolation: str
+
+
+_modules: Dict[str, ModuleType] = {}
+_lock = threading.RLock()
+
+
+def default_isolation() -> str:
+    mode = os.environ.get(ISOLATION_ENV, "inprocess")
+    if mode not in ISOLATION_MODES:
+        raise ValueError(f"{ISOLATION_ENV} must be one of {ISOLATION_MODES}, got {mode!r}")
+    return mode
+
+
+def load_module(name: str) -> ModuleType:
+    """Import an engine entrypoint by path (once per process)."""
+    with _lock:
+        mod = _modules.get(name)
+        if mod is not None:
+            return mod
+        entry = ENTRYPOINTS[name]
+        for p in entry.sys_path:
+            if str(p) not in sys.path:
+                sys.path.insert(0, str(p))
+        spec = importlib.util.spec_from_file_location(f"transobserver_engine_{name}", str(entry.script))
+        if spec is None or spec.loader is None:
+            raise ImportError(f"cannot load {entry.script}")
+        mod = importlib.util.module_from_spec(spec)
+        # Registered before running: dataclasses and typing resolve the
+        # module's own globals through sys.modules[cls.__module__].
+        sys.modules[spec.name] = mod
+        try:
+            spec.loader.exec_module(mod)  # type: ignore[attr-defined]
+        except BaseException:
+            sys.modules.pop(spec.name, None)
+            raise
+        _modules[name] = mod
+        return mod
+
+
+def _entrypoint(mod: ModuleType):
+    # The PhiO root shim re-exports the instrument entrypoint as `_main`.
+    return getattr(mod, "main", None) or getattr(mod, "_main")
+
+
+def _exit_code(code: object) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _call_inprocess(name: str, argv: List[str], cwd: Optional[Path]) -> CompletedRun:
+    out, err = io.StringIO(), io.StringIO()
+    t0 = time.perf_counter()
+    with _lock:
+        prev_cwd = os.getcwd()
+        prev_argv = sys.argv
+        try:
+            if cwd is not None:
+                os.chdir(cwd)
+            sys.argv = [str(ENTRYPOINTS[name].script), *argv]
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    rc = _exit_code(_entrypoint(load_module(name))(argv))
+                except SystemExit as e:
+                    rc = _exit_code(e.code)
+                except Exception as e:  # engine crash: same contract as a non-zero exit
+                    print(f"{type(e).__name__}: {e}", file=sys.stderr)
+                    rc = 1
+        finally:
+            sys.argv = prev_argv
+            os.chdir(prev_cwd)
+    return CompletedRun(rc, out.getvalue(), err.getvalue(), time.perf_counter() - t0, "inprocess")
+
+
+def _call_subprocess(name: str, argv: List[str], cwd: Optional[Path], timeout_s: Optional[float]) -> CompletedRun:
+    entry = ENTRYPOINTS[name]
+    env = dict(os.environ)
+    extra = [str(p) for p in entry.sys_path]
+    if extra:
+        env["PYTHONPATH"] = os.pathsep.join(extra + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, str(entry.script), *argv],
+        cwd=str(cwd) if cwd else None, env=env, capture_output=True, text=True, timeout=timeout_s,
+    )
+    return CompletedRun(proc.returncode, proc.stdout or "", proc.stderr or "", time.perf_counter() - t0, "subprocess")
+
+
+def call(
+    name: str,
+    argv: Sequence[str],
+    cwd: Optional[Path] = None,
+    isolation: Optional[str] = None,
+    timeout_s: Optional[float] = None,
+) -> CompletedRun:
+    """Run engine entrypoint `name` with `argv`.
+
+    `timeout_s` only applies to the subprocess path; in-process calls are
+    bounded by the caller (the cycle runner's per-engine timeout).
+    """
+    if name not in ENTRYPOINTS:
+        raise KeyError(f"unknown engine entrypoint: {name}")
+    mode = isolation or default_isolation()
+    argv = [str(a) for a in argv]
+    if mode == "inprocess":
+        return _call_inprocess(name, argv, cwd)
+    if mode == "subprocess":
+        return _call_subprocess(name, argv, cwd, timeout_s)
+    raise ValueError(f"unknown isolation mode: {mode}")
+
+
+def phio_probe_argv(out_json: Path, isolation: Optional[str] = None) -> List[str]:
+    """contract_probe arguments: probe the bundled instrument, write its baseline to `out_json`.
+
+    In-process runs also probe the instrument's --help in-process (its
+    main(["--help"])) instead of spawning an interpreter for it.
+    """
+    argv = ["--instrument", str(ENTRYPOINTS["phio_instrument"].script), "--out", str(Path(out_json).resolve())]
+    if (isolation or default_isolation()) == "inprocess":
+        argv.append("--help-in-process")
+    return argv
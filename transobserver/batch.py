@@ -0,0 +1,135 @@
+"""Batch scheduler: every pending shared_fixtures/<cycle_id>/ in one invocation.
+
+(cycle, engine) jobs are flattened onto a single process pool sized to the
+machine, so a slow engine of one cycle never blocks the others. A cycle's
+unified_manifest.json is written as soon as its last engine finishes.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import runner
+from .manifest import manifest_problems
+
+SUMMARY_NAME = "batch_summary.json"
+
+
+def discover_cycles(fixtures_root: Path) -> List[Path]:
+    """Fixture directories (those holding a fixture.json), sorted by cycle_id."""
+    root = Path(fixtures_root)
+    if not root.exists():
+        return []
+    return sorted(p for p in root.iterdir() if p.is_dir() and (p / "fixture.json").exists())
+
+
+def pending_cycles(fixtures: Sequence[Path], out_root: Path, force: bool = False) -> List[Path]:
+    """Fixtures whose unified cycle is missing or whose manifest does not verify."""
+    if force:
+        return list(fixtures)
+    return [fx for fx in fixtures if manifest_problems(Path(out_root) / fx.name)]
+
+
+def percentile(xs_sorted: Sequence[float], q: float) -> Optional[float]:
+    # Linear interpolation between closest ranks (same rule as SystemD p90/p99).
+    n = len(xs_sorted)
+    if n == 0:
+        return None
+    pos = (n - 1) * q
+    lo = int(math.floor(pos))
+    hi = int(math.ceil(pos))
+    return float(xs_sorted[lo] + (pos - lo) * (xs_sorted[hi] - xs_sorted[lo]))
+
+
+def latency_stats(durations: Sequence[float]) -> Dict[str, Any]:
+    xs = sorted(durations)
+    return {
+        "n": len(xs),
+        "p50_s": percentile(xs, 0.50),
+        "p90_s": percentile(xs, 0.90),
+        "p99_s": percentile(xs, 0.99),
+        "max_s": xs[-1] if xs else None,
+    }
+
+
+def run_batch(
+    fixtures_root: Path,
+    out_root: Path,
+    mode: str = "real",
+    max_workers: Optional[int] = None,
+    timeout_s: float = runner.DEFAULT_TIMEOUT_S,
+    timeouts: Optional[Dict[str, float]] = None,
+    force: bool = False,
+    isolation: Optional[str] = None,
+    storage: Optional[str] = None,
+) -> Dict[str, Any]:
+    engines = runner.engines_for_mode(mode)
+    timeouts = timeouts or {}
+    out_root = Path(out_root)
+    out_root.mkdir(parents=True, exist_ok=True)
+
+    fixtures = discover_cycles(Path(fixtures_root))
+    todo = pending_cycles(fixtures, out_root, force=force)
+    workers = max(1, max_workers or os.cpu_count() or 1)
+
+    t0 = time.perf_counter()
+    started_utc = runner.utc_iso(time.time())
+    cycles: Dict[str, Dict[str, Any]] = {}
+    records: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+        for fx in todo:
+            cycle_dir = runner.prepare_cycle(fx, out_root, storage)
+            records[fx.name] = {}
+            cycles[fx.name] = {"cycle_dir": str(cycle_dir), "t0": time.perf_counter()}
+            for spec in engines:
+                fut = pool.submit(runner.run_engine, spec, cycle_dir, timeouts.get(spec.name, timeout_s), isolation)
+                in_flight[fut] = (fx.name, spec.name)
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                cycle_id, engine = in_flight.pop(fut)
+                records[cycle_id][engine] = fut.result()
+                if len(records[cycle_id]) < len(engines):
+                    continue
+                info = cycles[cycle_id]
+                wall = time.perf_counter() - info.pop("t0")
+                runner.finalize_cycle(Path(info["cycle_dir"]), mode, records[cycle_id], {
+                    "mode": mode,
+                    "batch_workers": workers,
+                    "wall_s": round(wall, 6),
+                })
+                info["wall_s"] = round(wall, 6)
+                info["engines"] = {k: v["status"] for k, v in sorted(records[cycle_id].items())}
+
+    wall = time.perf_counter() - t0
+    by_engine: Dict[str, List[float]] = {spec.name: [] for spec in engines}
+    for recs in records.values():
+        for name, rec in recs.items():
+            by_engine[name].append(rec["duration_s"])
+
+    summary: Dict[str, Any] = {
+        "version": "1.0",
+        "mode": mode,
+        "started_utc": started_utc,
+        "ended_utc": runner.utc_iso(time.time()),
+        "workers": workers,
+        "fixtures_root": str(fixtures_root),
+        "out_root": str(out_root),
+        "cycles_discovered": len(fixtures),
+        "cycles_skipped": len(fixtures) - len(todo),
+        "cycles_run": len(todo),
+        "wall_s": round(wall, 6),
+        "throughput_cycles_per_min": round(len(todo) / wall * 60.0, 3) if todo and wall > 0 else 0.0,
+        "engine_latency": {name: latency_stats(ds) for name, ds in by_engine.items()},
+        "cycles": dict(sorted(cycles.items())),
+    }
+    (out_root / SUMMARY_NAME).write_text(json.dumps(summary, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return summary
@@ -0,0 +1,137 @@
+"""Micro-benchmarks for the cycle harness (stdlib only, wall-clock timings)."""
+from __future__ import annotations
+
+import hashlib
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import adapters
+from .hashing import sha256_many
+from .storage import place_tree
+
+BANDS_DIR = adapters.MODULE_ROOT / "fixtures" / "prepared_bands"
+TEST_DATA_DIR = adapters.MODULE_ROOT / "test_data"
+DDR_EXAMPLE = adapters.ENGINES_ROOT / "systemd-runner" / "00_core" / "examples" / "TEST_MATRIX.example.md"
+
+
+def _summarize(durations: List[float]) -> Dict[str, Any]:
+    return {
+        "calls": len(durations),
+        "mean_ms": round(statistics.mean(durations) * 1000.0, 3) if durations else None,
+        "min_ms": round(min(durations) * 1000.0, 3) if durations else None,
+        "total_s": round(sum(durations), 6),
+    }
+
+
+def bench_isolation(bands_dir: Path = BANDS_DIR, repeat: int = 3) -> Dict[str, Any]:
+    """Time SOST (one call per band fixture), SystemD DD-R and the PhiO contract
+    probe in both isolation modes.
+
+    The first in-process call of each engine pays the import; it is included
+    in the timings, as it would be in a real wrapper invocation.
+    """
+    bands = sorted(Path(bands_dir).glob("band_*.csv"))
+    if not bands:
+        raise FileNotFoundError(f"no band_*.csv under {bands_dir}")
+
+    report: Dict[str, Any] = {"bands": len(bands), "repeat": repeat, "engines": {}}
+    with tempfile.TemporaryDirectory(prefix="transobserver_bench_") as tmp:
+        out = Path(tmp)
+        # engine -> isolation mode -> [(argv, cwd)]; the PhiO arguments depend on the mode.
+        jobs = {
+            "sost": lambda mode: [(["--input", str(b.resolve()), "--out", str(out / "sost"), "--run-id", b.stem],
+                                   adapters.ENTRYPOINTS["sost"].repo) for b in bands],
+            "ddr": lambda mode: [(["--test-matrix", str(DDR_EXAMPLE), "--out", str(out / "ddr"), "--with-e"],
+                                  adapters.ENTRYPOINTS["ddr"].repo)],
+            "phio_probe": lambda mode: [(adapters.phio_probe_argv(out / "phio" / "phio_baseline.json", mode),
+                                         adapters.ENTRYPOINTS["phio_probe"].repo)],
+        }
+        for engine, calls in jobs.items():
+            per_mode: Dict[str, Any] = {}
+            for mode in adapters.ISOLATION_MODES:
+                durations: List[float] = []
+                for _ in range(repeat):
+                    for argv, cwd in calls(mode):
+                        res = adapters.call(engine, argv, cwd=cwd, isolation=mode)
+                        if res.returncode != 0:
+                            raise RuntimeError(f"{engine} ({mode}) failed: {res.stderr[-400:]}")
+                        durations.append(res.duration_s)
+                per_mode[mode] = _summarize(durations)
+            sub = per_mode["subprocess"]["mean_ms"]
+            inp = per_mode["inprocess"]["mean_ms"]
+            per_mode["speedup"] = round(sub / inp, 2) if inp else None
+            report["engines"][engine] = per_mode
+    return report
+
+
+def _sha256_chunked(p: Path) -> str:
+    # Historical implementation (1 MiB Python-level reads), kept as the baseline.
+    h = hashlib.sha256()
+    with p.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def bench_hashing(data_dir: Path = TEST_DATA_DIR, repeat: int = 3, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """MB/s over every file of `data_dir`: chunked loop vs sha256_many (1 thread, pooled).
+
+    Best of `repeat` runs; files are read once beforehand so all variants see
+    a warm page cache.
+    """
+    files = sorted(p for p in Path(data_dir).rglob("*") if p.is_file())
+    if not files:
+        raise FileNotFoundError(f"no files under {data_dir}")
+    total = sum(p.stat().st_size for p in files)
+    expected = [_sha256_chunked(p) for p in files]
+
+    variants = {
+        "chunked_single": lambda: [_sha256_chunked(p) for p in files],
+        "sha256_many_single": lambda: sha256_many(files, max_workers=1),
+        "sha256_many_pooled": lambda: sha256_many(files, max_workers=max_workers),
+    }
+    report: Dict[str, Any] = {
+        "files": len(files), "bytes": total, "repeat": repeat, "cpu_count": os.cpu_count(), "variants": {},
+    }
+    for name, fn in variants.items():
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            got = fn()
+            best = min(best, time.perf_counter() - t0)
+            if got != expected:
+                raise RuntimeError(f"{name}: digests differ from the baseline")
+        report["variants"][name] = {
+            "best_s": round(best, 6),
+            "mb_per_s": round(total / 1e6 / best, 1) if best > 0 else None,
+        }
+    return report
+
+
+def bench_storage(data_dir: Path = TEST_DATA_DIR, repeat: int = 3) -> Dict[str, Any]:
+    """Time mirroring `data_dir` (as prepare_cycle does) with each storage mode.
+
+    The scratch tree is created next to `data_dir` so hardlinks and reflinks
+    stay on the same filesystem. `methods` shows what each mode fell back to.
+    """
+    data_dir = Path(data_dir)
+    files = [p for p in data_dir.rglob("*") if p.is_file()]
+    if not files:
+        raise FileNotFoundError(f"no files under {data_dir}")
+    report: Dict[str, Any] = {
+        "files": len(files), "bytes": sum(p.stat().st_size for p in files), "repeat": repeat, "modes": {},
+    }
+    with tempfile.TemporaryDirectory(prefix=".transobserver_bench_", dir=str(data_dir.parent)) as tmp:
+        for mode in ("copy", "hardlink", "reflink", "auto"):
+            best = float("inf")
+            methods: Dict[str, int] = {}
+            for i in range(repeat):
+                t0 = time.perf_counter()
+                methods = place_tree(data_dir, Path(tmp) / f"{mode}_{i}", mode)
+                best = min(best, time.perf_counter() - t0)
+            report["modes"][mode] = {"best_s": round(best, 6), "methods": methods}
+    return report
@@ -0,0 +1,317 @@
+"""Cycle catalog: finished unified cycles indexed in SQLite.
+
+Implements the `cycles` table of schema/cycles.sql: one row per
+unified_cycles/<cycle_id>/, filled from its unified_manifest.json and the
+engine reports (phio/phio_report.json, systemd/{ddr,e}_report.json and
+SOST's sost/<run_id>/{dd,ddr,e}/*_report.json, located through its
+run_manifest.json). Beside the JSON columns, the verdicts used
+for filtering (SystemD DDR and E, SOST equilibrium state) and each engine's
+status are stored as plain indexed columns, so queries such as "SystemD
+DDR = ILLUSION since 2026-09-01" never parse JSON.
+
+The database runs in WAL mode (readers are not blocked while a batch
+ingests); rows are upserted in batches, one transaction each. A cycle whose
+manifest has the same size and mtime as when it was ingested is skipped.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .manifest import MANIFEST_NAME
+
+CATALOG_NAME = "catalog.sqlite"
+BATCH_SIZE = 500
+
+# Keep in sync with schema/cycles.sql.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+  cycle_id TEXT PRIMARY KEY,
+  fixture_sha256 TEXT NOT NULL,
+  created_utc TEXT NOT NULL,
+  unified_manifest_path TEXT NOT NULL,
+  phio_coherence_score REAL,
+  dd_json TEXT,
+  ddr_json TEXT,
+  e_json TEXT,
+  mode TEXT,
+  systemd_ddr TEXT,
+  systemd_e TEXT,
+  sost_e_state TEXT,
+  phio_status TEXT,
+  systemd_status TEXT,
+  sost_status TEXT,
+  manifest_stat TEXT,
+  ingested_utc TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cycles_fixture ON cycles (fixture_sha256);
+CREATE INDEX IF NOT EXISTS idx_cycles_created ON cycles (created_utc);
+CREATE INDEX IF NOT EXISTS idx_cycles_systemd_ddr ON cycles (systemd_ddr, created_utc);
+CREATE INDEX IF NOT EXISTS idx_cycles_systemd_e ON cycles (systemd_e, created_utc);
+CREATE INDEX IF NOT EXISTS idx_cycles_sost_e ON cycles (sost_e_state, created_utc);
+"""
+
+COLUMNS = (
+    "cycle_id", "fixture_sha256", "created_utc", "unified_manifest_path", "phio_coherence_score",
+    "dd_json", "ddr_json", "e_json", "mode", "systemd_ddr", "systemd_e", "sost_e_state",
+    "phio_status", "systemd_status", "sost_status", "manifest_stat", "ingested_utc",
+)
+# Columns returned by query() unless the JSON reports are asked for.
+SUMMARY_COLUMNS = (
+    "cycle_id", "created_utc", "fixture_sha256", "mode", "systemd_ddr", "systemd_e", "sost_e_state",
+    "phio_coherence_score", "phio_status", "systemd_status", "sost_status", "unified_manifest_path",
+)
+
+# SystemD reports per kind, relative to the cycle directory.
+SYSTEMD_REPORTS = {"ddr": "systemd/ddr_report.json", "e": "systemd/e_report.json"}
+# run_sost.py writes <out>/<run_id>/ (run id "run" unless --run-id); the
+# reports are listed under "artifacts" in that directory's run_manifest.json.
+SOST_DIR = "sost"
+SOST_RUN_ID = "run"
+SOST_REPORTS = {"dd": "dd/dd_report.json", "ddr": "ddr/ddr_report.json", "e": "e/e_report.json"}
+PHIO_REPORT = "phio/phio_report.json"
+
+
+def open_catalog(path: Path) -> sqlite3.Connection:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(str(path))
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript(SCHEMA)
+    return con
+
+
+def _load(path: Path) -> Optional[Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _dumps(obj: Any) -> Optional[str]:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")) if obj else None
+
+
+def _manifest_stat(st: os.stat_result) -> str:
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _created_utc(manifest: Dict[str, Any], st: os.stat_result) -> str:
+    # Earliest engine start; manifests without engine records fall back to the manifest mtime.
+    starts = [e.get("started_utc") for e in (manifest.get("engines") or {}).values() if isinstance(e, dict)]
+    starts = [s for s in starts if isinstance(s, str)]
+    if starts:
+        return min(starts)
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(st.st_mtime))
+
+
+def _sost_run_dir(root: Path) -> Optional[Path]:
+    """SOST run directory of a cycle: sost/run/, else the first sost/<run_id>/ with a run manifest."""
+    sost = root / SOST_DIR
+    default = sost / SOST_RUN_ID
+    if (default / "run_manifest.json").is_file():
+        return default
+    found = sorted(sost.glob("*/run_manifest.json"))
+    if found:
+        return found[0].parent
+    return default if default.is_dir() else None
+
+
+def _sost_reports(root: Path) -> Dict[str, Any]:
+    run_dir = _sost_run_dir(root)
+    if run_dir is None:
+        return {}
+    manifest = _load(run_dir / "run_manifest.json")
+    artifacts = manifest.get("artifacts") if isinstance(manifest, dict) else None
+    paths = {kind: (artifacts or {}).get(kind) or rel for kind, rel in SOST_REPORTS.items()}
+    return {kind: r for kind, r in ((k, _load(run_dir / rel)) for k, rel in paths.items()) if r is not None}
+
+
+def cycle_row(cycle_dir: Path, st: Optional[os.stat_result] = None) -> Optional[Dict[str, Any]]:
+    """Catalog row of one cycle directory, or None without a readable unified manifest."""
+    root = Path(cycle_dir)
+    mpath = root / MANIFEST_NAME
+    manifest = _load(mpath)
+    if not isinstance(manifest, dict):
+        return None
+    st = st or mpath.stat()
+
+    reports: Dict[str, Dict[str, Any]] = {kind: {} for kind in SOST_REPORTS}
+    for kind, rel in SYSTEMD_REPORTS.items():
+        r = _load(root / rel)
+        if r is not None:
+            reports[kind]["systemd"] = r
+    for kind, r in _sost_reports(root).items():
+        reports[kind]["sost"] = r
+    phio = _load(root / PHIO_REPORT)
+    phio = phio if isinstance(phio, dict) else {}
+    sd_ddr = reports["ddr"].get("systemd") or {}
+    sd_e = reports["e"].get("systemd") or {}
+    sost_e = reports["e"].get("sost") or {}
+    engines = manifest.get("engines") or {}
+    score = phio.get("coherence_score")
+
+    return {
+        "cycle_id": root.name,
+        "fixture_sha256": (manifest.get("input") or {}).get("fixture_sha256") or "",
+        "created_utc": _created_utc(manifest, st),
+        "unified_manifest_path": str(mpath),
+        "phio_coherence_score": float(score) if isinstance(score, (int, float)) else None,
+        "dd_json": _dumps(reports["dd"]),
+        "ddr_json": _dumps(reports["ddr"]),
+        "e_json": _dumps(reports["e"]),
+        "mode": (manifest.get("timing") or {}).get("mode"),
+        "systemd_ddr": sd_ddr.get("DDR"),
+        "systemd_e": sd_e.get("E"),
+        "sost_e_state": sost_e.get("equilibrium_state"),
+        "phio_status": (engines.get("phio") or {}).get("status"),
+        "systemd_status": (engines.get("systemd") or {}).get("status"),
+        "sost_status": (engines.get("sost") or {}).get("status"),
+        "manifest_stat": _manifest_stat(st),
+        "ingested_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def discover(out_root: Path) -> Iterator[Tuple[Path, os.stat_result]]:
+    """(cycle_dir, manifest stat) for every <out_root>/<cycle_id>/ holding a unified manifest."""
+    try:
+        entries = sorted(os.scandir(out_root), key=lambda e: e.name)
+    except FileNotFoundError:
+        return
+    for e in entries:
+        if not e.is_dir():
+            continue
+        try:
+            st = os.stat(os.path.join(e.path, MANIFEST_NAME))
+        except FileNotFoundError:
+            continue
+        yield Path(e.path), st
+
+
+def ingest(
+    con: sqlite3.Connection,
+    cycles: Iterable[Tuple[Path, Optional[os.stat_result]]],
+    force: bool = False,
+    batch_size: int = BATCH_SIZE,
+) -> Dict[str, int]:
+    """Upsert cycles into the catalog; returns counts (scanned, ingested, unchanged, unreadable)."""
+    known = {} if force else dict(con.execute("SELECT unified_manifest_path, manifest_stat FROM cycles"))
+    sql = (f"INSERT OR REPLACE INTO cycles ({', '.join(COLUMNS)}) "
+           f"VALUES ({', '.join('?' for _ in COLUMNS)})")
+    counts = {"scanned": 0, "ingested": 0, "unchanged": 0, "unreadable": 0}
+    batch: List[Tuple[Any, ...]] = []
+
+    def flush() -> None:
+        with con:
+            con.executemany(sql, batch)
+        counts["ingested"] += len(batch)
+        batch.clear()
+
+    for cycle_dir, st in cycles:
+        counts["scanned"] += 1
+        st = st or os.stat(Path(cycle_dir) / MANIFEST_NAME)
+        if known.get(str(Path(cycle_dir) / MANIFEST_NAME)) == _manifest_stat(st):
+            counts["unchanged"] += 1
+            continue
+        row = cycle_row(cycle_dir, st)
+        if row is None:
+            counts["unreadable"] += 1
+            continue
+        batch.append(tuple(row[c] for c in COLUMNS))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return counts
+
+
+def ingest_root(out_root: Path, catalog_path: Optional[Path] = None, force: bool = False) -> Dict[str, Any]:
+    out_root = Path(out_root).resolve()
+    path = Path(catalog_path) if catalog_path else out_root / CATALOG_NAME
+    con = open_catalog(path)
+    try:
+        t0 = time.perf_counter()
+        counts = ingest(con, discover(out_root), force=force)
+        total = con.execute("SELECT COUNT(*) FROM cycles").fetchone()[0]
+    finally:
+        con.close()
+    return {"catalog": str(path), **counts, "cycles_in_catalog": total,
+            "wall_s": round(time.perf_counter() - t0, 6)}
+
+
+def _where(
+    ddr: Optional[str] = None,
+    systemd_e: Optional[str] = None,
+    sost_e: Optional[str] = None,
+    fixture: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+    where: List[str] = []
+    params: List[Any] = []
+    for col, val in (("systemd_ddr", ddr), ("systemd_e", systemd_e), ("sost_e_state", sost_e)):
+        if val is not None:
+            where.append(f"{col} = ?")
+            params.append(val)
+    if fixture:
+        # Prefix as a range, so idx_cycles_fixture applies.
+        where.append("fixture_sha256 >= ? AND fixture_sha256 < ?")
+        params += [fixture, fixture + "\uffff"]
+    if since:
+        where.append("created_utc >= ?")
+        params.append(since)
+    if until:
+        where.append("created_utc < ?")
+        params.append(until)
+    return (" WHERE " + " AND ".join(where) if where else ""), params
+
+
+def query(
+    con: sqlite3.Connection,
+    ddr: Optional[str] = None,
+    systemd_e: Optional[str] = None,
+    sost_e: Optional[str] = None,
+    fixture: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: Optional[int] = None,
+    with_json: bool = False,
+) -> List[Dict[str, Any]]:
+    """Cycles matching every given filter, newest first.
+
+    `fixture` matches a sha256 prefix; `since`/`until` compare against
+    created_utc (ISO 8601, so "2026-09" or "2026-09-01" work as bounds,
+    `until` being exclusive).
+    """
+    where, params = _where(ddr, systemd_e, sost_e, fixture, since, until)
+    cols: Sequence[str] = COLUMNS if with_json else SUMMARY_COLUMNS
+    sql = f"SELECT {', '.join(cols)} FROM cycles{where}"
+    sql += " ORDER BY created_utc DESC, cycle_id DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    rows = [dict(zip(cols, r)) for r in con.execute(sql, params)]
+    if with_json:
+        for r in rows:
+            for c in ("dd_json", "ddr_json", "e_json"):
+                r[c] = json.loads(r[c]) if r[c] else None
+    return rows
+
+
+def count(
+    con: sqlite3.Connection,
+    ddr: Optional[str] = None,
+    systemd_e: Optional[str] = None,
+    sost_e: Optional[str] = None,
+    fixture: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> int:
+    """Number of cycles matching the query() filters, counted by SQLite."""
+    where, params = _where(ddr, systemd_e, sost_e, fixture, since, until)
+    return con.execute(f"SELECT COUNT(*) FROM cycles{where}", params).fetchone()[0]
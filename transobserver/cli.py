@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import List, Optional
+
+from . import adapters, batch, bench, catalog, objects, runner, storage
+
+
+def _catalog_cycles(db: Path, cycle_dirs: List[Path]) -> None:
+    con = catalog.open_catalog(db)
+    try:
+        catalog.ingest(con, ((d, None) for d in cycle_dirs))
+    finally:
+        con.close()
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    cycle_dir = runner.run_cycle(
+        Path(args.fixture_dir),
+        Path(args.out_root),
+        mode=args.mode,
+        max_workers=args.jobs,
+        timeout_s=args.timeout,
+        timeouts=runner.parse_engine_timeouts(args.engine_timeout),
+        isolation=args.isolation,
+        storage=args.storage,
+    )
+    if args.catalog:
+        _catalog_cycles(Path(args.catalog), [cycle_dir])
+    print(f"OK: {cycle_dir}")
+    return 0
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    summary = batch.run_batch(
+        Path(args.fixtures_root),
+        Path(args.out_root),
+        mode=args.mode,
+        max_workers=args.jobs,
+        timeout_s=args.timeout,
+        timeouts=runner.parse_engine_timeouts(args.engine_timeout),
+        force=args.force,
+        isolation=args.isolation,
+        storage=args.storage,
+    )
+    print(
+        f"cycles: run={summary['cycles_run']} skipped={summary['cycles_skipped']} "
+        f"throughput={summary['throughput_cycles_per_min']} cycles/min"
+    )
+    if args.catalog:
+        _catalog_cycles(Path(args.catalog), [Path(c["cycle_dir"]) for c in summary["cycles"].values()])
+    print(f"OK: {Path(args.out_root) / batch.SUMMARY_NAME}")
+    return 0
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    if args.target == "isolation":
+        report = bench.bench_isolation(Path(args.bands_dir), repeat=args.repeat)
+    elif args.target == "storage":
+        report = bench.bench_storage(Path(args.data_dir), repeat=args.repeat)
+    else:
+        report = bench.bench_hashing(Path(args.data_dir), repeat=args.repeat, max_workers=args.jobs)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+
+def cmd_store(args: argparse.Namespace) -> int:
+    if args.action == "report":
+        report = objects.store_report(Path(args.fixtures_root))
+    else:
+        report = objects.gc(Path(args.fixtures_root), dry_run=args.dry_run, grace_s=args.grace)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+
+def cmd_catalog(args: argparse.Namespace) -> int:
+    if args.action == "ingest":
+        report = catalog.ingest_root(Path(args.out_root), Path(args.db) if args.db else None, force=args.force)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0
+    db = Path(args.db) if args.db else Path(args.out_root) / catalog.CATALOG_NAME
+    if not db.exists():
+        raise SystemExit(f"no catalog at {db} (run: transobserver catalog ingest)")
+    filters = dict(ddr=args.ddr, systemd_e=args.e, sost_e=args.sost_e, fixture=args.fixture,
+                   since=args.since, until=args.until)
+    con = catalog.open_catalog(db)
+    try:
+        if args.count:
+            n = catalog.count(con, **filters)
+            print(n if args.limit is None else min(n, args.limit))
+            return 0
+        rows = catalog.query(con, limit=args.limit, with_json=args.json_reports, **filters)
+    finally:
+        con.close()
+    print(json.dumps(rows, indent=2, ensure_ascii=False))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="transobserver", description="TransObserver cycle harness (PhiO + SystemD + SOST)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="Run one cycle: engines in parallel on shared_fixtures/<cycle_id>")
+    p.add_argument("fixture_dir", help="shared_fixtures/<cycle_id>")
+    p.add_argument("out_root", nargs="?", default="unified_cycles", help="Output root for unified cycles")
+    p.add_argument("--mode", choices=["real", "mock"], default="real")
+    p.add_argument("--jobs", type=int, default=None, help="Max engines running at once (default: all)")
+    p.add_argument("--timeout", type=float, default=runner.DEFAULT_TIMEOUT_S, help="Per-engine timeout in seconds")
+    p.add_argument("--engine-timeout", action="append", default=[], help="engine=seconds override (repeatable)")
+    p.add_argument("--isolation", choices=adapters.ISOLATION_MODES, default=None,
+                   help="Engine steps inside each wrapper: inprocess (default) or subprocess")
+    p.add_argument("--storage", choices=storage.STORAGE_MODES, default=None,
+                   help="How input/ mirrors the fixture: auto (default: reflink, else hardlink, else copy), reflink, hardlink, copy")
+    p.add_argument("--catalog", default=None, help="Also record the finished cycle(s) in this SQLite catalog")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("batch", help="Run every pending cycle under shared_fixtures/ on a process pool")
+    p.add_argument("fixtures_root", nargs="?", default="shared_fixtures", help="Root holding <cycle_id>/fixture.json")
+    p.add_argument("out_root", nargs="?", default="unified_cycles", help="Output root for unified cycles")
+    p.add_argument("--mode", choices=["real", "mock"], default="real")
+    p.add_argument("--jobs", type=int, default=None, help="Process pool size (default: CPU count)")
+    p.add_argument("--timeout", type=float, default=runner.DEFAULT_TIMEOUT_S, help="Per-engine timeout in seconds")
+    p.add_argument("--engine-timeout", action="append", default=[], help="engine=seconds override (repeatable)")
+    p.add_argument("--isolation", choices=adapters.ISOLATION_MODES, default=None,
+                   help="Engine steps inside each wrapper: inprocess (default) or subprocess")
+    p.add_argument("--storage", choices=storage.STORAGE_MODES, default=None,
+                   help="How input/ mirrors the fixture: auto (default: reflink, else hardlink, else copy), reflink, hardlink, copy")
+    p.add_argument("--force", action="store_true", help="Re-run cycles even if their unified manifest is valid")
+    p.add_argument("--catalog", default=None, help="Also record the finished cycle(s) in this SQLite catalog")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("bench", help="Micro-benchmarks")
+    p.add_argument("target", choices=["isolation", "hashing", "storage"],
+                   help="isolation: in-process vs subprocess engine calls; hashing: MB/s single vs pooled; "
+                        "storage: cycle input setup time per storage mode")
+    p.add_argument("--bands-dir", default=str(bench.BANDS_DIR), help="Directory with band_*.csv fixtures")
+    p.add_argument("--data-dir", default=str(bench.TEST_DATA_DIR), help="(hashing, storage) data directory")
+    p.add_argument("--jobs", type=int, default=None, help="(hashing) thread pool size")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("store", help="Fixture object store (shared_fixtures/.objects)")
+    p.add_argument("action", choices=["report", "gc"],
+                   help="report: store size vs. logical size; gc: delete blobs no fixture.json references")
+    p.add_argument("fixtures_root", nargs="?", default="shared_fixtures", help="Root holding <cycle_id>/fixture.json")
+    p.add_argument("--dry-run", action="store_true", help="(gc) list what would be deleted")
+    p.add_argument("--grace", type=float, default=objects.GC_GRACE_S,
+                   help="(gc) keep unreferenced blobs younger than this many seconds")
+    p.set_defaults(func=cmd_store)
+
+    p = sub.add_parser("catalog", help="SQLite catalog of finished cycles (schema/cycles.sql)")
+    p.add_argument("action", choices=["ingest", "query"],
+                   help="ingest: index new/changed cycles under out_root; query: filter the catalog")
+    p.add_argument("out_root", nargs="?", default="unified_cycles", help="Root holding <cycle_id>/unified_manifest.json")
+    p.add_argument("--db", default=None, help=f"Catalog path (default: <out_root>/{catalog.CATALOG_NAME})")
+    p.add_argument("--force", action="store_true", help="(ingest) re-read cycles even if their manifest is unchanged")
+    p.add_argument("--ddr", default=None, help="(query) SystemD DDR verdict, e.g. ILLUSION")
+    p.add_argument("--e", default=None, help="(query) SystemD E verdict, e.g. INCOMPATIBLE")
+    p.add_argument("--sost-e", default=None, help="(query) SOST equilibrium_state")
+    p.add_argument("--fixture", default=None, help="(query) fixture sha256 or prefix")
+    p.add_argument("--since", default=None, help="(query) created_utc >= this ISO date/time, e.g. 2026-09-01")
+    p.add_argument("--until", default=None, help="(query) created_utc < this ISO date/time")
+    p.add_argument("--limit", type=int, default=None)
+    p.add_argument("--count", action="store_true", help="(query) print only the number of matching cycles")
+    p.add_argument("--json-reports", action="store_true", help="(query) include the dd/ddr/e report JSON")
+    p.set_defaults(func=cmd_catalog)
+
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return int(args.func(args) or 0)
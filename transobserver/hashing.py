@@ -1,10 +1,156 @@
 from __future__ import annotations
 import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
 
-def sha256_file(p: Path) -> str:
-    h = hashlib.sha256()
-    with p.open("rb") as f:
+CACHE_NAME = ".sha256_cache.json"
+
+# Files at least this large are hashed from an mmap in a single update() call
+# (no Python-level chunk loop; hashlib releases the GIL for the whole buffer).
+MMAP_MIN_BYTES = 4 * 1024 * 1024
+
+# Filesystem timestamps come from a coarse clock (a jiffy on Linux). An entry
+# is only trusted if the file's last change (ctime) is older than the moment
+# hashing started by at least this margin; otherwise a write landing in the
+# same clock tick as the hash could go unnoticed.
+RACY_MARGIN_NS = 50_000_000
+
+
+def _sha256_path(p: Path) -> str:
+    with open(p, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
-    return h.hexdigest()
+        return h.hexdigest()
+
+
+def sha256_file(p: Path, cache: Optional["HashCache"] = None) -> str:
+    if cache is not None:
+        return cache.sha256(p)
+    return _sha256_path(p)
+
+
+def sha256_many(
+    paths: Iterable[Union[str, Path]],
+    max_workers: Optional[int] = None,
+    cache: Optional["HashCache"] = None,
+) -> List[str]:
+    """Hash many files on a thread pool; digests come back in input order."""
+    paths = [Path(p) for p in paths]
+    if not paths:
+        return []
+    workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    if workers <= 1 or len(paths) == 1:
+        return [sha256_file(p, cache) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(lambda p: sha256_file(p, cache), paths))
+
+
+class HashCache:
+    """sha256 cache keyed by (path, inode, size, mtime_ns), persisted per directory.
+
+    Entries also record ctime_ns (not settable by copy2/rsync -a/utime) and the
+    time hashing started; any stat mismatch, or a change racing the hash,
+    forces a recompute. Keys are paths relative to `root` when inside it.
+    """
+
+    def __init__(self, root: Path, path: Optional[Path] = None):
+        self.root = Path(root)
+        self.path = Path(path) if path is not None else self.root / CACHE_NAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, root: Union[str, Path], path: Optional[Path] = None) -> "HashCache":
+        cache = cls(Path(root), path)
+        cache.entries = cache._read()
+        return cache
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        entries = data.get("entries") if isinstance(data, dict) else None
+        return entries if isinstance(entries, dict) else {}
+
+    def key(self, p: Path) -> str:
+        ap = os.path.abspath(p)
+        root = os.path.abspath(self.root)
+        if ap == root or ap.startswith(root + os.sep):
+            return Path(os.path.relpath(ap, root)).as_posix()
+        return Path(ap).as_posix()
+
+    @staticmethod
+    def _trusted(entry: Dict[str, Any], st: os.stat_result) -> bool:
+        return (
+            entry.get("inode") == st.st_ino
+            and entry.get("size") == st.st_size
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and entry.get("ctime_ns") == st.st_ctime_ns
+            and st.st_ctime_ns + RACY_MARGIN_NS < int(entry.get("hashed_at_ns", 0))
+        )
+
+    def sha256(self, p: Path) -> str:
+        p = Path(p)
+        k = self.key(p)
+        st = os.stat(p)
+        with self._lock:
+            entry = self.entries.get(k)
+            if entry is not None and self._trusted(entry, st):
+                self.hits += 1
+                return entry["sha256"]
+            self.misses += 1
+
+        hashed_at = time.time_ns()
+        digest = _sha256_path(p)
+        st_after = os.stat(p)
+        with self._lock:
+            if (st_after.st_mtime_ns, st_after.st_ctime_ns, st_after.st_size) != (st.st_mtime_ns, st.st_ctime_ns, st.st_size):
+                # Modified while hashing: return the digest, never cache it.
+                self.entries.pop(k, None)
+                return digest
+            self.entries[k] = {
+                "sha256": digest,
+                "inode": st.st_ino,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "ctime_ns": st.st_ctime_ns,
+                "hashed_at_ns": hashed_at,
+            }
+            self._dirty = True
+        return digest
+
+    def save(self) -> None:
+        """Merge with the on-disk cache (concurrent writers) and replace it atomically."""
+        if not self._dirty:
+            return
+        merged = self._read()
+        merged.update(self.entries)
+        self.entries = merged
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({"version": "1.0", "entries": merged}, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.save()
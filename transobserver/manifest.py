@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .hashing import CACHE_NAME, HashCache, sha256_file, sha256_many
+
+MANIFEST_NAME = "unified_manifest.json"
+
+
+def walk_files(root: Path) -> Iterator[Path]:
+    for p in sorted(root.rglob("*")):
+        if p.is_file() and not p.name.startswith(CACHE_NAME):
+            yield p
+
+
+def build_unified_manifest(
+    cycle_dir: Path,
+    engines: Optional[Dict[str, Any]] = None,
+    timing: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """Describe every file of a cycle directory (path, sha256, bytes).
+
+    `engines` (per-engine start/end, return code) and `timing` (cycle wall
+    time) are execution records added verbatim when given. Digests go
+    through the cycle's HashCache unless `use_cache` is False.
+    """
+    root = Path(cycle_dir)
+    cache = HashCache.load(root) if use_cache else None
+    input_fixture = root / "input" / "fixture.json"
+
+    manifest: Dict[str, Any] = {
+        "version": "1.0",
+        "cycle_id": root.name,
+        "input": {
+            "fixture_path": "input/fixture.json",
+            "fixture_sha256": sha256_file(input_fixture, cache) if input_fixture.exists() else None,
+        },
+        "artifacts": [],
+    }
+    if engines is not None:
+        manifest["engines"] = engines
+    if timing is not None:
+        manifest["timing"] = timing
+
+    files = [p for p in walk_files(root) if not p.relative_to(root).as_posix().endswith(MANIFEST_NAME)]
+    for p, digest in zip(files, sha256_many(files, cache=cache)):
+        manifest["artifacts"].append({
+            "path": p.relative_to(root).as_posix(),
+            "sha256": digest,
+            "bytes": p.stat().st_size,
+        })
+
+    if cache is not None:
+        cache.save()
+    return manifest
+
+
+def write_unified_manifest(cycle_dir: Path, manifest: Dict[str, Any]) -> Path:
+    path = Path(cycle_dir) / MANIFEST_NAME
+    path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+def manifest_problems(cycle_dir: Path, use_cache: bool = True) -> List[str]:
+    """Check unified_manifest.json against the files on disk.
+
+    Returns a list of human-readable problems; an empty list means the
+    manifest exists, parses, and every artifact is present with its sha256.
+    With `use_cache`, files unchanged since they were last hashed (same
+    inode/size/mtime/ctime) are not re-read.
+    """
+    root = Path(cycle_dir)
+    path = root / MANIFEST_NAME
+    if not path.exists():
+        return [f"missing {MANIFEST_NAME}"]
+    try:
+        m = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        return [f"unreadable {MANIFEST_NAME}: {e}"]
+
+    problems: List[str] = []
+    artifacts = m.get("artifacts") if isinstance(m, dict) else None
+    if not artifacts:
+        return [f"{MANIFEST_NAME} has no artifacts"]
+    cache = HashCache.load(root) if use_cache else None
+    present = []
+    for a in artifacts:
+        rel = a.get("path")
+        exp = a.get("sha256")
+        if not rel or not exp:
+            problems.append(f"invalid artifact entry: {a}")
+        elif not (root / rel).exists():
+            problems.append(f"missing artifact: {rel}")
+        else:
+            present.append((rel, exp))
+    digests = sha256_many([root / rel for rel, _ in present], cache=cache)
+    for (rel, exp), got in zip(present, digests):
+        if got != exp:
+            problems.append(f"hash mismatch: {rel}")
+    if cache is not None:
+        cache.save()
+    return problems
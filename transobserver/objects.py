@@ -0,0 +1,201 @@
+"""Content-addressed object store for fixture sources.
+
+Layout: <fixtures_root>/.objects/sha256/<2 hex>/<62 hex>. The collector
+ingests each source once per distinct content, then places
+shared_fixtures/<cycle_id>/raw/<name> from the blob (hardlink/reflink, see
+transobserver.storage) and records the blob id in fixture.json
+("sources[].blob"). Identical inputs across sources and cycles therefore
+occupy the store once; raw/ paths stay valid for every engine.
+
+Blobs are never written in place after ingestion. They are created by
+reflink or copy, never by hardlinking the caller's source, so a source edited
+later cannot corrupt the store. `gc()` drops blobs no fixture.json
+references anymore.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Union
+
+from .hashing import HashCache, sha256_file
+from .storage import place_file
+
+STORE_DIR = ".objects"
+ALGO = "sha256"
+
+# Blobs younger than this are kept by gc(): a collector may have ingested
+# them without having written its fixture.json yet.
+GC_GRACE_S = 3600.0
+
+
+class ObjectStore:
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    @classmethod
+    def for_fixtures(cls, fixtures_root: Union[str, Path]) -> "ObjectStore":
+        return cls(Path(fixtures_root) / STORE_DIR)
+
+    def blob_id(self, digest: str) -> str:
+        return f"{ALGO}/{digest[:2]}/{digest[2:]}"
+
+    @staticmethod
+    def digest(blob_id: str) -> str:
+        algo, head, tail = blob_id.split("/")
+        return head + tail
+
+    def path(self, blob_id: str) -> Path:
+        return self.root / blob_id
+
+    def ingest(self, src: Union[str, Path], cache: Optional[HashCache] = None) -> str:
+        """Store `src` (if its content is new) and return its blob id."""
+        src = Path(src)
+        digest = sha256_file(src, cache)
+        if self.path(self.blob_id(digest)).exists():
+            return self.blob_id(digest)
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp = tmp_dir / f"{src.name}.{os.getpid()}.{time.time_ns()}"
+        try:
+            place_file(src, tmp, "reflink")  # falls back to copy; never a hardlink to the source
+            # Name the blob after what was actually stored (the source may have
+            # changed since it was hashed).
+            digest = sha256_file(tmp)
+            blob = self.path(self.blob_id(digest))
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            if blob.exists():
+                tmp.unlink()
+            else:
+                os.replace(tmp, blob)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return self.blob_id(digest)
+
+    def materialize(self, blob_id: str, dst: Union[str, Path], storage: Optional[str] = None) -> str:
+        """Place blob `blob_id` at `dst`; returns the storage method used."""
+        blob = self.path(blob_id)
+        if not blob.exists():
+            raise FileNotFoundError(f"missing blob {blob_id} in {self.root}")
+        return place_file(blob, dst, storage)
+
+    def blobs(self) -> Iterator[Path]:
+        base = self.root / ALGO
+        if not base.is_dir():
+            return
+        for sub in sorted(base.iterdir()):
+            if sub.is_dir():
+                yield from sorted(p for p in sub.iterdir() if p.is_file())
+
+    def _blob_id_of(self, p: Path) -> str:
+        return p.relative_to(self.root).as_posix()
+
+
+def _fixture_files(fixtures_root: Path) -> List[Path]:
+    return sorted(p / "fixture.json" for p in Path(fixtures_root).iterdir()
+                  if p.is_dir() and not p.name.startswith(".") and (p / "fixture.json").exists())
+
+
+def _fixture_sources(fixture_json: Path) -> List[Dict[str, Any]]:
+    try:
+        data = json.loads(fixture_json.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    sources = data.get("sources") if isinstance(data, dict) else None
+    return [s for s in sources or [] if isinstance(s, dict)]
+
+
+def referenced_blobs(fixtures_root: Union[str, Path]) -> Set[str]:
+    refs: Set[str] = set()
+    for fj in _fixture_files(Path(fixtures_root)):
+        refs.update(s["blob"] for s in _fixture_sources(fj) if s.get("blob"))
+    return refs
+
+
+def store_report(fixtures_root: Union[str, Path]) -> Dict[str, Any]:
+    """Store size vs. what the fixtures would take with one copy per source."""
+    fixtures_root = Path(fixtures_root)
+    store = ObjectStore.for_fixtures(fixtures_root)
+    fixtures = _fixture_files(fixtures_root) if fixtures_root.is_dir() else []
+    refs: Set[str] = set()
+    logical_bytes = 0
+    sources = 0
+    legacy = 0
+    for fj in fixtures:
+        for s in _fixture_sources(fj):
+            sources += 1
+            logical_bytes += int(s.get("bytes") or 0)
+            if s.get("blob"):
+                refs.add(s["blob"])
+            else:
+                legacy += 1
+
+    blobs = 0
+    store_bytes = 0
+    unreferenced = 0
+    unreferenced_bytes = 0
+    for p in store.blobs():
+        size = p.stat().st_size
+        blobs += 1
+        store_bytes += size
+        if store._blob_id_of(p) not in refs:
+            unreferenced += 1
+            unreferenced_bytes += size
+    return {
+        "store": str(store.root),
+        "fixtures": len(fixtures),
+        "sources": sources,
+        "sources_without_blob": legacy,
+        "logical_bytes": logical_bytes,
+        "blobs": blobs,
+        "store_bytes": store_bytes,
+        "dedup_ratio": round(logical_bytes / store_bytes, 3) if store_bytes else None,
+        "unreferenced_blobs": unreferenced,
+        "unreferenced_bytes": unreferenced_bytes,
+        "missing_blobs": sorted(b for b in refs if not store.path(b).exists()),
+    }
+
+
+def gc(fixtures_root: Union[str, Path], dry_run: bool = False, grace_s: float = GC_GRACE_S) -> Dict[str, Any]:
+    """Delete blobs no fixture.json references (older than `grace_s`)."""
+    store = ObjectStore.for_fixtures(fixtures_root)
+    refs = referenced_blobs(fixtures_root) if Path(fixtures_root).is_dir() else set()
+    now = time.time()
+    removed: List[str] = []
+    freed = 0
+    kept_recent = 0
+    for p in store.blobs():
+        blob_id = store._blob_id_of(p)
+        if blob_id in refs:
+            continue
+        st = p.stat()
+        # ctime, not mtime: copies keep the source's mtime; ctime moves on
+        # creation and whenever raw/ gains a hardlink to the blob.
+        if now - st.st_ctime < grace_s:
+            kept_recent += 1
+            continue
+        removed.append(blob_id)
+        freed += st.st_size
+        if not dry_run:
+            p.unlink()
+            try:
+                p.parent.rmdir()
+            except OSError:
+                pass
+    # Leftovers of interrupted ingestions.
+    tmp_dir = store.root / "tmp"
+    if tmp_dir.is_dir() and not dry_run:
+        for p in tmp_dir.iterdir():
+            if p.is_file() and now - p.stat().st_ctime >= grace_s:
+                p.unlink()
+    return {
+        "store": str(store.root),
+        "dry_run": dry_run,
+        "removed": len(removed),
+        "freed_bytes": freed,
+        "kept_recent": kept_recent,
+        "blobs": removed,
+    }
@@ -0,0 +1,211 @@
+"""Cycle runner: PhiO, SystemD and SOST launched concurrently on one fixture.
+
+Each engine runs in its own subprocess (the wrappers under tools/), on a
+bounded thread pool. stdout/stderr are captured per engine under
+<cycle>/logs/ and start/end timings are recorded in unified_manifest.json.
+"""
+from __future__ import annotations
+
+import datetime
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .adapters import ISOLATION_ENV
+from .hashing import CACHE_NAME
+from .manifest import build_unified_manifest, write_unified_manifest
+from .storage import place_tree
+
+MODULE_ROOT = Path(__file__).resolve().parents[1]
+
+DEFAULT_TIMEOUT_S = 1800.0
+
+
+@dataclass(frozen=True)
+class EngineSpec:
+    name: str
+    script: str
+    # Arguments after the script; "{fixture}" and "{out}" are substituted.
+    args: tuple = ("{fixture}", "{out}")
+
+
+REAL_ENGINES = (
+    EngineSpec("phio", "tools/phio_run.py"),
+    EngineSpec("systemd", "tools/systemd_run.py"),
+    EngineSpec("sost", "tools/sost_run.py"),
+)
+
+MOCK_ENGINES = (
+    EngineSpec("phio", "engines/mock_phio.py"),
+    EngineSpec("systemd", "engines/mock_systemd.py"),
+    EngineSpec("sost", "engines/mock_sost.py", ("{out}",)),
+)
+
+
+def utc_iso(ts: float) -> str:
+    dt = datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc)
+    return dt.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def engines_for_mode(mode: str) -> tuple:
+    if mode == "real":
+        return REAL_ENGINES
+    if mode == "mock":
+        return MOCK_ENGINES
+    raise ValueError(f"Unknown mode: {mode}")
+
+
+def prepare_cycle(fixture_dir: Path, out_root: Path, storage: Optional[str] = None) -> Path:
+    """Create <out_root>/<cycle_id>/input/ mirroring the fixture directory.
+
+    Files are reflinked, hardlinked or copied according to `storage` (see
+    transobserver.storage); the input sha256s in the unified manifest are what
+    guarantees the cycle saw the fixture unchanged.
+    """
+    fixture_dir = Path(fixture_dir)
+    cycle_dir = Path(out_root) / fixture_dir.name
+    place_tree(fixture_dir, cycle_dir / "input", storage, ignore=lambda name: name.startswith(CACHE_NAME))
+    return cycle_dir
+
+
+def _as_text(data: Any) -> str:
+    if data is None:
+        return ""
+    if isinstance(data, bytes):
+        return data.decode("utf-8", errors="replace")
+    return data
+
+
+def run_engine(spec: EngineSpec, cycle_dir: Path, timeout_s: float, isolation: Optional[str] = None) -> Dict[str, Any]:
+    """Run one engine wrapper; never raises on engine failure.
+
+    `isolation` is forwarded to the wrapper (see transobserver.adapters):
+    "inprocess" runs the engine inside the wrapper's interpreter,
+    "subprocess" spawns one more interpreter per engine step.
+    """
+    out_dir = cycle_dir / spec.name
+    out_dir.mkdir(parents=True, exist_ok=True)
+    logs_dir = cycle_dir / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+
+    fixture = cycle_dir / "input" / "fixture.json"
+    argv = [a.format(fixture=str(fixture), out=str(out_dir)) for a in spec.args]
+    cmd = [sys.executable, str(MODULE_ROOT / spec.script), *argv]
+
+    env = dict(os.environ)
+    if isolation:
+        env[ISOLATION_ENV] = isolation
+
+    record: Dict[str, Any] = {"cmd": cmd, "timeout_s": timeout_s, "timed_out": False, "isolation": env.get(ISOLATION_ENV, "inprocess")}
+    t0 = time.time()
+    p0 = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_s, env=env)
+        stdout, stderr, rc = proc.stdout, proc.stderr, proc.returncode
+    except subprocess.TimeoutExpired as e:
+        stdout, stderr, rc = _as_text(e.stdout), _as_text(e.stderr), None
+        record["timed_out"] = True
+    except OSError as e:
+        stdout, stderr, rc = "", f"{type(e).__name__}: {e}", None
+    elapsed = time.perf_counter() - p0
+
+    (logs_dir / f"{spec.name}.stdout.txt").write_text(stdout or "", encoding="utf-8")
+    (logs_dir / f"{spec.name}.stderr.txt").write_text(stderr or "", encoding="utf-8")
+
+    if record["timed_out"]:
+        status = "timeout"
+    elif rc == 0:
+        status = "ok"
+    else:
+        status = "failed"
+
+    record.update({
+        "status": status,
+        "returncode": rc,
+        "started_utc": utc_iso(t0),
+        "ended_utc": utc_iso(t0 + elapsed),
+        "duration_s": round(elapsed, 6),
+        "stdout": f"logs/{spec.name}.stdout.txt",
+        "stderr": f"logs/{spec.name}.stderr.txt",
+    })
+    return record
+
+
+def _ensure_systemd_manifest(cycle_dir: Path) -> None:
+    # Belt and suspenders: the SystemD wrapper may die before writing it.
+    sd = cycle_dir / "systemd"
+    if sd.is_dir() and not (sd / "run_manifest.json").exists():
+        subprocess.run([
+            sys.executable, str(MODULE_ROOT / "tools" / "systemd_make_manifest.py"),
+            "--input", str(cycle_dir / "input" / "fixture.json"), "--out", str(sd),
+        ], capture_output=True, text=True)
+
+
+def run_engines(
+    cycle_dir: Path,
+    engines: tuple,
+    max_workers: Optional[int] = None,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    timeouts: Optional[Dict[str, float]] = None,
+    isolation: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    timeouts = timeouts or {}
+    workers = max(1, min(max_workers or len(engines), len(engines)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            spec.name: pool.submit(run_engine, spec, cycle_dir, timeouts.get(spec.name, timeout_s), isolation)
+            for spec in engines
+        }
+        return {name: fut.result() for name, fut in futures.items()}
+
+
+def run_cycle(
+    fixture_dir: Path,
+    out_root: Path,
+    mode: str = "real",
+    max_workers: Optional[int] = None,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    timeouts: Optional[Dict[str, float]] = None,
+    isolation: Optional[str] = None,
+    storage: Optional[str] = None,
+) -> Path:
+    """Run one full cycle and write its unified_manifest.json. Returns the cycle dir."""
+    engines = engines_for_mode(mode)
+    cycle_dir = prepare_cycle(Path(fixture_dir), Path(out_root), storage)
+
+    t0 = time.perf_counter()
+    records = run_engines(
+        cycle_dir, engines, max_workers=max_workers, timeout_s=timeout_s, timeouts=timeouts, isolation=isolation,
+    )
+    wall = time.perf_counter() - t0
+
+    finalize_cycle(cycle_dir, mode, records, {
+        "mode": mode,
+        "max_workers": max(1, min(max_workers or len(engines), len(engines))),
+        "wall_s": round(wall, 6),
+    })
+    return cycle_dir
+
+
+def finalize_cycle(cycle_dir: Path, mode: str, records: Dict[str, Dict[str, Any]], timing: Dict[str, Any]) -> Path:
+    """Write unified_manifest.json once every engine of the cycle has finished."""
+    if mode == "real":
+        _ensure_systemd_manifest(cycle_dir)
+    timing = dict(timing)
+    timing["sum_engine_s"] = round(sum(r["duration_s"] for r in records.values()), 6)
+    return write_unified_manifest(cycle_dir, build_unified_manifest(cycle_dir, engines=records, timing=timing))
+
+
+def parse_engine_timeouts(items: List[str]) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for s in items:
+        if "=" not in s:
+            raise SystemExit(f"Invalid --engine-timeout '{s}'. Expected engine=seconds")
+        name, val = s.split("=", 1)
+        out[name.strip()] = float(val)
+    return out
@@ -0,0 +1,142 @@
+"""Placing input files without rewriting their bytes.
+
+Fixtures (collector raw/ copies) and cycle inputs (unified_cycles/<id>/input/)
+are byte-for-byte duplicates of files that are never modified afterwards, so
+they can share physical blocks with their source:
+
+- "reflink": copy-on-write clone (Linux FICLONE: btrfs, XFS, bcachefs...);
+  independent files that share extents until one of them is written.
+- "hardlink": a second name for the same inode. Writing through either name
+  changes both; immutability is then only guaranteed by the sha256 recorded in
+  fixture.json / unified_manifest.json, which every verification re-checks.
+- "copy": shutil.copy2, the historical behaviour.
+- "auto" (default): reflink, else hardlink, else copy.
+
+A mode that is not supported for a given pair of paths (other filesystem,
+no reflink support, no hardlinks) falls back to a plain copy.
+"""
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+STORAGE_ENV = "TRANSOBSERVER_STORAGE"
+STORAGE_MODES = ("auto", "reflink", "hardlink", "copy")
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# errnos meaning "this placement method does not apply here", not a real failure.
+_UNSUPPORTED = {
+    errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL,
+    errno.ENOTTY, errno.EMLINK, errno.ENOSYS, errno.EACCES,
+}
+
+
+def default_storage() -> str:
+    mode = os.environ.get(STORAGE_ENV, "auto")
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"{STORAGE_ENV} must be one of {STORAGE_MODES}, got {mode!r}")
+    return mode
+
+
+def _reflink(src: Path, tmp: Path) -> None:
+    try:
+        import fcntl
+    except ImportError:  # not POSIX
+        raise OSError(errno.ENOTSUP, "reflink not supported on this platform")
+    with open(src, "rb") as fs, open(tmp, "wb") as fd:
+        fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+    shutil.copystat(src, tmp)
+
+
+def _hardlink(src: Path, tmp: Path) -> None:
+    os.link(src, tmp)
+
+
+def _copy(src: Path, tmp: Path) -> None:
+    shutil.copy2(src, tmp)
+
+
+_METHODS: Dict[str, Callable[[Path, Path], None]] = {
+    "reflink": _reflink,
+    "hardlink": _hardlink,
+    "copy": _copy,
+}
+
+
+def _attempts(mode: str) -> tuple:
+    if mode == "auto":
+        return ("reflink", "hardlink", "copy")
+    if mode in _METHODS:
+        return (mode, "copy") if mode != "copy" else ("copy",)
+    raise ValueError(f"unknown storage mode: {mode}")
+
+
+def _same_file(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def place_file(src: Union[str, Path], dst: Union[str, Path], mode: Optional[str] = None) -> str:
+    """Make `dst` hold the bytes of `src`; returns the method actually used.
+
+    `dst` is replaced atomically if it exists. Returns "existing" when `dst`
+    already is a hardlink of `src`.
+    """
+    src, dst = Path(src), Path(dst)
+    if _same_file(src, dst):
+        return "existing"
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    for method in _attempts(mode or default_storage()):
+        try:
+            tmp.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            _METHODS[method](src, tmp)
+        except OSError as e:
+            if method == "copy" or e.errno not in _UNSUPPORTED:
+                try:
+                    tmp.unlink()
+                except FileNotFoundError:
+                    pass
+                raise
+            continue
+        os.replace(tmp, dst)
+        return method
+    raise AssertionError("unreachable: copy is always the last attempt")
+
+
+def place_tree(
+    src_dir: Union[str, Path],
+    dst_dir: Union[str, Path],
+    mode: Optional[str] = None,
+    ignore: Optional[Callable[[str], bool]] = None,
+) -> Dict[str, int]:
+    """Mirror `src_dir` into `dst_dir` with place_file(); returns {method: file count}.
+
+    `ignore(name)` skips files (not directories) by basename. Existing files
+    in `dst_dir` that are not in `src_dir` are left alone (like copytree with
+    dirs_exist_ok=True).
+    """
+    src_dir, dst_dir = Path(src_dir), Path(dst_dir)
+    mode = mode or default_storage()
+    counts: Dict[str, int] = {}
+    for root, dirs, files in os.walk(src_dir):
+        dirs.sort()
+        rel = Path(root).relative_to(src_dir)
+        (dst_dir / rel).mkdir(parents=True, exist_ok=True)
+        for name in sorted(files):
+            if ignore is not None and ignore(name):
+                continue
+            method = place_file(Path(root) / name, dst_dir / rel / name, mode)
+            counts[method] = counts.get(method, 0) + 1
+    return counts
+